@@ -3,9 +3,13 @@ Building view analysis — pure functions only.
 
 Assigns architectural layer to each node based on caller_count percentile,
 and classifies nodes as load-bearing or not based on config + heuristics.
+Given module_edges, each node also gets its module's layer in the module
+DAG (analytics/module_dag.py).
 """
 from __future__ import annotations
 
+from .module_dag import ModuleDAG
+
 LAYER_LABELS = ["Foundation", "Platform", "Services", "Features", "Leaves"]
 
 _LB_KEYWORDS = {
@@ -46,17 +50,27 @@ def _assign_layer(caller_count: int, max_callers: int) -> int:
     return 4                  # Leaves
 
 
-def assign_layers(nodes: list[dict], edges: list[dict], lb_config: dict) -> dict:
+def assign_layers(
+    nodes: list[dict],
+    edges: list[dict],
+    lb_config: dict,
+    module_edges: list[dict] | None = None,
+) -> dict:
     """
     Assign architectural layers to nodes and classify load-bearing status.
 
     nodes    — list of dicts: {hash, name, module, caller_count, ...}
     edges    — list of dicts: {from, to}  (caller_hash, callee_hash)
     lb_config — {declared_nodes: [...], declared_modules: [...]}
+    module_edges — optional module_edges rows; adds module_layer /
+                   module_in_cycle per node and a module_layering summary
     """
     if not nodes:
         return {"nodes": [], "edges": [], "layer_labels": LAYER_LABELS}
 
+    dag = ModuleDAG.from_rows(module_edges) if module_edges is not None else None
+    in_cycle = dag.in_cycle() if dag is not None else None
+
     max_callers = max(n.get("caller_count", 0) for n in nodes) or 1
     result_nodes = []
     for n in nodes:
@@ -65,13 +79,20 @@ def assign_layers(nodes: list[dict], edges: list[dict], lb_config: dict) -> dict
         node["layer"]            = _assign_layer(node.get("caller_count", 0), max_callers)
         node["is_load_bearing"]  = is_lb
         node["declaration"]      = decl
+        if dag is not None:
+            i = dag.index.get(node.get("module"))
+            node["module_layer"]    = int(dag.layer[i]) if i is not None else 0
+            node["module_in_cycle"] = bool(in_cycle[i]) if i is not None else False
         result_nodes.append(node)
 
-    return {
+    result = {
         "nodes":        result_nodes,
         "edges":        edges,
         "layer_labels": LAYER_LABELS,
     }
+    if dag is not None:
+        result["module_layering"] = dag.summary()
+    return result
 
 
 def compute_diff_building(
@@ -3,94 +3,324 @@ Centrality and blast-radius analysis — pure functions only.
 """
 from __future__ import annotations
 
-from collections import deque
+from typing import Iterable, Iterator
 
-import networkx as nx
+import numpy as np
 
+from .betweenness import betweenness
+from .csr_graph import CSRGraph
+from .diff import _content_hash
 
-def compute_centrality(nodes: list[dict], edges: list[dict], top_n: int = 30) -> list[dict]:
+_CENTRALITY_FIELDS = ("hash", "name", "module", "file_path", "caller_count", "callee_count", "risk")
+_TARGET_FIELDS     = ("hash", "name", "module", "file_path", "complexity",
+                      "caller_count", "callee_count", "risk")
+_AFFECTED_FIELDS   = ("hash", "name", "module", "file_path", "caller_count")
+
+
+def _project(node: dict, fields: tuple[str, ...]) -> dict:
+    return {f: node.get(f) for f in fields}
+
+
+def compute_centrality(
+    graph:          CSRGraph,
+    top_n:          int = 30,
+    epsilon:        float = 0.05,
+    time_budget_ms: float | None = None,
+    workers:        int | None = None,
+) -> tuple[list[dict], dict]:
     """
-    Rank nodes by centrality score.
+    Rank nodes by betweenness centrality.
 
-    For graphs with >2000 nodes, uses in-degree as a fast proxy.
-    For smaller graphs, uses betweenness centrality.
+    Exact up to 2000 nodes; larger graphs sample sources adaptively until
+    the top_n ranking is stable (epsilon is the near-tie width relative to
+    the top_n-th score) or time_budget_ms runs out (see
+    analytics/betweenness.py).
 
-    nodes  — list of dicts: {hash, name, module, file_path, caller_count, callee_count, risk}
-    edges  — list of dicts: {caller_hash, callee_hash, call_count}
+    graph   — shared CSRGraph of the internal call graph
+    workers — betweenness process-pool size (None = automatic; it forks, so
+              pass 1 from a server thread or a cpu-lane worker)
+    Returns (nodes, info) — info describes the estimate (samples, exact,
+    converged, error_bound, elapsed_ms).
     """
-    G = nx.DiGraph()
-    node_map = {n["hash"]: n for n in nodes}
-    for n in nodes:
-        G.add_node(n["hash"])
-    for e in edges:
-        G.add_edge(e["caller_hash"], e["callee_hash"], call_count=e.get("call_count", 1))
-
-    if len(G.nodes) > 2000:
-        scores = dict(G.in_degree())
-        max_score = max(scores.values(), default=1) or 1
-        centrality_scores = {k: v / max_score for k, v in scores.items()}
-    else:
-        centrality_scores = nx.betweenness_centrality(G, normalized=True)
+    scores, info = betweenness(
+        graph,
+        epsilon=0.0 if graph.n_nodes <= 2000 else epsilon,
+        time_budget_ms=time_budget_ms,
+        top_k=top_n,
+        workers=workers,
+    )
+    centrality_scores = dict(zip(graph.hashes, scores.tolist()))
 
     top_hashes = sorted(centrality_scores, key=lambda h: centrality_scores[h], reverse=True)[:top_n]
 
     results = []
     for h in top_hashes:
-        if h not in node_map:
+        node = graph.node(h)
+        if node is None:
             continue
-        node = dict(node_map[h])
+        node = _project(node, _CENTRALITY_FIELDS)
         node["centrality"] = round(centrality_scores.get(h, 0), 4)
         results.append(node)
 
     results.sort(key=lambda x: x["centrality"], reverse=True)
-    return results
+    return results, info
 
 
-def compute_blast_radius(
-    target_hash: str,
-    target_node: dict,
-    reverse_adj: dict[str, list[str]],
-    all_nodes: dict[str, dict],
-    max_depth: int = 5,
-) -> dict:
+def _upstream(graph: CSRGraph, target: int, max_depth: int) -> tuple[np.ndarray, np.ndarray]:
+    """Callers of target within max_depth hops, ordered by (hop, index), and their hops."""
+    depth = graph.bfs_depths([target], max_depth, reverse=True)
+    depth[target] = -1
+    reached = np.flatnonzero(depth >= 0)
+    reached = reached[np.argsort(depth[reached], kind="stable")]
+    return reached, depth[reached]
+
+
+def upstream_layers(
+    graph: CSRGraph, max_depth: int,
+) -> Iterator[tuple[int, np.ndarray, np.ndarray]]:
     """
-    BFS upstream from target to find everything affected by a change to target.
+    (index, callers, hops) for every node — the traversal compute_blast_radius
+    runs per request, done once for the whole graph (blast-radius index).
 
-    target_hash  — hash of the node being changed
-    target_node  — full node dict for the target
-    reverse_adj  — {callee_hash: [caller_hash, ...]} — pre-built reverse adjacency
-    all_nodes    — {hash: node_dict} for all non-external nodes
-    max_depth    — how many hops upstream to traverse
+    Same order as _upstream, but one depth buffer is reused and only the
+    reached entries are reset, so each node costs O(its upstream edges)
+    rather than O(n).
     """
-    visited: dict[str, int] = {}  # hash -> depth
-    queue = deque([(target_hash, 0)])
+    depth = np.full(graph.n_nodes, -1, dtype=np.int16)
+    empty = np.empty(0, dtype=np.int32)
+    for i in range(graph.n_nodes):
+        depth[i] = 0
+        frontier, layers = np.array([i], dtype=np.int32), []
+        for d in range(1, max_depth + 1):
+            nbrs = graph.gather(frontier, reverse=True)
+            nbrs = np.unique(nbrs[depth[nbrs] < 0])
+            if not len(nbrs):
+                break
+            depth[nbrs] = d
+            layers.append(nbrs)
+            frontier = nbrs
+        reached = np.concatenate(layers) if layers else empty
+        hops = np.repeat(np.arange(1, len(layers) + 1, dtype=np.int16), [len(l) for l in layers])
+        depth[reached] = -1
+        depth[i] = -1
+        yield i, reached, hops
 
-    while queue:
-        current, depth = queue.popleft()
-        if current in visited or depth > max_depth:
-            continue
-        visited[current] = depth
-        if depth < max_depth:
-            for caller in reverse_adj.get(current, []):
-                if caller not in visited:
-                    queue.append((caller, depth + 1))
 
+def format_blast_radius(
+    target:    dict,
+    affected:  Iterable[tuple[dict, int]],
+    max_depth: int,
+) -> dict:
+    """Response shape shared by the BFS and the indexed blast-radius paths."""
     affected_nodes = []
-    for h, depth in visited.items():
-        if h == target_hash:
-            continue
-        node = all_nodes.get(h)
-        if node:
-            n = dict(node)
-            n["depth"] = depth
-            affected_nodes.append(n)
+    for node, d in affected:
+        n = _project(node, _AFFECTED_FIELDS)
+        n["depth"] = d
+        affected_nodes.append(n)
 
     modules_affected = list({n.get("module") for n in affected_nodes if n.get("module")})
 
     return {
-        "target":           target_node,
+        "target":           _project(target, _TARGET_FIELDS),
         "affected_count":   len(affected_nodes),
-        "affected_nodes":   sorted(affected_nodes, key=lambda x: x["depth"]),
+        "affected_nodes":   affected_nodes,
         "modules_affected": modules_affected,
         "max_depth_reached": max_depth,
     }
+
+
+def compute_blast_radius(
+    target_hash: str,
+    graph: CSRGraph,
+    max_depth: int = 5,
+) -> dict | None:
+    """
+    BFS upstream from target to find everything affected by a change to target.
+
+    target_hash  — hash of the node being changed
+    graph        — shared CSRGraph; callers are walked via its reverse CSR
+    max_depth    — how many hops upstream to traverse
+    Returns None when target_hash is not an internal node.
+    """
+    target = graph.index_of(target_hash)
+    if target is None:
+        return None
+
+    reached, hops = _upstream(graph, target, max_depth)
+    return format_blast_radius(
+        graph.nodes[target],
+        ((graph.nodes[i], d) for i, d in zip(reached.tolist(), hops.tolist())),
+        max_depth,
+    )
+
+
+def changeset_seeds(graph: CSRGraph, base: CSRGraph) -> list[str]:
+    """
+    Hashes of nodes added or modified since base.  Compared by content hash
+    (see analytics.diff) so a symbol that only moved file is not a seed.
+    """
+    base_content = {_content_hash({"hash": h}) for h in base.hashes}
+    return [h for h in graph.hashes if _content_hash({"hash": h}) not in base_content]
+
+
+# Seeds tracked for per-node attribution.  Each reached node carries a
+# bitset of these (256 bytes at the cap); later seeds still count towards
+# the union and depths but are not attributed.
+MAX_ATTRIBUTED_SEEDS = 2048
+
+# Affected nodes per "attribution" event.
+_ATTRIBUTION_CHUNK = 500
+
+
+def iter_changeset_blast_radius(
+    seed_hashes: Iterable[str],
+    graph:       CSRGraph,
+    max_depth:   int = 5,
+) -> Iterator[tuple]:
+    """
+    Union blast radius of a set of changed symbols, as events produced while
+    one multi-source upstream BFS runs:
+
+      ("seeds", {seeds, unknown_seeds, attributed_seeds, max_depth_reached})
+      ("level", d, [affected node rows first reached at hop d])   per hop
+      ("attribution", [(hash, [seed indexes]), …])                 chunks, affected order
+      ("summary", {affected_count, depth_counts, modules_affected, seed_counts})
+
+    Attribution rides along the same BFS: every reached node holds a bitset
+    of the seeds within its current hop count, and each level ORs the bits
+    newly gained by the previous level into its callers.  A node's bitset
+    is final only after the last level, hence the separate events.  Seeds
+    themselves are reported under "seeds", not as affected.
+    """
+    seed_idx: list[int] = []
+    unknown:  list[str] = []
+    for h in dict.fromkeys(seed_hashes):
+        i = graph.index_of(h)
+        if i is None:
+            unknown.append(h)
+        else:
+            seed_idx.append(i)
+    n_seeds  = len(seed_idx)
+    n_attr   = min(n_seeds, MAX_ATTRIBUTED_SEEDS)
+    n_words  = max(1, (n_attr + 63) // 64)
+
+    yield ("seeds", {
+        "seeds":             [_project(graph.nodes[i], _CENTRALITY_FIELDS) for i in seed_idx],
+        "unknown_seeds":     unknown,
+        "attributed_seeds":  n_attr,
+        "max_depth_reached": max_depth,
+    })
+
+    # Rows: seeds first (in seeds order), then affected nodes in BFS order
+    row     = np.full(graph.n_nodes, -1, dtype=np.int64)
+    node_of = np.asarray(seed_idx, dtype=np.int64)
+    row[node_of] = np.arange(n_seeds)
+    bits = np.zeros((max(n_seeds, 16), n_words), dtype="<u8")
+    attr = np.arange(n_attr)
+    bits[attr, attr // 64] = np.left_shift(np.uint64(1), (attr % 64).astype(np.uint64))
+
+    frontier = node_of
+    changed, delta = attr, bits[:n_attr].copy()     # rows whose bits grew last level
+    depth_counts = [0] * max_depth
+    module_counts: dict[str, int] = {}
+    for d in range(1, max_depth + 1):
+        active = np.union1d(frontier, node_of[changed])
+        if not len(active):
+            break
+        callers = graph.gather(active, reverse=True).astype(np.int64)
+        callees = np.repeat(active, graph.in_offsets[active + 1] - graph.in_offsets[active])
+
+        new = np.unique(callers[row[callers] < 0])
+        m = len(node_of)
+        row[new] = np.arange(m, m + len(new))
+        node_of = np.concatenate([node_of, new])
+        if len(node_of) > len(bits):
+            grown = np.zeros((max(len(node_of), 2 * len(bits)), n_words), dtype="<u8")
+            grown[:len(bits)] = bits
+            bits = grown
+
+        rows = [_project(graph.nodes[i], _AFFECTED_FIELDS) | {"depth": d} for i in new.tolist()]
+        for r in rows:
+            if r.get("module"):
+                module_counts[r["module"]] = module_counts.get(r["module"], 0) + 1
+        depth_counts[d - 1] = len(rows)
+        if rows:
+            yield ("level", d, rows)
+
+        # Push the seed bits each caller's callee gained last level
+        slot = np.full(m, -1, dtype=np.int64)
+        slot[changed] = np.arange(len(changed))
+        src = slot[row[callees]]
+        sel = src >= 0
+        changed = np.empty(0, dtype=np.int64)
+        if sel.any():
+            tgt   = row[callers[sel]]
+            order = np.argsort(tgt, kind="stable")
+            tgt   = tgt[order]
+            starts = np.flatnonzero(np.r_[True, tgt[1:] != tgt[:-1]])
+            gained = np.bitwise_or.reduceat(delta[src[sel]][order], starts, axis=0)
+            tgt    = tgt[starts]
+            gained &= ~bits[tgt]
+            grew   = gained.any(axis=1)
+            changed, delta = tgt[grew], gained[grew]
+            bits[changed] |= delta
+        frontier = new
+
+    # Final bitsets → per-node seed lists and per-seed affected counts
+    seed_counts = np.zeros(n_words * 64, dtype=np.int64)
+    for start in range(n_seeds, len(node_of), _ATTRIBUTION_CHUNK):
+        chunk = np.unpackbits(
+            bits[start:start + _ATTRIBUTION_CHUNK].view(np.uint8), axis=1, bitorder="little",
+        )
+        seed_counts += chunk.sum(axis=0, dtype=np.int64)
+        yield ("attribution", [
+            (graph.hashes[i], np.flatnonzero(c).tolist())
+            for i, c in zip(node_of[start:start + _ATTRIBUTION_CHUNK].tolist(), chunk)
+        ])
+
+    yield ("summary", {
+        "affected_count":   len(node_of) - n_seeds,
+        "depth_counts":     depth_counts,
+        "modules_affected": [
+            {"module": m, "count": c}
+            for m, c in sorted(module_counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        ],
+        "seed_counts":      seed_counts[:n_attr].tolist() + [None] * (n_seeds - n_attr),
+    })
+
+
+def compute_changeset_blast_radius(
+    seed_hashes: Iterable[str],
+    graph:       CSRGraph,
+    max_depth:   int = 5,
+) -> dict:
+    """
+    iter_changeset_blast_radius collected into one response.
+
+    Returns {seeds (each with affected_count; None past attributed_seeds),
+    unknown_seeds, attributed_seeds, affected_count, depth_counts (index
+    d-1 → nodes first reached at hop d), modules_affected ([{module,
+    count}], largest first), affected_nodes (ordered by depth, each with
+    "seeds": indexes into the seeds list), max_depth_reached}.
+    """
+    result: dict = {}
+    affected: list[dict] = []
+    attribution: dict[str, list[int]] = {}
+    for event in iter_changeset_blast_radius(seed_hashes, graph, max_depth):
+        kind = event[0]
+        if kind == "seeds":
+            result.update(event[1])
+        elif kind == "level":
+            affected.extend(event[2])
+        elif kind == "attribution":
+            attribution.update(event[1])
+        else:
+            summary = dict(event[1])
+            for seed, count in zip(result["seeds"], summary.pop("seed_counts")):
+                seed["affected_count"] = count
+            result.update(summary)
+
+    for n in affected:
+        n["seeds"] = attribution.get(n["hash"], [])
+    result["affected_nodes"] = affected
+    return result
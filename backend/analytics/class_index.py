@@ -0,0 +1,51 @@
+"""
+Containing-class index — pure sort-and-sweep over line ranges, no DB.
+
+A node belongs to class C when both live in the same file and the node's
+line range sits entirely within C's.  With nested classes the innermost
+enclosing class wins; a class is its own containing class.
+
+One pass per file: spans are sorted by (line_start, -line_end) so every
+enclosing class is seen before anything it contains, and a stack holds the
+classes that are still "open" at the current line.  O(N log N) overall
+instead of the O(N²) correlated lookup this replaces.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+
+def containing_classes(
+    rows: Iterable[tuple[str, str | None, str | None, int | None, int | None, str | None]],
+) -> list[tuple[str, str, str]]:
+    """
+    rows — (hash, name, file_path, line_start, line_end, kind) per node.
+
+    Returns (hash, class_name, class_hash) for every node that sits inside a
+    class; top-level nodes (and nodes without a file or line range) are
+    omitted.
+    """
+    by_file: dict[str, list[tuple]] = defaultdict(list)
+    for h, name, file_path, start, end, kind in rows:
+        if file_path is None or start is None or end is None:
+            continue
+        by_file[file_path].append((start, -end, kind != "class", h, name))
+
+    out: list[tuple[str, str, str]] = []
+    for spans in by_file.values():
+        spans.sort()
+        open_classes: list[tuple[int, str, str]] = []     # (line_end, hash, name)
+        for start, neg_end, not_class, h, name in spans:
+            end = -neg_end
+            while open_classes and open_classes[-1][0] < start:
+                open_classes.pop()
+            if not not_class:
+                open_classes.append((end, h, name))
+            # Innermost open class that fully contains this span.  Properly
+            # nested code hits on the first probe; overlapping ranges walk down.
+            for cls_end, cls_hash, cls_name in reversed(open_classes):
+                if end <= cls_end:
+                    out.append((h, cls_name, cls_hash))
+                    break
+    return out
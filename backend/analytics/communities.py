@@ -3,39 +3,30 @@ Louvain community detection — pure functions only.
 """
 from __future__ import annotations
 
-import networkx as nx
 from networkx.algorithms.community import louvain_communities
 
+from .csr_graph import CSRGraph
+
 
 def detect_communities(
-    nodes: list[dict],
-    edges: list[dict],
+    graph: CSRGraph,
     resolution: float = 1.0,
 ) -> dict:
     """
     Run Louvain community detection on the call graph.
 
-    nodes  — list of dicts: {hash, name, module, file_path}
-    edges  — list of dicts: {caller_hash, callee_hash, weight}
+    graph  — shared CSRGraph; Louvain runs on its undirected weighted view
+             (weight = number of edge rows between a pair)
     Returns communities with purity scores, inter-community edges, and misaligned nodes.
     """
-    if not nodes:
+    if not graph.n_nodes:
         return {
             "communities": [], "community_edges": [], "misaligned": [],
             "alignment_score": 0, "total_nodes": 0, "community_count": 0,
         }
 
-    node_map = {n["hash"]: n for n in nodes}
-    G = nx.Graph()
-    for n in nodes:
-        G.add_node(n["hash"])
-    for e in edges:
-        ch, cah, w = e["caller_hash"], e["callee_hash"], e.get("weight", 1)
-        if ch in node_map and cah in node_map:
-            if G.has_edge(ch, cah):
-                G[ch][cah]["weight"] += w
-            else:
-                G.add_edge(ch, cah, weight=w)
+    node_map = dict(zip(graph.hashes, graph.nodes))
+    G = graph.to_undirected_weighted()
 
     community_sets = louvain_communities(G, resolution=resolution, seed=42)
 
@@ -0,0 +1,237 @@
+"""
+Compact CSR (compressed sparse row) call graph — pure data structure, no DB.
+
+One CSRGraph holds the internal call graph of a repo as NumPy arrays so that
+analytics can share a single in-memory copy instead of rebuilding dicts or
+NetworkX graphs from SQLite on every request.
+
+Layout (n = node count, m = distinct caller→callee pairs):
+  hashes        list[str]      node index → hash
+  nodes         list[dict]     node index → node row (read-only by convention)
+  out_offsets   int64[n + 1]   forward CSR row pointers
+  out_targets   int32[m]       callee index per forward edge
+  out_weights   int64[m]       summed call_count per forward edge
+  out_rows      int32[m]       number of edge rows collapsed into the pair
+  in_offsets    int64[n + 1]   reverse CSR row pointers
+  in_sources    int32[m]       caller index per reverse edge
+  in_weights    int64[m]       summed call_count per reverse edge
+  module_ids    int32[n]       index into `modules`
+
+Parallel rows for the same (caller, callee) pair — e.g. one per edge_kind —
+are collapsed into one CSR entry; `out_rows` keeps the row count so weighted
+views (community detection) can reproduce COUNT(*) semantics.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import networkx as nx
+import numpy as np
+
+
+class CSRGraph:
+    """Immutable call graph in forward + reverse CSR form."""
+
+    def __init__(
+        self,
+        nodes:   list[dict],
+        src:     np.ndarray,
+        dst:     np.ndarray,
+        weights: np.ndarray,
+    ):
+        """
+        nodes   — node rows; each must carry "hash" (and usually "module")
+        src/dst — int node indices per edge row (may contain parallel rows)
+        weights — call_count per edge row
+        """
+        n = len(nodes)
+        self.nodes:  list[dict]     = nodes
+        self.hashes: list[str]      = [nd["hash"] for nd in nodes]
+        self.index:  dict[str, int] = {h: i for i, h in enumerate(self.hashes)}
+
+        self.modules: list[str] = sorted({nd.get("module") or "" for nd in nodes})
+        mod_index = {m: i for i, m in enumerate(self.modules)}
+        self.module_ids = np.fromiter(
+            (mod_index[nd.get("module") or ""] for nd in nodes), dtype=np.int32, count=n,
+        )
+
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.int64)
+
+        # Collapse parallel rows: unique (src, dst) keys come back sorted by
+        # src then dst, which is exactly the forward CSR order.
+        if len(src) and n:
+            keys, inverse, rows = np.unique(src * n + dst, return_inverse=True, return_counts=True)
+            fwd_src = (keys // n).astype(np.int32)
+            fwd_dst = (keys % n).astype(np.int32)
+            fwd_w   = np.bincount(inverse, weights=weights, minlength=len(keys)).astype(np.int64)
+        else:
+            fwd_src = np.empty(0, dtype=np.int32)
+            fwd_dst = np.empty(0, dtype=np.int32)
+            fwd_w   = np.empty(0, dtype=np.int64)
+            rows    = np.empty(0, dtype=np.int64)
+
+        self.out_offsets = _offsets(fwd_src, n)
+        self.out_targets = fwd_dst
+        self.out_weights = fwd_w
+        self.out_rows    = rows.astype(np.int32)
+
+        rev = np.lexsort((fwd_src, fwd_dst))
+        self.in_offsets = _offsets(fwd_dst[rev], n)
+        self.in_sources = fwd_src[rev]
+        self.in_weights = fwd_w[rev]
+
+        self._nx_directed:   nx.DiGraph | None = None
+        self._nx_undirected: nx.Graph   | None = None
+
+    # ── Construction ──────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_rows(
+        cls,
+        nodes: list[dict],
+        edges: Iterable[tuple[str, str, int]] | Iterable[dict],
+    ) -> "CSRGraph":
+        """
+        Build from node dicts and edge rows.
+
+        edges — (caller_hash, callee_hash, call_count) tuples, or dicts with
+                those keys.  Edges touching an unknown hash are dropped.
+        """
+        index = {nd["hash"]: i for i, nd in enumerate(nodes)}
+        src: list[int] = []
+        dst: list[int] = []
+        wts: list[int] = []
+        for e in edges:
+            if isinstance(e, dict):
+                caller, callee, count = e["caller_hash"], e["callee_hash"], e.get("call_count", 1)
+            else:
+                caller, callee, count = e
+            s = index.get(caller)
+            d = index.get(callee)
+            if s is None or d is None:
+                continue
+            src.append(s)
+            dst.append(d)
+            wts.append(count if count is not None else 1)
+        return cls(nodes, np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                   np.array(wts, dtype=np.int64))
+
+    # ── Basic accessors ───────────────────────────────────────────────────────
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.hashes)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.out_targets)
+
+    def index_of(self, node_hash: str) -> int | None:
+        return self.index.get(node_hash)
+
+    def node(self, node_hash: str) -> dict | None:
+        i = self.index.get(node_hash)
+        return self.nodes[i] if i is not None else None
+
+    def successors(self, i: int) -> np.ndarray:
+        return self.out_targets[self.out_offsets[i]:self.out_offsets[i + 1]]
+
+    def predecessors(self, i: int) -> np.ndarray:
+        return self.in_sources[self.in_offsets[i]:self.in_offsets[i + 1]]
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.out_offsets).astype(np.int32)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.in_offsets).astype(np.int32)
+
+    def edge_sources(self) -> np.ndarray:
+        """Caller index per forward edge (aligned with out_targets)."""
+        return np.repeat(np.arange(self.n_nodes, dtype=np.int32), self.out_degree())
+
+    # ── Traversal ─────────────────────────────────────────────────────────────
+
+    def gather(self, frontier: np.ndarray, reverse: bool = False) -> np.ndarray:
+        """All neighbours of every index in frontier (with repeats)."""
+        offsets, targets = (
+            (self.in_offsets, self.in_sources) if reverse else (self.out_offsets, self.out_targets)
+        )
+        starts  = offsets[frontier]
+        lengths = offsets[frontier + 1] - starts
+        total   = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int32)
+        # Vectorised concatenation of CSR slices
+        shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return targets[shift + np.arange(total)]
+
+    def bfs_depths(
+        self,
+        sources:   Iterable[int],
+        max_depth: int,
+        reverse:   bool = False,
+    ) -> np.ndarray:
+        """
+        Level-synchronous BFS from sources.
+
+        Returns int16[n] with the hop distance of every reached node and -1
+        elsewhere.  reverse=True walks callers (upstream) instead of callees.
+        """
+        depth = np.full(self.n_nodes, -1, dtype=np.int16)
+        frontier = np.unique(np.asarray(list(sources), dtype=np.int32))
+        if not len(frontier):
+            return depth
+        depth[frontier] = 0
+        for d in range(1, max_depth + 1):
+            nbrs = self.gather(frontier, reverse=reverse)
+            nbrs = np.unique(nbrs[depth[nbrs] < 0])
+            if not len(nbrs):
+                break
+            depth[nbrs] = d
+            frontier = nbrs
+        return depth
+
+    # ── NetworkX views (built once, shared, frozen) ───────────────────────────
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Frozen DiGraph keyed by hash with a call_count edge attribute."""
+        if self._nx_directed is None:
+            G = nx.DiGraph()
+            G.add_nodes_from(self.hashes)
+            h   = self.hashes
+            src = self.edge_sources().tolist()
+            G.add_edges_from(
+                (h[s], h[t], {"call_count": w})
+                for s, t, w in zip(src, self.out_targets.tolist(), self.out_weights.tolist())
+            )
+            self._nx_directed = nx.freeze(G)
+        return self._nx_directed
+
+    def to_undirected_weighted(self) -> nx.Graph:
+        """
+        Frozen undirected Graph; edge weight = number of edge rows between the
+        pair in either direction (the COUNT(*) weighting used by Louvain).
+        """
+        if self._nx_undirected is None:
+            G = nx.Graph()
+            G.add_nodes_from(self.hashes)
+            h = self.hashes
+            for s, t, r in zip(self.edge_sources().tolist(), self.out_targets.tolist(),
+                               self.out_rows.tolist()):
+                u, v = h[s], h[t]
+                if G.has_edge(u, v):
+                    G[u][v]["weight"] += r
+                else:
+                    G.add_edge(u, v, weight=r)
+            self._nx_undirected = nx.freeze(G)
+        return self._nx_undirected
+
+
+def _offsets(sorted_rows: np.ndarray, n: int) -> np.ndarray:
+    """CSR row-pointer array for row indices that are already grouped."""
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    if n:
+        np.cumsum(np.bincount(sorted_rows, minlength=n), out=offsets[1:])
+    return offsets
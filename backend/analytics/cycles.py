@@ -8,23 +8,24 @@ from __future__ import annotations
 
 import networkx as nx
 
+from .csr_graph import CSRGraph
 
-def find_cycles(nodes: list[dict], edges: list[dict], max_results: int = 20) -> list[dict]:
+_CYCLE_NODE_FIELDS = ("hash", "name", "module", "file_path")
+
+
+def find_cycles(graph: CSRGraph, max_results: int = 20) -> list[dict]:
     """
     Find circular dependency cycles in a call graph.
 
-    nodes  — list of dicts with keys: hash, name, module, file_path
-    edges  — list of dicts with keys: caller_hash, callee_hash, call_count
+    graph  — shared CSRGraph of the internal call graph
     Returns sorted list of cycles (largest first), each with:
         size, cross_module, modules, nodes, break_suggestion
     """
-    node_map = {n["hash"]: n for n in nodes}
-
-    G = nx.DiGraph()
-    for n in nodes:
-        G.add_node(n["hash"])
-    for e in edges:
-        G.add_edge(e["caller_hash"], e["callee_hash"], call_count=e.get("call_count", 1))
+    node_map = {
+        h: {f: n.get(f) for f in _CYCLE_NODE_FIELDS}
+        for h, n in zip(graph.hashes, graph.nodes)
+    }
+    G = graph.to_networkx()
 
     sccs = [list(scc) for scc in nx.strongly_connected_components(G) if len(scc) > 1]
 
@@ -2,11 +2,16 @@
 Graph diff analysis — pure functions only.
 
 Compares two snapshots of a repo's call graph to identify
-structural changes (added/removed nodes and module edges).
+structural changes (added/removed nodes and module edges), and pairs
+removed with added nodes that are really the same symbol moved to another
+module or renamed (match_moves).
 """
 from __future__ import annotations
 
-from collections import defaultdict
+import os
+from collections import Counter, defaultdict
+
+from .symbol_search import identifier_words
 
 
 def _content_hash(node: dict) -> str:
@@ -25,6 +30,123 @@ def _content_hash(node: dict) -> str:
     return parts[-1]      # content hash (right of first ":")
 
 
+# ── Move / rename detection ──────────────────────────────────────────────────
+
+# Minimum shape similarity for a same-name move / a rename (see _similarity).
+MOVE_THRESHOLD   = 0.7
+RENAME_THRESHOLD = 0.75
+
+# Candidate buckets larger than this are skipped, keeping the pass O(N).
+_MAX_BUCKET = 16
+
+
+def _vid(n: dict) -> str:
+    return f"{n['module']}::{n['name']}"
+
+
+def _has_shape(n: dict) -> bool:
+    return n.get("line_start") is not None and n.get("line_end") is not None
+
+
+def _similarity(a: dict, b: dict) -> float:
+    """
+    Shape similarity in [0, 1] of two nodes with line ranges: line span,
+    complexity, identifier words (camel/snake split) and file basename.
+    """
+    span_a = a["line_end"] - a["line_start"] + 1
+    span_b = b["line_end"] - b["line_start"] + 1
+    size = min(span_a, span_b) / max(span_a, span_b, 1)
+    ca, cb = (a.get("complexity") or 0) + 1, (b.get("complexity") or 0) + 1
+    cx = min(ca, cb) / max(ca, cb)
+    wa, wb = set(identifier_words(a["name"])), set(identifier_words(b["name"]))
+    words = len(wa & wb) / max(len(wa | wb), 1)
+    same_file = float(os.path.basename(a.get("file_path") or "") == os.path.basename(b.get("file_path") or ""))
+    if a["name"] == b["name"]:
+        return 0.5 * size + 0.3 * cx + 0.2 * same_file
+    return 0.35 * words + 0.35 * size + 0.2 * cx + 0.1 * same_file
+
+
+def match_moves(nodes_a: list[dict], nodes_b: list[dict]) -> list[dict]:
+    """
+    Pair nodes removed in B with nodes added in B (keyed "module::name")
+    that are the same symbol under a new module and/or name.  Returns
+    [{from, to, kind, exact, similarity}] with from/to as "module::name" and
+    kind "moved" (same name) or "renamed".
+
+    1. Hash join on content hash, restricted to hashes that occur once in
+       each whole snapshot — trivial bodies share hashes and would pair at
+       random.
+    2. Similarity pass over what is left, for snapshots whose hashes moved
+       with the file: same (name, kind) → moved when _similarity ≥
+       MOVE_THRESHOLD; same (module, kind, file basename) → renamed when
+       ≥ RENAME_THRESHOLD.  Greedy best-first within each bucket; buckets
+       over _MAX_BUCKET are skipped.
+
+    Each node is paired at most once; O(N) overall.
+    """
+    bv_a = {_vid(n): n for n in nodes_a}
+    bv_b = {_vid(n): n for n in nodes_b}
+    removed = [n for v, n in bv_a.items() if v not in bv_b]
+    added   = [n for v, n in bv_b.items() if v not in bv_a]
+    pairs: list[dict] = []
+    used_a: set[int] = set()
+    used_b: set[int] = set()
+
+    def pair(i: int, j: int, exact: bool, score: float) -> None:
+        a, b = removed[i], added[j]
+        used_a.add(i)
+        used_b.add(j)
+        pairs.append({
+            "from":       _vid(a),
+            "to":         _vid(b),
+            "kind":       "moved" if a["name"] == b["name"] else "renamed",
+            "exact":      exact,
+            "similarity": round(score, 3),
+        })
+
+    # 1. Exact content
+    count_a = Counter(_content_hash(n) for n in bv_a.values())
+    count_b = Counter(_content_hash(n) for n in bv_b.values())
+    by_content = {
+        _content_hash(n): j for j, n in enumerate(added) if count_b[_content_hash(n)] == 1
+    }
+    for i, n in enumerate(removed):
+        h = _content_hash(n)
+        if count_a[h] == 1 and h in by_content:
+            pair(i, by_content[h], True, 1.0)
+
+    # 2. Similarity within buckets
+    def bucket_pass(key, threshold: float) -> None:
+        buckets: dict[tuple, tuple[list[int], list[int]]] = defaultdict(lambda: ([], []))
+        for i, n in enumerate(removed):
+            if i not in used_a and _has_shape(n):
+                buckets[key(n)][0].append(i)
+        for j, n in enumerate(added):
+            if j not in used_b and _has_shape(n):
+                k = key(n)
+                if k in buckets:
+                    buckets[k][1].append(j)
+        for rs, ds in buckets.values():
+            if not ds or len(rs) > _MAX_BUCKET or len(ds) > _MAX_BUCKET:
+                continue
+            scored = sorted(
+                ((_similarity(removed[i], added[j]), i, j) for i in rs for j in ds),
+                key=lambda t: -t[0],
+            )
+            for score, i, j in scored:
+                if score < threshold:
+                    break
+                if i not in used_a and j not in used_b:
+                    pair(i, j, False, score)
+
+    bucket_pass(lambda n: (n["name"], n.get("kind")), MOVE_THRESHOLD)
+    bucket_pass(
+        lambda n: (n["module"], n.get("kind"), os.path.basename(n.get("file_path") or "")),
+        RENAME_THRESHOLD,
+    )
+    return pairs
+
+
 def compute_diff_status_map(nodes_a: list[dict], nodes_b: list[dict]) -> dict:
     """
     Returns {module::name: status} for all *changed* nodes only.
@@ -59,6 +181,8 @@ def compute_diff(
     High-level structural diff between two repo snapshots.
 
     Nodes are matched by (name, module) since hashes differ between snapshots.
+    Symbols that moved or were renamed (match_moves) are reported under
+    "moves" and excluded from added / removed.
     """
     def key(n): return (n["name"], n["module"])
 
@@ -66,8 +190,12 @@ def compute_diff(
     kb = {key(n): n for n in nodes_b}
     keys_a, keys_b = set(ka), set(kb)
 
-    added   = [kb[k] for k in keys_b - keys_a]
-    removed = [ka[k] for k in keys_a - keys_b]
+    moves      = match_moves(nodes_a, nodes_b)
+    moved_from = {m["from"] for m in moves}
+    moved_to   = {m["to"] for m in moves}
+
+    added   = [kb[k] for k in keys_b - keys_a if _vid(kb[k]) not in moved_to]
+    removed = [ka[k] for k in keys_a - keys_b if _vid(ka[k]) not in moved_from]
     common  = keys_a & keys_b
 
     def edge_key(e): return (e["caller_module"], e["callee_module"])
@@ -84,8 +212,11 @@ def compute_diff(
         "nodes_added":          len(added),
         "nodes_removed":        len(removed),
         "nodes_common":         len(common),
+        "nodes_moved":          sum(m["kind"] == "moved" for m in moves),
+        "nodes_renamed":        sum(m["kind"] == "renamed" for m in moves),
         "added":                added[:50],
         "removed":              removed[:50],
+        "moves":                moves[:50],
         "module_edges_added":   new_mod_edges[:30],
         "module_edges_removed": removed_mod_edges[:30],
     }
@@ -103,27 +234,42 @@ def compute_diff_graph(
     Build a force-graph subgraph showing the structural diff.
 
     Nodes are identified by virtual ID "name::module" (stable across snapshots).
-    Added/removed nodes are shown with their neighborhood as context.
+    Added/removed nodes are shown with their neighborhood as context.  A
+    moved or renamed symbol (match_moves) is a single node under its new ID,
+    with status "moved" / "renamed" and "from" set to its old ID; base-side
+    edges are re-pointed at it so its unchanged calls stay unchanged.
     """
     def vid(name, module): return f"{name}::{module}"
 
-    def keyed_by_vid(node_list):
+    moves = match_moves(nodes_a, nodes_b)
+    def flip(key):
+        """match_moves' "module::name" → this graph's "name::module"."""
+        module, name = key.split("::", 1)
+        return vid(name, module)
+
+    renamed_to = {flip(m["from"]): flip(m["to"]) for m in moves}     # old vid → new vid
+    move_kind  = {flip(m["to"]): (m["kind"], flip(m["from"])) for m in moves}
+
+    def keyed_by_vid(node_list, remap):
         by_vid  = {}
         by_hash = {}
         for n in node_list:
             v = vid(n["name"], n["module"])
-            by_vid[v]          = n
-            by_hash[n["hash"]] = n
+            by_vid[remap.get(v, v)] = n
+            by_hash[n["hash"]] = (n, remap.get(v, v))
         return by_vid, by_hash
 
-    bv_a, bh_a = keyed_by_vid(nodes_a)
-    bv_b, bh_b = keyed_by_vid(nodes_b)
+    bv_a, bh_a = keyed_by_vid(nodes_a, renamed_to)
+    bv_b, bh_b = keyed_by_vid(nodes_b, {})
 
     added_vids    = set(bv_b) - set(bv_a)
     removed_vids  = set(bv_a) - set(bv_b)
     common_vids   = set(bv_a) & set(bv_b)
-    modified_vids = {v for v in common_vids if _content_hash(bv_a[v]) != _content_hash(bv_b[v])}
-    changed_vids  = added_vids | removed_vids | modified_vids
+    moved_vids    = set(move_kind)
+    modified_vids = {
+        v for v in common_vids - moved_vids if _content_hash(bv_a[v]) != _content_hash(bv_b[v])
+    }
+    changed_vids  = added_vids | removed_vids | modified_vids | moved_vids
 
     # Unified node lookup (prefer B for added/modified, A for removed)
     all_info = {**{v: n for v, n in bv_a.items()}, **{v: n for v, n in bv_b.items()}}
@@ -135,8 +281,7 @@ def compute_diff_graph(
             ch, ce = e["caller_hash"], e["callee_hash"]
             if ch not in hash_map or ce not in hash_map:
                 continue
-            cv = vid(hash_map[ch]["name"], hash_map[ch]["module"])
-            ev = vid(hash_map[ce]["name"], hash_map[ce]["module"])
+            cv, ev = hash_map[ch][1], hash_map[ce][1]
             callers[ev].add(cv)
             callees[cv].add(ev)
         return callers, callees
@@ -163,16 +308,19 @@ def compute_diff_graph(
     context |= top_neighbors(removed_vids,  cee_a, max_context)
     context |= top_neighbors(modified_vids, cal_b, max_context // 2 + 1)
     context |= top_neighbors(modified_vids, cee_b, max_context // 2 + 1)
+    context |= top_neighbors(moved_vids,    cal_b, max_context // 2 + 1)
+    context |= top_neighbors(moved_vids,    cee_b, max_context // 2 + 1)
 
-    all_vids = added_vids | removed_vids | modified_vids | context
+    all_vids = changed_vids | context
     if len(all_vids) > max_nodes:
         ctx_sorted = sorted(context, key=lambda v: -all_info.get(v, {}).get("caller_count", 0))
         context = set(ctx_sorted[:max(0, max_nodes - len(changed_vids))])
-        all_vids = added_vids | removed_vids | modified_vids | context
+        all_vids = changed_vids | context
 
     def status(v):
         if v in added_vids:    return "added"
         if v in removed_vids:  return "removed"
+        if v in moved_vids:    return move_kind[v][0]
         if v in modified_vids: return "modified"
         return "context"
 
@@ -182,8 +330,7 @@ def compute_diff_graph(
             ch, ce = e["caller_hash"], e["callee_hash"]
             if ch not in hash_map or ce not in hash_map:
                 continue
-            cv = vid(hash_map[ch]["name"], hash_map[ch]["module"])
-            ev = vid(hash_map[ce]["name"], hash_map[ce]["module"])
+            cv, ev = hash_map[ch][1], hash_map[ce][1]
             if cv in all_vids and ev in all_vids:
                 result.add((cv, ev))
         return result
@@ -199,6 +346,7 @@ def compute_diff_graph(
             "kind":         all_info.get(v, {}).get("kind", ""),
             "caller_count": all_info.get(v, {}).get("caller_count", 0),
             "status":       status(v),
+            **({"from": move_kind[v][1]} if v in moved_vids else {}),
         }
         for v in all_vids
     ]
@@ -215,6 +363,8 @@ def compute_diff_graph(
             "added":          len(added_vids),
             "removed":        len(removed_vids),
             "modified":       len(modified_vids),
+            "moved":          sum(k == "moved" for k, _ in move_kind.values()),
+            "renamed":        sum(k == "renamed" for k, _ in move_kind.values()),
             "context":        len(context),
             "edge_added":     len(ev_b - ev_a),
             "edge_removed":   len(ev_a - ev_b),
@@ -0,0 +1,172 @@
+"""
+Module dependency DAG — pure data structure, no DB.
+
+Builds the module-level call graph once (from module_edges rows, or from
+node-level edge arrays), condenses its strongly connected components and
+assigns every module a layer, all in O(modules + module edges):
+
+  modules      list[str]      module index → name
+  src/dst      int64[m]       caller / callee module per distinct cross-module pair
+  weights      int64[m]       summed edge_count per pair
+  component    int32[n]       SCC id per module
+  layer        int32[n]       longest dependency chain below the module:
+                              0 = depends on no other module (foundation)
+  back_edge    bool[m]        pair closes a module cycle (both ends in one SCC)
+  back_edges   int64[n]       summed weight of a module's outgoing back edges
+
+Every pair that is not a back edge points strictly downwards
+(layer[src] > layer[dst]), so the layers are a true layering of the
+condensation; back edges are exactly what keeps the modules from being one.
+
+Shared by analytics/pattern_detector.py (layered architecture),
+analytics/building.py and analytics/module_graph.py.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import connected_components
+
+
+class ModuleDAG:
+    """Immutable module graph with its SCC condensation and layer assignment."""
+
+    def __init__(
+        self,
+        modules: list[str],
+        src:     np.ndarray,
+        dst:     np.ndarray,
+        weights: np.ndarray,
+    ):
+        """
+        modules — module names
+        src/dst — module indices per edge (parallel edges and self-loops allowed)
+        weights — edge_count per edge
+        """
+        n = len(modules)
+        self.modules: list[str]      = list(modules)
+        self.index:   dict[str, int] = {m: i for i, m in enumerate(self.modules)}
+
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.int64)
+
+        # Cross-module pairs only, parallel rows collapsed (sorted by src, dst)
+        cross = src != dst
+        if cross.any():
+            keys, inverse = np.unique(src[cross] * n + dst[cross], return_inverse=True)
+            self.src     = keys // n
+            self.dst     = keys % n
+            self.weights = np.bincount(inverse, weights=weights[cross], minlength=len(keys)).astype(np.int64)
+        else:
+            self.src = self.dst = self.weights = np.empty(0, dtype=np.int64)
+
+        if n:
+            adj = csr_array((np.ones(len(self.src), dtype=np.int8), (self.src, self.dst)), shape=(n, n))
+            self.n_components, labels = connected_components(adj, directed=True, connection="strong")
+            self.component = labels.astype(np.int32)
+        else:
+            self.n_components, self.component = 0, np.empty(0, dtype=np.int32)
+
+        self.back_edge  = self.component[self.src] == self.component[self.dst]
+        self.back_edges = np.bincount(
+            self.src[self.back_edge], weights=self.weights[self.back_edge], minlength=n,
+        ).astype(np.int64)
+        self.layer = self._layers()
+
+    # ── Construction ──────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows:    Iterable[dict],
+        caller:  str = "caller_module",
+        callee:  str = "callee_module",
+        count:   str = "edge_count",
+        modules: Iterable[str] = (),
+    ) -> "ModuleDAG":
+        """
+        Build from module_edges-shaped rows.  `modules` adds modules without
+        cross-module edges, which then sit in layer 0.
+        """
+        index: dict[str, int] = {}
+        for m in modules:
+            index.setdefault(m, len(index))
+        src: list[int] = []
+        dst: list[int] = []
+        wts: list[int] = []
+        for r in rows:
+            src.append(index.setdefault(r[caller], len(index)))
+            dst.append(index.setdefault(r[callee], len(index)))
+            w = r.get(count)
+            wts.append(1 if w is None else w)
+        return cls(list(index), np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64),
+                   np.array(wts, dtype=np.int64))
+
+    # ── Accessors ─────────────────────────────────────────────────────────────
+
+    @property
+    def n_modules(self) -> int:
+        return len(self.modules)
+
+    @property
+    def n_layers(self) -> int:
+        return int(self.layer.max()) + 1 if self.n_modules else 0
+
+    def layer_of(self, module: str) -> int | None:
+        i = self.index.get(module)
+        return None if i is None else int(self.layer[i])
+
+    def in_cycle(self) -> np.ndarray:
+        """bool per module: part of a module cycle (SCC with > 1 module)."""
+        sizes = np.bincount(self.component, minlength=self.n_components)
+        return sizes[self.component] > 1
+
+    def one_way(self) -> np.ndarray:
+        """Indices of the pairs that respect the layering (not back edges)."""
+        return np.flatnonzero(~self.back_edge)
+
+    def summary(self) -> dict:
+        total = int(self.weights.sum())
+        back  = int(self.weights[self.back_edge].sum())
+        sizes = np.bincount(self.component, minlength=self.n_components)
+        return {
+            "modules":         self.n_modules,
+            "layers":          self.n_layers,
+            "module_cycles":   int((sizes > 1).sum()),
+            "back_edges":      int(self.back_edge.sum()),
+            "back_edge_ratio": round(back / total, 3) if total else 0.0,
+        }
+
+    # ── Layering ──────────────────────────────────────────────────────────────
+
+    def _layers(self) -> np.ndarray:
+        """Longest path to a sink in the condensation (Kahn's order from the sinks)."""
+        c = self.n_components
+        comp_layer = np.zeros(c, dtype=np.int32)
+        down = ~self.back_edge
+        if c and down.any():
+            pairs = np.unique(
+                self.component[self.src[down]].astype(np.int64) * c + self.component[self.dst[down]]
+            )
+            cs, cd = (pairs // c).tolist(), (pairs % c).tolist()
+            callers: list[list[int]] = [[] for _ in range(c)]
+            pending = [0] * c                       # unprocessed callees per component
+            for a, b in zip(cs, cd):
+                callers[b].append(a)
+                pending[a] += 1
+            ready = deque(i for i in range(c) if pending[i] == 0)
+            layers = [0] * c
+            while ready:
+                b = ready.popleft()
+                for a in callers[b]:
+                    if layers[b] + 1 > layers[a]:
+                        layers[a] = layers[b] + 1
+                    pending[a] -= 1
+                    if pending[a] == 0:
+                        ready.append(a)
+            comp_layer = np.array(layers, dtype=np.int32)
+        return comp_layer[self.component] if self.n_modules else np.empty(0, dtype=np.int32)
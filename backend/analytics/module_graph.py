@@ -2,10 +2,14 @@
 Module-level force graph — pure functions only.
 
 Rolls module paths up to a given depth and computes coupling metrics
-for the force-directed module graph view.
+for the force-directed module graph view, plus each rolled-up module's
+layer in the module DAG (analytics/module_dag.py) and which edges close
+module cycles.
 """
 from __future__ import annotations
 
+from .module_dag import ModuleDAG
+
 
 def _rollup(module: str, depth: int) -> str:
     if not module:
@@ -62,6 +66,15 @@ def compute_module_graph(
         afferent[dst] = afferent.get(dst, 0) + cnt
 
     valid_ids = {m for m in rolled_stats if not m.startswith("__")}
+    dag = ModuleDAG.from_rows(
+        ({"caller_module": s, "callee_module": d, "edge_count": c}
+         for (s, d), c in edge_map.items() if s in valid_ids and d in valid_ids),
+        modules=sorted(valid_ids),
+    )
+    in_cycle = dag.in_cycle()
+    back_pairs = {(dag.modules[s], dag.modules[d])
+                  for s, d in zip(dag.src[dag.back_edge].tolist(), dag.dst[dag.back_edge].tolist())}
+
     nodes_out = []
     for mod in valid_ids:
         stats      = rolled_stats[mod]
@@ -78,11 +91,15 @@ def compute_module_graph(
             "instability":     round(instability, 3),
             "intra_calls":     intra.get(mod, 0),
             "submodule_count": len(stats["submodules"]),
+            "layer":           int(dag.layer[dag.index[mod]]),
+            "in_cycle":        bool(in_cycle[dag.index[mod]]),
+            "back_edges":      int(dag.back_edges[dag.index[mod]]),
         })
 
     max_edge = max(edge_map.values(), default=1)
     edges_out = [
-        {"from": k[0], "to": k[1], "count": v, "weight": round(v / max_edge, 3)}
+        {"from": k[0], "to": k[1], "count": v, "weight": round(v / max_edge, 3),
+         "back_edge": k in back_pairs}
         for k, v in edge_map.items()
         if k[0] in valid_ids and k[1] in valid_ids
     ]
@@ -100,4 +117,5 @@ def compute_module_graph(
         "edges":     edges_out,
         "depth":     depth,
         "max_depth": min(max_depth, 6),
+        "layering":  dag.summary(),
     }
@@ -6,11 +6,29 @@ Each detector returns:
   { pattern, display_name, instances: [{nodes, description, confidence}] }
 
 Detection is purely structural — no source code reading, only degree/path analysis.
+
+Every detector takes (nodes, out_adj, in_adj) plus an optional GraphArrays:
+per-node in/out-degree, module-id and kind-id arrays in `nodes` order.
+Detectors use them to pre-filter candidates with vectorised masks, so the
+Python loop only visits nodes that can possibly match.  detect_all_patterns
+builds the arrays once and, for large graphs, runs the detectors in a
+forked process pool.
 """
+import multiprocessing as mp
+import os
 import sqlite3
+import time
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from typing import Optional
 
+import numpy as np
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import connected_components
+
+from .module_dag import ModuleDAG
+
 
 # ── helpers ──────────────────────────────────────────────────────────────────
 
@@ -43,6 +61,113 @@ def _load_graph(conn: sqlite3.Connection) -> tuple[dict, dict, dict]:
     return nodes, dict(out_adj), dict(in_adj)
 
 
+def _adjacency_from_graph(graph) -> tuple[dict, dict, dict]:
+    """
+    Same shape as _load_graph(), derived from a shared CSRGraph instead of SQL.
+    Parallel edge rows of one caller→callee pair arrive pre-collapsed, with
+    their call counts summed.
+    """
+    nodes = {
+        h: {
+            "hash": h, "name": n["name"], "module": n["module"], "kind": n["kind"],
+            "caller_count": n["caller_count"], "callee_count": n["callee_count"],
+        }
+        for h, n in zip(graph.hashes, graph.nodes)
+    }
+    hashes  = graph.hashes
+    targets = graph.out_targets.tolist()
+    weights = graph.out_weights.tolist()
+    offsets = graph.out_offsets.tolist()
+
+    out_adj = {}
+    in_adj  = defaultdict(list)
+    for i, h in enumerate(hashes):
+        lo, hi = offsets[i], offsets[i + 1]
+        if lo == hi:
+            continue
+        out_adj[h] = [(hashes[t], w) for t, w in zip(targets[lo:hi], weights[lo:hi])]
+        for t, w in zip(targets[lo:hi], weights[lo:hi]):
+            in_adj[hashes[t]].append((h, w))
+
+    return nodes, out_adj, dict(in_adj)
+
+
+@dataclass(frozen=True)
+class GraphArrays:
+    """
+    Per-node arrays aligned with the iteration order of `nodes`.
+
+    in_deg / out_deg equal len(in_adj.get(h, [])) / len(out_adj.get(h, [])).
+    src / dst are the edges whose endpoints are both in `nodes` (indices).
+    """
+    hashes:    list[str]
+    in_deg:    np.ndarray
+    out_deg:   np.ndarray
+    module_id: np.ndarray
+    kind_id:   np.ndarray
+    modules:   list
+    kinds:     list
+    src:       np.ndarray
+    dst:       np.ndarray
+
+    def pick(self, mask: np.ndarray) -> list[str]:
+        """Hashes where mask holds, in node order."""
+        return [self.hashes[i] for i in np.flatnonzero(mask).tolist()]
+
+
+def _factorize(values: list) -> tuple[np.ndarray, list]:
+    ids: dict = {}
+    codes = np.fromiter((ids.setdefault(v, len(ids)) for v in values), dtype=np.int32, count=len(values))
+    return codes, list(ids)
+
+
+def _graph_arrays(nodes: dict, out_adj: dict, in_adj: dict) -> GraphArrays:
+    """GraphArrays for any (nodes, out_adj, in_adj) triple."""
+    hashes = list(nodes)
+    index  = {h: i for i, h in enumerate(hashes)}
+    n = len(hashes)
+    module_id, modules = _factorize([nodes[h]["module"] for h in hashes])
+    kind_id, kinds     = _factorize([nodes[h]["kind"] for h in hashes])
+    src, dst = [], []
+    for h, targets in out_adj.items():
+        i = index.get(h)
+        if i is None:
+            continue
+        for t, _ in targets:
+            j = index.get(t)
+            if j is not None:
+                src.append(i)
+                dst.append(j)
+    return GraphArrays(
+        hashes    = hashes,
+        in_deg    = np.fromiter((len(in_adj.get(h, ())) for h in hashes), dtype=np.int64, count=n),
+        out_deg   = np.fromiter((len(out_adj.get(h, ())) for h in hashes), dtype=np.int64, count=n),
+        module_id = module_id,
+        kind_id   = kind_id,
+        modules   = modules,
+        kinds     = kinds,
+        src       = np.array(src, dtype=np.int64),
+        dst       = np.array(dst, dtype=np.int64),
+    )
+
+
+def _arrays_from_graph(graph) -> GraphArrays:
+    """GraphArrays straight from a CSRGraph (same node order as _adjacency_from_graph)."""
+    n = graph.n_nodes
+    kind_id, kinds = _factorize([nd["kind"] for nd in graph.nodes])
+    return GraphArrays(
+        hashes    = graph.hashes,
+        in_deg    = np.bincount(graph.out_targets, minlength=n).astype(np.int64),
+        out_deg   = np.diff(graph.out_offsets).astype(np.int64),
+        module_id = graph.module_ids,
+        kind_id   = kind_id,
+        modules   = graph.modules,
+        kinds     = kinds,
+        src       = graph.edge_sources().astype(np.int64),
+        dst       = graph.out_targets.astype(np.int64),
+    )
+
+
 def _node_label(n: dict) -> str:
     return f"{n['module']}.{n['name']}"
 
@@ -124,44 +249,50 @@ def _find_sccs(nodes: dict, out_adj: dict) -> list[list[str]]:
 
 # ── individual detectors ──────────────────────────────────────────────────────
 
-def detect_singleton(nodes, out_adj, in_adj) -> list[dict]:
+def _with_arrays(nodes, out_adj, in_adj, arrays: Optional[GraphArrays]) -> GraphArrays:
+    return arrays if arrays is not None else _graph_arrays(nodes, out_adj, in_adj)
+
+
+def detect_singleton(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Singleton: one node with high in-degree (≥4) and very low out-degree (0-3).
     Often paired with a _create* companion (low in-degree, called only by the getter).
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
-    for h, n in nodes.items():
-        in_deg  = len(in_adj.get(h, []))
-        out_deg = len(out_adj.get(h, []))
-        if in_deg >= 4 and out_deg <= 3:
-            # Look for a _create companion
-            companions = [
-                nodes[t] for t, _ in out_adj.get(h, [])
-                if len(in_adj.get(t, [])) == 1
-            ]
-            confidence = min(0.95, 0.55 + in_deg * 0.04)
-            desc = (f"{_node_label(n)} is called by {in_deg} callers "
-                    f"(getter pattern)")
-            if companions:
-                desc += f"; delegates creation to {companions[0]['name']}"
-                confidence = min(0.95, confidence + 0.1)
-            instances.append({
-                "nodes":       [h] + [c for t, _ in out_adj.get(h, [])
-                                      if len(in_adj.get(t, [])) == 1
-                                      for c in [t]][:1],
-                "description": desc,
-                "confidence":  round(confidence, 2),
-            })
+    for h in a.pick((a.in_deg >= 4) & (a.out_deg <= 3)):
+        n = nodes[h]
+        in_deg = len(in_adj.get(h, []))
+        # Look for a _create companion
+        companions = [
+            nodes[t] for t, _ in out_adj.get(h, [])
+            if len(in_adj.get(t, [])) == 1
+        ]
+        confidence = min(0.95, 0.55 + in_deg * 0.04)
+        desc = (f"{_node_label(n)} is called by {in_deg} callers "
+                f"(getter pattern)")
+        if companions:
+            desc += f"; delegates creation to {companions[0]['name']}"
+            confidence = min(0.95, confidence + 0.1)
+        instances.append({
+            "nodes":       [h] + [c for t, _ in out_adj.get(h, [])
+                                  if len(in_adj.get(t, [])) == 1
+                                  for c in [t]][:1],
+            "description": desc,
+            "confidence":  round(confidence, 2),
+        })
     return instances
 
 
-def detect_factory_method(nodes, out_adj, in_adj) -> list[dict]:
+def detect_factory_method(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Factory: node that calls ≥3 product-constructor nodes,
     where each product has low in-degree (≤2) and is in the same module.
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
-    for h, n in nodes.items():
+    for h in a.pick(a.out_deg >= 3):
+        n = nodes[h]
         callees = [(t, nodes[t]) for t, _ in out_adj.get(h, []) if t in nodes]
         # Group callees by module
         same_mod = [t for t, cn in callees
@@ -178,17 +309,16 @@ def detect_factory_method(nodes, out_adj, in_adj) -> list[dict]:
     return instances
 
 
-def detect_observer(nodes, out_adj, in_adj) -> list[dict]:
+def detect_observer(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Observer/Event Bus: a notify/publish node with high out-degree (≥5) to
     handler nodes that each have low in-degree (≤2).
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
-    for h, n in nodes.items():
-        out_edges = out_adj.get(h, [])
-        if len(out_edges) < 5:
-            continue
-        handler_targets = [t for t, _ in out_edges
+    for h in a.pick(a.out_deg >= 5):
+        n = nodes[h]
+        handler_targets = [t for t, _ in out_adj.get(h, [])
                            if t in nodes and len(in_adj.get(t, [])) <= 2]
         if len(handler_targets) >= 4:
             confidence = min(0.92, 0.55 + len(handler_targets) * 0.05)
@@ -201,43 +331,41 @@ def detect_observer(nodes, out_adj, in_adj) -> list[dict]:
     return instances
 
 
-def detect_decorator_chain(nodes, out_adj, in_adj) -> list[dict]:
+def detect_decorator_chain(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Decorator chain: a linear sequence of nodes of length ≥ 4 where each
     wraps the next (in=1, out=1 for interior nodes, same module).
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
     visited = set()
     # Find chain entry points: in-degree > 1 (many callers), out-degree = 1
-    for h, n in nodes.items():
+    for h in a.pick((a.in_deg >= 2) & (a.out_deg == 1)):
         if h in visited:
             continue
-        in_deg = len(in_adj.get(h, []))
-        out_deg = len(out_adj.get(h, []))
-        if in_deg >= 2 and out_deg == 1:
-            chain = _bfs_chain(h, out_adj, in_adj)
-            if len(chain) >= 4:
-                for c in chain:
-                    visited.add(c)
-                # Only flag chains where nodes share a module prefix
-                mods = {nodes[c]["module"] for c in chain if c in nodes}
-                confidence = min(0.88, 0.45 + len(chain) * 0.07)
-                instances.append({
-                    "nodes":       chain[:8],
-                    "description": (f"Decorator chain of {len(chain)} wrappers: "
-                                    f"{nodes[chain[0]]['name']} → … → "
-                                    f"{nodes[chain[-1]]['name']}"),
-                    "confidence":  round(confidence, 2),
-                })
+        chain = _bfs_chain(h, out_adj, in_adj)
+        if len(chain) >= 4:
+            for c in chain:
+                visited.add(c)
+            confidence = min(0.88, 0.45 + len(chain) * 0.07)
+            instances.append({
+                "nodes":       chain[:8],
+                "description": (f"Decorator chain of {len(chain)} wrappers: "
+                                f"{nodes[chain[0]]['name']} → … → "
+                                f"{nodes[chain[-1]]['name']}"),
+                "confidence":  round(confidence, 2),
+            })
     return instances
 
 
-def detect_facade(nodes, out_adj, in_adj) -> list[dict]:
+def detect_facade(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Facade: one node that calls into ≥ 3 distinct modules (cross-module fan-out).
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
-    for h, n in nodes.items():
+    for h in a.pick(a.out_deg >= 3):
+        n = nodes[h]
         callees = [(t, nodes[t]) for t, _ in out_adj.get(h, []) if t in nodes]
         other_modules = {cn["module"] for _, cn in callees
                          if cn["module"] != n["module"]}
@@ -253,35 +381,37 @@ def detect_facade(nodes, out_adj, in_adj) -> list[dict]:
     return instances
 
 
-def detect_composite(nodes, out_adj, in_adj) -> list[dict]:
+def detect_composite(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Composite / Recursive: nodes that call themselves (self-loop in edges)
     or are part of a mutually recursive pair where both nodes share a module.
     """
-    instances = []
-    for h, n in nodes.items():
-        self_calls = [t for t, _ in out_adj.get(h, []) if t == h]
-        if self_calls:
-            instances.append({
-                "nodes":       [h],
-                "description": (f"{_node_label(n)} is self-recursive "
-                                f"(composite/tree traversal/fold)"),
-                "confidence":  0.85,
-            })
-    return instances
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
+    self_loop = np.zeros(len(a.hashes), dtype=bool)
+    self_loop[a.src[a.src == a.dst]] = True
+    return [
+        {
+            "nodes":       [h],
+            "description": (f"{_node_label(nodes[h])} is self-recursive "
+                            f"(composite/tree traversal/fold)"),
+            "confidence":  0.85,
+        }
+        for h in a.pick(self_loop)
+    ]
 
 
-def detect_strategy(nodes, out_adj, in_adj) -> list[dict]:
+def detect_strategy(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Strategy: a context node that calls ≥ 3 sibling nodes (same module),
     where each sibling has low in-degree (≤ 2) — the interchangeable strategies.
     Context node has moderate out-degree (3-10).
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
-    for h, n in nodes.items():
-        out_edges = out_adj.get(h, [])
+    for h in a.pick(a.out_deg >= 3):
+        n = nodes[h]
         # Siblings: same module, low in-degree, not helpers (low out-degree is fine)
-        siblings = [t for t, _ in out_edges
+        siblings = [t for t, _ in out_adj.get(h, [])
                     if t in nodes
                     and nodes[t]["module"] == n["module"]
                     and len(in_adj.get(t, [])) <= 2
@@ -297,45 +427,44 @@ def detect_strategy(nodes, out_adj, in_adj) -> list[dict]:
     return instances
 
 
-def detect_chain_of_responsibility(nodes, out_adj, in_adj) -> list[dict]:
+def detect_chain_of_responsibility(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Chain of Responsibility: a strict linear chain ≥ 5 nodes long where
     each handler has in-degree=1 from the previous handler.
     Distinct from decorator: names suggest sequential processing steps.
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
     visited = set()
-    for h in nodes:
+    # Find chain starts: low in-degree, exactly 1 out
+    for h in a.pick((a.in_deg <= 1) & (a.out_deg == 1)):
         if h in visited:
             continue
-        in_deg = len(in_adj.get(h, []))
-        out_deg = len(out_adj.get(h, []))
-        # Find chain starts: low in-degree, exactly 1 out
-        if in_deg <= 1 and out_deg == 1:
-            chain = _bfs_chain(h, out_adj, in_adj)
-            if len(chain) >= 5:
-                for c in chain:
-                    visited.add(c)
-                instances.append({
-                    "nodes":       chain[:8],
-                    "description": (f"Handler chain: {nodes[chain[0]]['name']} → "
-                                    f"… → {nodes[chain[-1]]['name']} "
-                                    f"({len(chain)} steps)"),
-                    "confidence":  round(min(0.82, 0.40 + len(chain) * 0.07), 2),
-                })
+        chain = _bfs_chain(h, out_adj, in_adj)
+        if len(chain) >= 5:
+            for c in chain:
+                visited.add(c)
+            instances.append({
+                "nodes":       chain[:8],
+                "description": (f"Handler chain: {nodes[chain[0]]['name']} → "
+                                f"… → {nodes[chain[-1]]['name']} "
+                                f"({len(chain)} steps)"),
+                "confidence":  round(min(0.82, 0.40 + len(chain) * 0.07), 2),
+            })
     return instances
 
 
-def detect_template_method(nodes, out_adj, in_adj) -> list[dict]:
+def detect_template_method(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Template method: a hub node whose callees all have very low in-degree (≤ 2),
     suggesting they are private hook methods called only by the template.
     Hub has ≥ 5 such callees.
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
-    for h, n in nodes.items():
-        out_edges = out_adj.get(h, [])
-        hook_callees = [t for t, _ in out_edges
+    for h in a.pick(a.out_deg >= 5):
+        n = nodes[h]
+        hook_callees = [t for t, _ in out_adj.get(h, [])
                         if t in nodes and len(in_adj.get(t, [])) <= 2]
         if len(hook_callees) >= 5:
             confidence = min(0.87, 0.48 + len(hook_callees) * 0.05)
@@ -348,15 +477,16 @@ def detect_template_method(nodes, out_adj, in_adj) -> list[dict]:
     return instances
 
 
-def detect_command_dispatcher(nodes, out_adj, in_adj) -> list[dict]:
+def detect_command_dispatcher(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Command: a dispatcher node calling ≥ 5 command handler nodes,
     where each handler has in-degree = 1 (only called by the dispatcher).
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
-    for h, n in nodes.items():
-        out_edges = out_adj.get(h, [])
-        exclusive_callees = [t for t, _ in out_edges
+    for h in a.pick(a.out_deg >= 5):
+        n = nodes[h]
+        exclusive_callees = [t for t, _ in out_adj.get(h, [])
                              if t in nodes and len(in_adj.get(t, [])) == 1]
         if len(exclusive_callees) >= 5:
             confidence = min(0.88, 0.50 + len(exclusive_callees) * 0.05)
@@ -369,18 +499,28 @@ def detect_command_dispatcher(nodes, out_adj, in_adj) -> list[dict]:
     return instances
 
 
-def detect_map_reduce(nodes, out_adj, in_adj) -> list[dict]:
+def detect_map_reduce(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Map/Reduce fan-out/fan-in: a hub with high out-degree to parallel nodes,
     whose outputs all converge to a single reduce node.
     Hub → [mapper1, mapper2, ..., mapperN] → reducer
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
+    hubs = np.flatnonzero(a.out_deg >= 4)
+    if not len(hubs) or not len(a.src):
+        return []
+    # Two-hop path counts hub → mapper → t; a hub needs some t ≠ hub reached ≥ 3 times
+    n_all = len(a.hashes)
+    adj = csr_array((np.ones(len(a.src), dtype=np.int64), (a.src, a.dst)), shape=(n_all, n_all))
+    two_hop = (adj[hubs] @ adj).tocoo()
+    hit = (two_hop.data >= 3) & (hubs[two_hop.row] != two_hop.col)
+    candidates = np.zeros(n_all, dtype=bool)
+    candidates[hubs[np.unique(two_hop.row[hit])]] = True
+
     instances = []
-    for h, n in nodes.items():
-        out_edges = out_adj.get(h, [])
-        if len(out_edges) < 4:
-            continue
-        mappers = [t for t, _ in out_edges if t in nodes]
+    for h in a.pick(candidates):
+        n = nodes[h]
+        mappers = [t for t, _ in out_adj.get(h, []) if t in nodes]
         if len(mappers) < 4:
             continue
         # Find convergence: a node called by many of these mappers
@@ -401,34 +541,49 @@ def detect_map_reduce(nodes, out_adj, in_adj) -> list[dict]:
     return instances
 
 
-def detect_mediator(nodes, out_adj, in_adj) -> list[dict]:
+def detect_mediator(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Mediator: a node with BOTH high in-degree (≥ 4) AND high out-degree (≥ 4).
     The bidirectional hub that all colleagues route through.
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
-    for h, n in nodes.items():
+    for h in a.pick((a.in_deg >= 4) & (a.out_deg >= 4)):
+        n = nodes[h]
         in_deg  = len(in_adj.get(h, []))
         out_deg = len(out_adj.get(h, []))
-        if in_deg >= 4 and out_deg >= 4:
-            confidence = min(0.90, 0.45 + (in_deg + out_deg) * 0.025)
-            callers = [src for src, _ in in_adj.get(h, [])[:5] if src in nodes]
-            callees = [tgt for tgt, _ in out_adj.get(h, [])[:5] if tgt in nodes]
-            instances.append({
-                "nodes":       [h] + callers[:4] + callees[:4],
-                "description": (f"{_node_label(n)}: bidirectional hub "
-                                f"(in={in_deg}, out={out_deg})"),
-                "confidence":  round(confidence, 2),
-            })
+        confidence = min(0.90, 0.45 + (in_deg + out_deg) * 0.025)
+        callers = [src for src, _ in in_adj.get(h, [])[:5] if src in nodes]
+        callees = [tgt for tgt, _ in out_adj.get(h, [])[:5] if tgt in nodes]
+        instances.append({
+            "nodes":       [h] + callers[:4] + callees[:4],
+            "description": (f"{_node_label(n)}: bidirectional hub "
+                            f"(in={in_deg}, out={out_deg})"),
+            "confidence":  round(confidence, 2),
+        })
     return instances
 
 
-def detect_mutual_recursion(nodes, out_adj, in_adj) -> list[dict]:
+def _sccs_from_arrays(a: GraphArrays) -> list[list[str]]:
+    """Strongly connected components with >1 node, via scipy (same sets as _find_sccs)."""
+    n = len(a.hashes)
+    if not n or not len(a.src):
+        return []
+    adj = csr_array((np.ones(len(a.src), dtype=np.int8), (a.src, a.dst)), shape=(n, n))
+    _, labels = connected_components(adj, directed=True, connection="strong")
+    sizes = np.bincount(labels)
+    members = np.flatnonzero(sizes[labels] > 1)
+    order = members[np.argsort(labels[members], kind="stable")]
+    groups = np.split(order, np.flatnonzero(np.diff(labels[order])) + 1) if len(order) else []
+    return [[a.hashes[i] for i in g.tolist()] for g in groups]
+
+
+def detect_mutual_recursion(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Meta-circular / Mutual recursion: strongly-connected components
     with ≥ 2 nodes (A calls B calls A).
     """
-    sccs = _find_sccs(nodes, out_adj)
+    sccs = _sccs_from_arrays(_with_arrays(nodes, out_adj, in_adj, arrays))
     instances = []
     for scc in sccs:
         if len(scc) < 2:
@@ -445,52 +600,50 @@ def detect_mutual_recursion(nodes, out_adj, in_adj) -> list[dict]:
     return instances
 
 
-def detect_layered_architecture(nodes, out_adj, in_adj) -> list[dict]:
+def detect_layered_architecture(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
-    Layered arch: strict cross-module DAG where modules form a clear hierarchy.
-    Detect by checking for absence of back-edges between module pairs.
+    Layered arch: cross-module dependencies form a clear hierarchy.
+    Counts module pairs that respect the layering of the module DAG
+    (analytics/module_dag.py) — no path leads back — and discounts
+    confidence by the share of calls on back edges (module cycles).
     """
-    # Build module-level edge map
-    module_callers = defaultdict(set)  # module_a calls module_b
-    for h, n in nodes.items():
-        for t, _ in out_adj.get(h, []):
-            if t in nodes and nodes[t]["module"] != n["module"]:
-                module_callers[n["module"]].add(nodes[t]["module"])
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
+    dag = ModuleDAG(a.modules, a.module_id[a.src], a.module_id[a.dst], np.ones(len(a.src), dtype=np.int64))
+    if len(np.unique(dag.src)) < 3:
+        return []
 
-    modules = list(module_callers.keys())
-    if len(modules) < 3:
+    one_way = dag.one_way()
+    if len(one_way) < 3:
         return []
 
-    # Find module pairs with one-directional calls only (no cycle)
-    acyclic_pairs = []
-    for a in modules:
-        for b in module_callers.get(a, []):
-            if a not in module_callers.get(b, set()):
-                acyclic_pairs.append((a, b))
+    # Nodes of the modules behind the heaviest one-way dependencies
+    top = one_way[np.argsort(-dag.weights[one_way], kind="stable")[:3]]
+    layer_mods = np.unique(np.concatenate([dag.src[top], dag.dst[top]]))
+    layer_nodes = a.pick(np.isin(a.module_id, layer_mods))
 
-    if len(acyclic_pairs) >= 3:
-        # Find modules involved in the acyclic chain
-        layer_nodes = list({h for h, n in nodes.items()
-                            if any(n["module"] in pair for pair in acyclic_pairs[:3])})
-        return [{
-            "nodes":       layer_nodes[:12],
-            "description": (f"Layered architecture: {len(acyclic_pairs)} strict "
-                            f"one-way module dependencies"),
-            "confidence":  round(min(0.85, 0.50 + len(acyclic_pairs) * 0.06), 2),
-        }]
-    return []
+    summary = dag.summary()
+    confidence = min(0.85, 0.50 + len(one_way) * 0.06) * (1 - summary["back_edge_ratio"])
+    description = (f"Layered architecture: {len(one_way)} strict one-way module "
+                   f"dependencies across {summary['layers']} layers")
+    if summary["back_edges"]:
+        description += f" ({summary['back_edges']} back-edges)"
+    return [{
+        "nodes":       layer_nodes[:12],
+        "description": description,
+        "confidence":  round(confidence, 2),
+    }]
 
 
-def detect_proxy(nodes, out_adj, in_adj) -> list[dict]:
+def detect_proxy(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Proxy: a node with high in-degree that delegates to one real-subject node
     with very low in-degree (≤ 1), adding pre/post hook calls around it.
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
-    for h, n in nodes.items():
+    for h in a.pick((a.in_deg >= 3) & (a.out_deg >= 3)):
+        n = nodes[h]
         in_deg = len(in_adj.get(h, []))
-        if in_deg < 3:
-            continue
         callees = [(t, nodes[t]) for t, _ in out_adj.get(h, []) if t in nodes]
         # Real subject: low in-degree callee in the same module
         subjects = [(t, cn) for t, cn in callees
@@ -513,32 +666,31 @@ def detect_proxy(nodes, out_adj, in_adj) -> list[dict]:
     return instances
 
 
-def detect_pipeline(nodes, out_adj, in_adj) -> list[dict]:
+def detect_pipeline(nodes, out_adj, in_adj, arrays=None) -> list[dict]:
     """
     Pipeline: a linear chain ≥ 4 steps where each stage has exactly one
     callee (the next stage). Entry point has many callers.
     Distinct from decorator by module context and naming.
     """
+    a = _with_arrays(nodes, out_adj, in_adj, arrays)
     instances = []
     visited = set()
-    for h, n in nodes.items():
+    # Entry of pipeline: called from outside (moderate in-degree), one callee
+    for h in a.pick((a.in_deg >= 1) & (a.out_deg == 1)):
         if h in visited:
             continue
-        in_deg = len(in_adj.get(h, []))
-        # Entry of pipeline: called from outside (moderate in-degree)
-        if in_deg >= 1:
-            chain = _bfs_chain(h, out_adj, in_adj)
-            if len(chain) >= 4:
-                for c in chain:
-                    visited.add(c)
-                instances.append({
-                    "nodes":       chain[:8],
-                    "description": (f"Processing pipeline: "
-                                    f"{nodes[chain[0]]['name']} → … → "
-                                    f"{nodes[chain[-1]]['name']} "
-                                    f"({len(chain)} stages)"),
-                    "confidence":  round(min(0.80, 0.38 + len(chain) * 0.07), 2),
-                })
+        chain = _bfs_chain(h, out_adj, in_adj)
+        if len(chain) >= 4:
+            for c in chain:
+                visited.add(c)
+            instances.append({
+                "nodes":       chain[:8],
+                "description": (f"Processing pipeline: "
+                                f"{nodes[chain[0]]['name']} → … → "
+                                f"{nodes[chain[-1]]['name']} "
+                                f"({len(chain)} stages)"),
+                "confidence":  round(min(0.80, 0.38 + len(chain) * 0.07), 2),
+            })
     return instances
 
 
@@ -564,39 +716,106 @@ DETECTORS = [
 ]
 
 
+# Forked workers read the graph from _SHARED, populated right before the pool
+# forks so it is inherited copy-on-write instead of pickled (the same
+# arrangement as enrich.py's step DAG).  In-process runs never touch it.
+_SHARED: dict = {}
+
+# Below this many nodes forking costs more than the detectors themselves.
+_PARALLEL_MIN_NODES = 50_000
+
+_BY_KEY = {key: fn for key, _, fn in DETECTORS}
+
+
+def _run_detector(key: str, nodes: dict, out_adj: dict, in_adj: dict, arrays) -> tuple[list[dict], float]:
+    """(raw instances, seconds) for one detector; errors are non-fatal."""
+    t0 = time.perf_counter()
+    try:
+        raw = _BY_KEY[key](nodes, out_adj, in_adj, arrays)
+    except Exception:
+        raw = []
+    return raw, time.perf_counter() - t0
+
+
+def _pool_detector(key: str) -> tuple[list[dict], float]:
+    """_run_detector in a forked worker, over the graph inherited via _SHARED."""
+    return _run_detector(key, _SHARED["nodes"], _SHARED["out_adj"], _SHARED["in_adj"], _SHARED["arrays"])
+
+
+def detect_patterns_timed(
+    conn: Optional[sqlite3.Connection] = None,
+    min_confidence: float = 0.50,
+    graph=None,
+    workers: Optional[int] = None,
+) -> tuple[list[dict], dict[str, float]]:
+    """
+    detect_all_patterns() plus {step: milliseconds} — "load" (adjacency and
+    degree arrays) and one entry per detector.
+
+    workers — process-pool size; defaults to min(4, CPU count) for graphs of
+    _PARALLEL_MIN_NODES or more and 1 (in-process) below that.  The pool
+    forks, so callers on a server thread or inside a cpu-lane worker pass 1.
+    """
+    t0 = time.perf_counter()
+    if graph is not None:
+        nodes, out_adj, in_adj = _adjacency_from_graph(graph)
+        arrays = _arrays_from_graph(graph)
+    else:
+        nodes, out_adj, in_adj = _load_graph(conn)
+        arrays = _graph_arrays(nodes, out_adj, in_adj)
+    timings = {"load": round((time.perf_counter() - t0) * 1000, 2)}
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, 4) if len(nodes) >= _PARALLEL_MIN_NODES else 1
+    workers = min(workers, len(DETECTORS))
+
+    keys = [key for key, _, _ in DETECTORS]
+    if workers <= 1 or "fork" not in mp.get_all_start_methods():
+        outputs = [_run_detector(key, nodes, out_adj, in_adj, arrays) for key in keys]
+    else:
+        _SHARED.update(nodes=nodes, out_adj=out_adj, in_adj=in_adj, arrays=arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork")) as pool:
+                outputs = list(pool.map(_pool_detector, keys))
+        finally:
+            _SHARED.clear()
+
+    results = []
+    for (pattern_key, display_name, _), (raw, seconds) in zip(DETECTORS, outputs):
+        timings[pattern_key] = round(seconds * 1000, 2)
+        # Attach node labels and filter by confidence
+        instances = []
+        for inst in raw:
+            if inst["confidence"] < min_confidence:
+                continue
+            inst["node_labels"] = [
+                _node_label(nodes[h]) for h in inst["nodes"] if h in nodes
+            ]
+            instances.append(inst)
+
+        if instances:
+            results.append({
+                "pattern":      pattern_key,
+                "display_name": display_name,
+                "count":        len(instances),
+                "instances":    instances,
+            })
+
+    results.sort(key=lambda r: r["count"], reverse=True)
+    return results, timings
+
+
 def detect_all_patterns(
-    conn: sqlite3.Connection,
+    conn: Optional[sqlite3.Connection] = None,
     min_confidence: float = 0.50,
+    graph=None,
+    workers: Optional[int] = None,
 ) -> list[dict]:
     """
     Run all pattern detectors against the graph.
     Returns list of { pattern, display_name, instances } dicts,
     sorted by total instance count descending.
-    """
-    nodes, out_adj, in_adj = _load_graph(conn)
-    results = []
-    for pattern_key, display_name, detector_fn in DETECTORS:
-        try:
-            raw = detector_fn(nodes, out_adj, in_adj)
-            # Attach node labels and filter by confidence
-            instances = []
-            for inst in raw:
-                if inst["confidence"] < min_confidence:
-                    continue
-                inst["node_labels"] = [
-                    _node_label(nodes[h]) for h in inst["nodes"] if h in nodes
-                ]
-                instances.append(inst)
-
-            if instances:
-                results.append({
-                    "pattern":      pattern_key,
-                    "display_name": display_name,
-                    "count":        len(instances),
-                    "instances":    instances,
-                })
-        except Exception:
-            pass  # Detector errors are non-fatal
 
-    results.sort(key=lambda r: r["count"], reverse=True)
-    return results
+    Pass graph (a shared CSRGraph) to skip re-reading nodes/edges from conn.
+    """
+    return detect_patterns_timed(conn, min_confidence, graph, workers)[0]
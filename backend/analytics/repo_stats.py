@@ -0,0 +1,62 @@
+"""
+Whole-repo graph statistics for the overview page — pure functions only.
+"""
+from __future__ import annotations
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+
+from .csr_graph import CSRGraph
+from .link_analysis import adjacency
+
+
+def degree_histogram(degrees: np.ndarray) -> list[dict]:
+    """
+    Counts in power-of-two buckets: 0, 1, 2–3, 4–7, …  Each bucket is
+    {"min", "max", "count"}; empty buckets past the largest degree are omitted.
+    """
+    if not len(degrees):
+        return []
+    # bucket 0 holds degree 0; bucket k ≥ 1 holds [2^(k-1), 2^k - 1]
+    buckets = np.zeros(len(degrees), dtype=np.int64)
+    nz = degrees > 0
+    buckets[nz] = np.floor(np.log2(degrees[nz])).astype(np.int64) + 1
+    counts = np.bincount(buckets)
+    return [
+        {
+            "min":   0 if k == 0 else 1 << (k - 1),
+            "max":   0 if k == 0 else (1 << k) - 1,
+            "count": int(c),
+        }
+        for k, c in enumerate(counts.tolist())
+    ]
+
+
+def graph_stats(graph: CSRGraph) -> dict:
+    """
+    SCC-based cycle counts and degree histograms of the internal call graph.
+
+    cycles — {count: SCCs with 2+ members, nodes: symbols inside them,
+              largest: biggest SCC size, self_loops: directly recursive symbols}
+    """
+    n = graph.n_nodes
+    if n == 0:
+        sizes = np.empty(0, dtype=np.int64)
+    else:
+        _, labels = connected_components(adjacency(graph), directed=True, connection="strong")
+        sizes = np.bincount(labels)
+    cyclic = sizes[sizes > 1]
+    self_loops = int((graph.edge_sources() == graph.out_targets).sum())
+
+    return {
+        "cycles": {
+            "count":      int(len(cyclic)),
+            "nodes":      int(cyclic.sum()),
+            "largest":    int(cyclic.max()) if len(cyclic) else 0,
+            "self_loops": self_loops,
+        },
+        "degree_histograms": {
+            "in":  degree_histogram(graph.in_degree()),
+            "out": degree_histogram(graph.out_degree()),
+        },
+    }
@@ -0,0 +1,86 @@
+"""
+Symbol-search tokenisation and ranking — pure functions only.
+
+Identifiers are split into lower-case words at snake_case / kebab-case
+separators and camelCase / acronym boundaries ("parseHTTPRequest_v2" →
+"parse http request v2"), so a query like "http request" or "http_request"
+finds it.  Candidates fetched from the trigram index are ranked into tiers:
+
+    0  exact       name equals the query (case-insensitive)
+    1  prefix      name starts with the query
+    2  word        a word of the name starts with the query's words
+    3  substring   name contains the query
+    4  path        only module / file_path contain the query
+    5  fuzzy       name shares enough trigrams with the query (typos)
+
+then by popularity (index rank = caller_count descending) within a tier.
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+MATCH_TIERS = ("exact", "prefix", "word", "substring", "path", "fuzzy")
+
+# Minimum trigram Jaccard similarity for a fuzzy match.
+FUZZY_THRESHOLD = 0.3
+
+_WORD_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def identifier_words(name: str) -> list[str]:
+    """Lower-case words of an identifier, split on separators and case changes."""
+    return [w.lower() for w in _WORD_RE.findall(name or "")]
+
+
+def trigrams(text: str) -> set[str]:
+    """Case-folded character trigrams (what the FTS5 trigram tokenizer indexes)."""
+    t = text.lower()
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+def fts_phrase(text: str) -> str:
+    """text as a quoted FTS5 string, safe to splice into a MATCH expression."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def match_tier(query: str, name: str, words: str, module: str | None, file_path: str | None) -> int | None:
+    """Tier index into MATCH_TIERS for one candidate, or None when it does not match."""
+    q, lname = query.lower(), (name or "").lower()
+    if lname == q:
+        return 0
+    if lname.startswith(q):
+        return 1
+    q_words = " ".join(identifier_words(query))
+    if q_words and f" {q_words}" in f" {words}":
+        return 2
+    if q in lname:
+        return 3
+    if q in (module or "").lower() or q in (file_path or "").lower():
+        return 4
+    q_grams = trigrams(query)
+    if q_grams:
+        n_grams = trigrams(name or "")
+        if len(q_grams & n_grams) / len(q_grams | n_grams) >= FUZZY_THRESHOLD:
+            return 5
+    return None
+
+
+def rank_candidates(query: str, candidates: Iterable[dict], limit: int) -> list[tuple[dict, str]]:
+    """
+    Best `limit` candidates as (row, tier name), ordered by (tier, rank).
+
+    candidates — rows with name, words, module, file_path and rank (lower =
+    more popular); duplicates by rank are collapsed.
+    """
+    seen: set[int] = set()
+    scored = []
+    for c in candidates:
+        if c["rank"] in seen:
+            continue
+        seen.add(c["rank"])
+        tier = match_tier(query, c["name"], c["words"], c["module"], c["file_path"])
+        if tier is not None:
+            scored.append((tier, c["rank"], c))
+    scored.sort(key=lambda t: (t[0], t[1]))
+    return [(c, MATCH_TIERS[tier]) for tier, _, c in scored[:limit]]
@@ -0,0 +1,194 @@
+"""
+Symbol × snapshot timeline of one repo — pure functions, no DB.
+
+A Timeline holds every symbol ever seen across a repo's snapshots as rows
+of column-aligned matrices, one column per snapshot in commit order:
+
+    content  int64[symbols, snapshots]   interned content hash, ABSENT if missing
+    metrics  float64[symbols, snapshots] caller_count / complexity / pagerank, NaN if missing
+
+Symbols are keyed "module::name" (as in analytics.diff and the explore
+page) and "modified" means the content hash changed, so moves that keep
+the implementation are not reported.  Snapshots are appended one column at
+a time; every question — when a symbol appeared or changed, churn per
+module, metric trends — is then one vectorised pass over the matrices
+rather than N−1 pairwise diffs.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+from .diff import _content_hash
+
+METRICS = ("caller_count", "complexity", "pagerank")
+ABSENT  = -1
+
+
+class Timeline:
+    """Append-only presence / content / metric matrices for one repo."""
+
+    def __init__(self) -> None:
+        self.snapshots: list[str] = []
+        self.keys:      list[str] = []
+        self.modules:   list[str | None] = []
+        self._row:    dict[str, int] = {}
+        self._hashes: dict[str, int] = {}
+        self.content = np.empty((0, 0), dtype=np.int64)
+        self.metrics = {m: np.empty((0, 0)) for m in METRICS}
+
+    # ── Construction ──────────────────────────────────────────────────────────
+
+    def copy(self) -> "Timeline":
+        """Independent copy to append to (append() never writes into existing arrays)."""
+        other = Timeline()
+        other.snapshots = list(self.snapshots)
+        other.keys      = list(self.keys)
+        other.modules   = list(self.modules)
+        other._row      = dict(self._row)
+        other._hashes   = dict(self._hashes)
+        other.content   = self.content
+        other.metrics   = dict(self.metrics)
+        return other
+
+    def append(self, snapshot_id: str, rows: Iterable[dict]) -> None:
+        """
+        Add the next (newest) snapshot.
+
+        rows — node dicts with hash, name, module and optionally the METRICS
+               fields (None / missing → NaN).  Duplicate keys: the last wins.
+        """
+        by_key = {f"{r['module']}::{r['name']}": r for r in rows}
+        for key, r in by_key.items():
+            if key not in self._row:
+                self._row[key] = len(self.keys)
+                self.keys.append(key)
+                self.modules.append(r["module"])
+
+        n, t = len(self.keys), len(self.snapshots)
+        grow = n - self.content.shape[0]
+        self.content = np.pad(self.content, ((0, grow), (0, 1)), constant_values=ABSENT)
+        for m in METRICS:
+            self.metrics[m] = np.pad(self.metrics[m], ((0, grow), (0, 1)), constant_values=np.nan)
+
+        idx = np.fromiter((self._row[k] for k in by_key), dtype=np.int64, count=len(by_key))
+        self.content[idx, t] = [
+            self._hashes.setdefault(_content_hash(r), len(self._hashes)) for r in by_key.values()
+        ]
+        for m in METRICS:
+            self.metrics[m][idx, t] = [
+                np.nan if r.get(m) is None else float(r[m]) for r in by_key.values()
+            ]
+        self.snapshots.append(snapshot_id)
+
+    # ── Vectorised views ──────────────────────────────────────────────────────
+
+    @property
+    def present(self) -> np.ndarray:
+        return self.content != ABSENT
+
+    def transitions(self) -> dict[str, np.ndarray]:
+        """bool[symbols, snapshots-1] masks of added / removed / modified per step."""
+        p, c = self.present, self.content
+        before, after = p[:, :-1], p[:, 1:]
+        return {
+            "added":    after & ~before,
+            "removed":  before & ~after,
+            "modified": before & after & (c[:, 1:] != c[:, :-1]),
+        }
+
+    def summary(self) -> dict:
+        """Symbol counts per snapshot and added/removed/modified totals per step."""
+        steps = self.transitions()
+        return {
+            "snapshots": [
+                {"id": s, "symbols": int(c)}
+                for s, c in zip(self.snapshots, self.present.sum(axis=0).tolist())
+            ],
+            "transitions": [
+                {"from": a, "to": b, **{k: int(v[:, i].sum()) for k, v in steps.items()}}
+                for i, (a, b) in enumerate(zip(self.snapshots, self.snapshots[1:]))
+            ],
+            "total_symbols": len(self.keys),
+        }
+
+    def symbol_history(self, key: str) -> dict | None:
+        """When key appeared, changed and disappeared, with its metric series."""
+        i = self._row.get(key)
+        if i is None:
+            return None
+        seen = np.flatnonzero(self.present[i])
+        events = []
+        for kind, mask in self.transitions().items():
+            events += [(int(t) + 1, kind) for t in np.flatnonzero(mask[i])]
+        events.sort()
+        return {
+            "key":        key,
+            "module":     self.modules[i],
+            "first_seen": self.snapshots[seen[0]],
+            "last_seen":  self.snapshots[seen[-1]],
+            "events":     [{"snapshot": self.snapshots[t], "event": kind} for t, kind in events],
+            "metrics": {
+                m: [None if np.isnan(v) else v for v in self.metrics[m][i].tolist()]
+                for m in METRICS
+            },
+        }
+
+    def most_changed(self, top: int = 20) -> list[dict]:
+        """Symbols with the most content changes across the timeline."""
+        changes = self.transitions()["modified"].sum(axis=1)
+        order = np.argsort(-changes, kind="stable")[:top]
+        return [
+            {"key": self.keys[i], "module": self.modules[i], "changes": int(changes[i])}
+            for i in order.tolist() if changes[i] > 0
+        ]
+
+    def module_churn(self, top: int | None = None) -> list[dict]:
+        """
+        Added / removed / modified symbols per module, in total and per step,
+        most-churned first (modules without churn are omitted).  One bincount
+        per event kind over (module, step).
+        """
+        names, codes = np.unique(np.array(self.modules, dtype=object).astype(str), return_inverse=True)
+        steps = max(len(self.snapshots) - 1, 0)
+        counts = {}
+        for kind, mask in self.transitions().items():
+            rows, cols = np.nonzero(mask)
+            counts[kind] = np.bincount(
+                codes[rows] * steps + cols, minlength=len(names) * steps,
+            ).reshape(len(names), steps)
+        churn = sum(counts.values())
+        totals = churn.sum(axis=1)
+        order = np.argsort(-totals, kind="stable")
+        order = order[totals[order] > 0]
+        if top is not None:
+            order = order[:top]
+        return [
+            {
+                "module":  names[j],
+                **{k: int(v[j].sum()) for k, v in counts.items()},
+                "churn":   int(churn[j].sum()),
+                "by_step": churn[j].tolist(),
+            }
+            for j in order.tolist()
+        ]
+
+    def metric_trend(self, metric: str, module: str | None = None) -> list[dict]:
+        """Per-snapshot count / sum / mean / max of metric over present symbols."""
+        values = self.metrics[metric]
+        if module is not None:
+            values = values[np.array([m == module for m in self.modules], dtype=bool)]
+        counts = (~np.isnan(values)).sum(axis=0)
+        sums   = np.nansum(values, axis=0)
+        maxes  = np.where(np.isnan(values), -np.inf, values).max(axis=0, initial=-np.inf)
+        return [
+            {
+                "snapshot": s,
+                "symbols":  int(c),
+                "sum":      round(float(total), 6),
+                "mean":     round(float(total / c), 6) if c else None,
+                "max":      float(mx) if c else None,
+            }
+            for s, c, total, mx in zip(self.snapshots, counts.tolist(), sums.tolist(), maxes.tolist())
+        ]
@@ -91,15 +91,13 @@ def _check_unstable_modules(state: dict) -> dict:
 
 
 def _check_cross_module_cycles(state: dict) -> dict:
-    """Detect large cross-module cycles using the pre-fetched call graph."""
-    call_graph = state["inputs"].get("call_graph", {})
-    nodes = call_graph.get("nodes", [])
-    edges = call_graph.get("edges", [])
+    """Detect large cross-module cycles using the shared call graph."""
+    graph = state["inputs"].get("call_graph")
 
-    if not nodes or not edges:
+    if graph is None or not graph.n_edges:
         return state
 
-    cycles = find_cycles(nodes, edges)
+    cycles = find_cycles(graph)
     cross = [c for c in cycles if c["cross_module"]]
 
     if cross:
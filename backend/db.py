@@ -3,13 +3,18 @@ Database helpers shared across queries and routers.
 No analysis logic lives here — only I/O primitives.
 """
 import json
+import math
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
-import networkx as nx
 from fastapi import HTTPException
 
+from metrics import ProfiledConnection
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 CONFIG_DIR = DATA_DIR
 
@@ -40,38 +45,233 @@ def _register_functions(conn: sqlite3.Connection) -> None:
     conn.create_function("dirdir",   1, _dirdir,   deterministic=True)
 
 
-def get_db(repo_id: str) -> sqlite3.Connection:
+class _StddevPop:
+    """Population standard deviation — registered as stddev_pop() in SQLite."""
+    def __init__(self):
+        self._vals: list[float] = []
+
+    def step(self, x):
+        if x is not None:
+            try:
+                self._vals.append(float(x))
+            except (TypeError, ValueError):
+                pass
+
+    def finalize(self):
+        n = len(self._vals)
+        if n < 2:
+            return 0.0
+        mean = sum(self._vals) / n
+        variance = sum((v - mean) ** 2 for v in self._vals) / n
+        return round(math.sqrt(variance), 4)
+
+
+class _StddevMerge:
+    """
+    stddev_merge(count, sum, sum_sq) — population stddev from per-group
+    moments, so pivot rollups can combine finer-grained partials.
+    """
+    def __init__(self):
+        self._n  = 0
+        self._s  = 0.0
+        self._ss = 0.0
+
+    def step(self, n, s, ss):
+        if n:
+            self._n  += n
+            self._s  += s or 0.0
+            self._ss += ss or 0.0
+
+    def finalize(self):
+        if self._n < 2:
+            return 0.0
+        mean = self._s / self._n
+        variance = max(self._ss / self._n - mean * mean, 0.0)
+        return round(math.sqrt(variance), 4)
+
+
+def _register_aggregates(conn: sqlite3.Connection) -> None:
+    """Register custom aggregates used by pivot measures."""
+    conn.create_aggregate("stddev_pop",   1, _StddevPop)
+    conn.create_aggregate("stddev_merge", 3, _StddevMerge)
+
+
+def resolve_db_path(repo_id: str) -> Path:
+    """
+    Path of the DB that backs repo_id.
+
+    Prefers the enriched DB when available — it is a strict superset of the
+    base schema.  Raises 404 when neither exists.
+    """
     base_path     = DATA_DIR / f"{repo_id}.db"
     enriched_path = DATA_DIR / f"{repo_id}.enriched.db"
-    # Prefer enriched DB when available — it is a strict superset of the base schema
     db_path = enriched_path if enriched_path.exists() else base_path
     if not db_path.exists():
         raise HTTPException(
             status_code=404,
             detail=f"Repo '{repo_id}' not found. Run: semfora-engine query callgraph --export data/{repo_id}.db",
         )
-    conn = sqlite3.connect(db_path)
+    return db_path
+
+
+def db_fingerprint(repo_id: str) -> tuple[str, int, int, int]:
+    """
+    (path, mtime_ns, size, inode) of the DB backing repo_id.
+
+    Changes whenever an import or enrichment rewrites or replaces the file,
+    so it is safe to use as a cache key for anything derived from the DB.
+    """
+    db_path = resolve_db_path(repo_id)
+    st = db_path.stat()
+    return str(db_path), st.st_mtime_ns, st.st_size, st.st_ino
+
+
+# ── Connections ──────────────────────────────────────────────────────────────
+
+# Applied to every read handle.  The API never writes to repo DBs (import and
+# enrichment run in their own processes), so handles are opened mode=ro and
+# pinned query_only; mmap + a 64 MiB page cache keep hot pages resident across
+# requests once the handle is pooled.
+_READ_PRAGMAS = (
+    "PRAGMA query_only = ON",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def _open_readonly(db_path: Path | str) -> sqlite3.Connection:
+    """Read-only, tuned connection with all custom SQL functions registered."""
+    # as_uri() percent-encodes the path, so "#", "?" and "%" survive the URI
+    conn = sqlite3.connect(
+        Path(db_path).resolve().as_uri() + "?mode=ro", uri=True, check_same_thread=False,
+        factory=ProfiledConnection,     # per-request SQL counts / timings (metrics.py)
+    )
     conn.row_factory = sqlite3.Row
+    for pragma in _READ_PRAGMAS:
+        conn.execute(pragma)
     _register_functions(conn)
+    _register_aggregates(conn)
     return conn
 
 
-def build_nx_graph(conn: sqlite3.Connection, include_external: bool = False) -> nx.DiGraph:
-    G = nx.DiGraph()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT hash, name, kind, module, file_path, line_start, complexity, caller_count, callee_count, risk FROM nodes"
-    )
-    for row in cur.fetchall():
-        G.add_node(row["hash"], **row_to_dict(row))
-    cur.execute("SELECT caller_hash, callee_hash, call_count FROM edges")
-    for row in cur.fetchall():
-        caller, callee = row["caller_hash"], row["callee_hash"]
-        if not include_external and (callee.startswith("ext:") or caller.startswith("ext:")):
-            continue
-        if G.has_node(caller) and G.has_node(callee):
-            G.add_edge(caller, callee, call_count=row["call_count"])
-    return G
+@contextmanager
+def temp_writes(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Temporarily lift query_only so a lazily built TEMP table can be created
+    on a read handle (mode=ro still forbids touching the DB file itself).
+    """
+    prev = conn.execute("PRAGMA query_only").fetchone()[0]
+    conn.execute("PRAGMA query_only = OFF")
+    try:
+        yield conn
+    finally:
+        conn.execute(f"PRAGMA query_only = {int(prev)}")
+
+
+def get_db(repo_id: str) -> sqlite3.Connection:
+    """
+    Fresh, unpooled read-only connection — the caller owns and closes it.
+
+    Request handlers should use open_db() instead so handles are reused.
+    """
+    return _open_readonly(resolve_db_path(repo_id))
+
+
+class ConnectionPool:
+    """
+    Per-repo pool of idle read-only connections.
+
+    Idle handles are tagged with the db_fingerprint() they were opened
+    against; when the file is replaced (re-import / re-enrich) stale handles
+    are closed instead of being handed out again.
+    """
+
+    def __init__(self, max_idle: int = 4):
+        self.max_idle = max_idle
+        self._idle: dict[str, tuple[tuple, list[sqlite3.Connection]]] = {}
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def acquire(self, repo_id: str) -> tuple[sqlite3.Connection, tuple]:
+        """Check out a connection; returns (conn, fingerprint) for release()."""
+        fingerprint = db_fingerprint(repo_id)
+        stale: list[sqlite3.Connection] = []
+        conn = None
+        with self._lock:
+            entry = self._idle.get(repo_id)
+            if entry is not None and entry[0] != fingerprint:
+                stale = entry[1]
+                del self._idle[repo_id]
+            elif entry is not None and entry[1]:
+                conn = entry[1].pop()
+                self.reused += 1
+        for c in stale:
+            c.close()
+        if conn is None:
+            conn = _open_readonly(fingerprint[0])
+            with self._lock:
+                self.opened += 1
+        return conn, fingerprint
+
+    def release(self, repo_id: str, conn: sqlite3.Connection, fingerprint: tuple) -> None:
+        """Return a connection to the pool (or close it if the pool is full/stale)."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        with self._lock:
+            entry = self._idle.setdefault(repo_id, (fingerprint, []))
+            # A mismatch means the file changed while this handle was out;
+            # the next acquire() sorts out which generation is current.
+            if entry[0] == fingerprint and len(entry[1]) < self.max_idle:
+                entry[1].append(conn)
+                return
+        conn.close()
+
+    def close_all(self, repo_id: str | None = None) -> None:
+        """Close idle handles for one repo (or every repo)."""
+        with self._lock:
+            if repo_id is None:
+                entries = list(self._idle.values())
+                self._idle.clear()
+            else:
+                entry = self._idle.pop(repo_id, None)
+                entries = [entry] if entry else []
+        for _, conns in entries:
+            for c in conns:
+                c.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "idle":   {r: len(c) for r, (_, c) in self._idle.items()},
+                "opened": self.opened,
+                "reused": self.reused,
+            }
+
+
+pool = ConnectionPool()
+
+
+@contextmanager
+def open_db(repo_id: str) -> Iterator[sqlite3.Connection]:
+    """
+    Check a pooled read-only connection out for the duration of a block:
+
+        with open_db(repo_id) as conn:
+            data = fetch_something(conn)
+
+    Raises 404 (via resolve_db_path) when the repo doesn't exist.
+    """
+    conn, fingerprint = pool.acquire(repo_id)
+    try:
+        yield conn
+    finally:
+        pool.release(repo_id, conn, fingerprint)
 
 
 # ── Load-bearing config ──────────────────────────────────────────────────────
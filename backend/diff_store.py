@@ -0,0 +1,193 @@
+"""
+Process-wide cache of diff snapshots and persisted diffs between snapshot pairs.
+
+Every diff endpoint (/api/diff, /api/diff-graph, /diff-status and the
+explore compare_to overlay) needs each side's full node and edge lists
+(queries/graph.fetch_diff_snapshot).  DiffStore loads a snapshot once per
+DB fingerprint and keeps it in a small LRU, so toggling the overlay or
+re-diffing against the same base reuses both sides.
+
+Pair-level results that do not depend on request parameters — the
+status map, the move / rename pairs and the compute_diff summary — are
+additionally written to data/diffs/ as JSON sidecars tagged with both DB
+fingerprints and RESULT_VERSION.  They survive restarts and are ignored
+(and rewritten) once either side or the result format changes.
+
+Snapshots and results are shared between requests: treat them as read-only.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+from urllib.parse import quote
+
+from analytics.diff import compute_diff, compute_diff_status_map, match_moves
+from db import DATA_DIR, db_fingerprint, open_db
+from metrics import analytics_span
+from queries.graph import fetch_diff_snapshot
+
+DIFFS_DIR = DATA_DIR / "diffs"
+
+# Bump when a persisted result's shape changes so old sidecars are recomputed.
+RESULT_VERSION = 2
+
+
+class DiffStore:
+    """Thread-safe LRU of diff snapshots plus a fingerprinted pair-result store."""
+
+    def __init__(self, diffs_dir: Path = DIFFS_DIR, max_snapshots: int = 8, max_results: int = 64):
+        self.diffs_dir     = diffs_dir
+        self.max_snapshots = max_snapshots
+        self.max_results   = max_results
+        self._snapshots: OrderedDict[str, tuple[tuple, dict]] = OrderedDict()
+        self._results:   OrderedDict[tuple, object] = OrderedDict()
+        self._lock     = threading.Lock()
+        self._loading: dict[str, threading.Lock] = {}
+        self.hits       = 0
+        self.misses     = 0
+        self.disk_hits  = 0
+
+    # ── Snapshots ─────────────────────────────────────────────────────────────
+
+    def snapshot(self, repo_id: str) -> dict:
+        """fetch_diff_snapshot() for repo_id, loaded at most once per DB fingerprint."""
+        fingerprint = db_fingerprint(repo_id)
+        with self._lock:
+            snap = self._lookup_snapshot(repo_id, fingerprint)
+            if snap is not None:
+                return snap
+            load_lock = self._loading.setdefault(repo_id, threading.Lock())
+
+        # One loader per repo; concurrent requests wait and reuse its result.
+        with load_lock:
+            with self._lock:
+                snap = self._lookup_snapshot(repo_id, fingerprint)
+                if snap is not None:
+                    return snap
+                self.misses += 1
+
+            with open_db(repo_id) as conn:
+                snap = fetch_diff_snapshot(conn)
+
+            with self._lock:
+                self._snapshots[repo_id] = (fingerprint, snap)
+                self._snapshots.move_to_end(repo_id)
+                while len(self._snapshots) > self.max_snapshots:
+                    self._snapshots.popitem(last=False)
+        return snap
+
+    # ── Pair results ──────────────────────────────────────────────────────────
+
+    def status_map(self, base_id: str, head_id: str) -> dict:
+        """compute_diff_status_map(base → head), persisted per snapshot pair."""
+        return self._pair_result("status", base_id, head_id, lambda a, b: compute_diff_status_map(
+            list(a["nodes_by_key"].values()), list(b["nodes_by_key"].values()),
+        ))
+
+    def moves(self, base_id: str, head_id: str) -> list[dict]:
+        """match_moves(base → head), persisted per snapshot pair."""
+        return self._pair_result("moves", base_id, head_id, lambda a, b: match_moves(
+            list(a["nodes_by_key"].values()), list(b["nodes_by_key"].values()),
+        ))
+
+    def summary(self, base_id: str, head_id: str) -> dict:
+        """compute_diff(base → head), persisted per snapshot pair."""
+        return self._pair_result("summary", base_id, head_id, lambda a, b: compute_diff(
+            list(a["nodes_by_key"].values()), list(b["nodes_by_key"].values()),
+            a["module_edges"], b["module_edges"],
+        ))
+
+    def invalidate(self, repo_id: str | None = None) -> None:
+        """Drop in-memory state for one repo (or everything); sidecars self-validate."""
+        with self._lock:
+            if repo_id is None:
+                self._snapshots.clear()
+                self._results.clear()
+                return
+            self._snapshots.pop(repo_id, None)
+            for key in [k for k in self._results if repo_id in (k[1], k[2])]:
+                del self._results[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "snapshots": list(self._snapshots),
+                "results":   len(self._results),
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "disk_hits": self.disk_hits,
+            }
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _lookup_snapshot(self, repo_id: str, fingerprint: tuple) -> dict | None:
+        """Caller must hold self._lock."""
+        entry = self._snapshots.get(repo_id)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        self._snapshots.move_to_end(repo_id)
+        self.hits += 1
+        return entry[1]
+
+    def _sidecar(self, kind: str, base_id: str, head_id: str) -> Path:
+        def safe(rid: str) -> str: return quote(rid, safe="@.-_")
+        return self.diffs_dir / f"{safe(base_id)}..{safe(head_id)}.{kind}.json"
+
+    def _pair_result(
+        self, kind: str, base_id: str, head_id: str, compute: Callable[[dict, dict], object],
+    ) -> object:
+        fingerprints = [list(db_fingerprint(base_id)), list(db_fingerprint(head_id))]
+        key = (kind, base_id, head_id)
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and entry[0] == fingerprints:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        path = self._sidecar(kind, base_id, head_id)
+        result = None
+        try:
+            doc = json.loads(path.read_text())
+            if doc.get("version") == RESULT_VERSION and doc.get("fingerprints") == fingerprints:
+                result = doc["result"]
+                with self._lock:
+                    self.disk_hits += 1
+        except (OSError, ValueError, KeyError):
+            pass
+
+        if result is None:
+            snap_a, snap_b = self.snapshot(base_id), self.snapshot(head_id)
+            with analytics_span(f"diff_{kind}"):
+                result = compute(snap_a, snap_b)
+            self._write_sidecar(path, {
+                "version": RESULT_VERSION, "fingerprints": fingerprints, "result": result,
+            })
+
+        with self._lock:
+            self._results[key] = (fingerprints, result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return result
+
+    def _write_sidecar(self, path: Path, doc: dict) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(doc))
+            os.replace(tmp, path)
+        except OSError:
+            pass        # read-only data dir: the in-memory copy still works
+
+
+diff_store = DiffStore()
+
+
+def get_snapshot(repo_id: str) -> dict:
+    """Shared diff snapshot for repo_id (raises 404 when the repo doesn't exist)."""
+    return diff_store.snapshot(repo_id)
@@ -9,9 +9,16 @@ recomputing graph algorithms at request time.
 Usage:
     python3 enrich.py data/myrepo.db
     python3 enrich.py --all          # enrich every DB in data/
+    python3 enrich.py --workers 1 data/myrepo.db   # force sequential steps
+    python3 enrich.py --base data/myrepo@old.enriched.db data/myrepo@new.db
+                                     # incremental: recompute only what changed
+
+Steps run as a small DAG (see _STEPS) in a fork-based process pool: the SCC
+condensation is computed once and feeds the SCC / topo / reachability steps,
+while centrality, community and boundary signals run alongside it.
 
 Signals computed (25 columns):
-    Graph-structural (NetworkX):
+    Graph-structural (NetworkX; PageRank / HITS via analytics.link_analysis):
       scc_id, scc_size, scc_cross_module
       topological_depth, reverse_topological_depth
       transitive_callers, transitive_callees
@@ -34,23 +41,53 @@ Signals computed (25 columns):
       community_id            Louvain community integer
       community_dominant_mod  most common declared module in this community
       community_alignment     bool: community_dominant_mod == declared module
+
+Also writes a `node_class(hash, class_name, class_hash)` table: each node's
+innermost containing class by line range (backs the explore "class" dim),
+`blast_index` (queries/blast_index.py): each node's callers within 10
+hops, so /blast-radius is a lookup instead of a graph load + BFS (skipped
+past BLAST_MAX_PAIRS; see blast_index_status), and the
+FTS5 trigram `symbol_search` index (queries/search_index.py) behind /search,
+and `repo_stats` (queries/repos.py): the /overview aggregates plus SCC
+cycle counts and degree histograms.
 """
 from __future__ import annotations
 
 import argparse
 import math
+import multiprocessing as mp
+import os
 import shutil
 import sqlite3
 import sys
 import time
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable
 
 import networkx as nx
+import numpy as np
 from networkx.algorithms.community import louvain_communities
 
+from analytics.betweenness import betweenness
+from analytics.csr_graph import CSRGraph
+from analytics.link_analysis import hits, pagerank
+from queries.blast_index import BLAST_MAX_PAIRS, write_blast_index
+from queries.core import fetch_call_graph
+from queries.explore import write_node_class
+from queries.repos import write_repo_stats
+from queries.search_index import write_search_index
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# Sources sampled for betweenness above 3000 nodes.  Every node needs a
+# score, not just a top-K ranking, so enrich samples a fixed, seeded number
+# of sources (the NetworkX path used k=500) instead of waiting for an
+# error bound that on large graphs only closes near all n sources.
+_BETWEENNESS_SAMPLES = 1000
+
 
 def enriched_path(db_path: Path) -> Path:
     """Return the path for the enriched copy of a raw DB."""
@@ -89,40 +126,23 @@ CREATE TABLE IF NOT EXISTS node_features (
 
 # ── Graph construction ────────────────────────────────────────────────────────
 
-def _build_graph(conn: sqlite3.Connection) -> tuple[nx.DiGraph, dict[str, dict]]:
-    """Build internal call graph and node metadata dict."""
+def _build_graph(conn: sqlite3.Connection) -> tuple[CSRGraph, dict[str, dict]]:
+    """Build internal call graph (CSR; .to_networkx() for NetworkX steps) and node metadata dict."""
     conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-
-    cur.execute(
-        "SELECT hash, name, module, complexity, caller_count, callee_count "
-        "FROM nodes WHERE hash NOT LIKE 'ext:%'"
-    )
-    node_rows = {r["hash"]: dict(r) for r in cur.fetchall()}
-
-    cur.execute(
-        "SELECT caller_hash, callee_hash FROM edges "
-        "WHERE caller_hash NOT LIKE 'ext:%' AND callee_hash NOT LIKE 'ext:%'"
-    )
-    edge_rows = [
-        (r["caller_hash"], r["callee_hash"]) for r in cur.fetchall()
-        if r["caller_hash"] in node_rows and r["callee_hash"] in node_rows
-    ]
-
-    G = nx.DiGraph()
-    G.add_nodes_from(node_rows)
-    G.add_edges_from(edge_rows)
-    return G, node_rows
+    graph = fetch_call_graph(conn)
+    node_meta = dict(zip(graph.hashes, graph.nodes))
+    return graph, node_meta
 
 
 # ── SCC signals ───────────────────────────────────────────────────────────────
 
 def _compute_scc_signals(
-    G: nx.DiGraph, node_meta: dict[str, dict]
+    cond: nx.DiGraph, node_meta: dict[str, dict]
 ) -> dict[str, dict]:
-    sccs = list(nx.strongly_connected_components(G))
+    """SCC id/size/cross-module flag; ids are the condensation's node ids."""
+    members = nx.get_node_attributes(cond, "members")
     result = {}
-    for scc_id, scc in enumerate(sccs):
+    for scc_id, scc in members.items():
         modules = {node_meta[h]["module"] for h in scc if h in node_meta}
         cross = len(modules) > 1
         for h in scc:
@@ -136,7 +156,7 @@ def _compute_scc_signals(
 
 # ── Topological depth (condensation DAG) ─────────────────────────────────────
 
-def _compute_topo_depths(G: nx.DiGraph) -> tuple[dict[str, int], dict[str, int]]:
+def _compute_topo_depths(cond: nx.DiGraph) -> dict[str, dict]:
     """
     Compute topological depth (from sources) and reverse depth (from sinks)
     on the SCC-condensed DAG using dynamic programming.
@@ -154,7 +174,6 @@ def _compute_topo_depths(G: nx.DiGraph) -> tuple[dict[str, int], dict[str, int]]
                     depth[succ] = depth[node] + 1
         return depth
 
-    cond = nx.condensation(G)
     members = nx.get_node_attributes(cond, "members")
 
     fwd_depth = _dag_depth(cond, reverse=False)
@@ -172,14 +191,13 @@ def _compute_topo_depths(G: nx.DiGraph) -> tuple[dict[str, int], dict[str, int]]
 
 # ── Transitive reachability via condensation DP ───────────────────────────────
 
-def _compute_reachability(G: nx.DiGraph) -> dict[str, dict]:
+def _compute_reachability(cond: nx.DiGraph) -> dict[str, dict]:
     """
     Compute transitive_callers and transitive_callees for every node.
 
     Uses SCC condensation + topological DP — O(V + E) after condensation.
     Each node's count = size of SCC + sum of descendant SCC sizes.
     """
-    cond = nx.condensation(G)
     members = nx.get_node_attributes(cond, "members")
     scc_size = {n: len(members[n]) for n in cond.nodes}
 
@@ -207,22 +225,39 @@ def _compute_reachability(G: nx.DiGraph) -> dict[str, dict]:
 
 # ── NetworkX centrality measures ─────────────────────────────────────────────
 
-def _compute_centrality(G: nx.DiGraph) -> dict[str, dict]:
-    n = len(G.nodes)
+def _betweenness(graph: CSRGraph) -> dict[str, float]:
+    """Exact for small graphs, _BETWEENNESS_SAMPLES seeded sources (analytics.betweenness) for large ones."""
+    max_samples = None if graph.n_nodes <= 3000 else _BETWEENNESS_SAMPLES
+    scores, _ = betweenness(graph, epsilon=0.0, max_samples=max_samples)
+    return dict(zip(graph.hashes, scores.tolist()))
 
-    # Betweenness (exact for small graphs, approximate for large)
-    if n <= 3000:
-        bc = nx.betweenness_centrality(G, normalized=True)
-    else:
-        bc = nx.betweenness_centrality(G, normalized=True, k=min(500, n))
 
-    pr = nx.pagerank(G, alpha=0.85, max_iter=200)
+def _pagerank_hits(
+    graph:      CSRGraph,
+    pr_start:   np.ndarray | None = None,
+    auth_start: np.ndarray | None = None,
+) -> tuple[dict, dict, dict]:
+    """
+    PageRank + HITS on the sparse adjacency, optionally warm-started from a
+    previous solution (arrays aligned with graph.hashes).
+    """
+    pr = pagerank(graph, alpha=0.85, max_iter=200, start=pr_start)
 
     try:
-        hubs, auths = nx.hits(G, max_iter=200, normalized=True)
+        hubs, auths = hits(graph, max_iter=200, authority_start=auth_start)
     except nx.PowerIterationFailedConvergence:
-        hubs  = {h: 0.0 for h in G.nodes}
-        auths = {h: 0.0 for h in G.nodes}
+        hubs = auths = np.zeros(graph.n_nodes)
+    return (
+        dict(zip(graph.hashes, pr.tolist())),
+        dict(zip(graph.hashes, hubs.tolist())),
+        dict(zip(graph.hashes, auths.tolist())),
+    )
+
+
+def _compute_centrality(graph: CSRGraph) -> dict[str, dict]:
+    G = graph.to_networkx()
+    bc = _betweenness(graph)
+    pr, hubs, auths = _pagerank_hits(graph)
 
     # Clustering on undirected projection
     UG = G.to_undirected()
@@ -243,65 +278,78 @@ def _compute_centrality(G: nx.DiGraph) -> dict[str, dict]:
 # ── Module boundary signals (SQL) ─────────────────────────────────────────────
 
 def _compute_boundary_signals(
-    conn: sqlite3.Connection, node_meta: dict[str, dict]
+    conn: sqlite3.Connection,
+    node_meta: dict[str, dict],
+    modules: set[str] | None = None,
 ) -> dict[str, dict]:
+    """
+    Cross-module call signals.  With `modules`, only nodes declared in those
+    modules are computed (incremental mode); others are omitted.
+    """
     cur = conn.cursor()
+    if modules is None:
+        only, params = "", ()
+    else:
+        params = tuple(sorted(modules))
+        only   = f"AND n.module IN ({','.join('?' * len(params))})"
 
     # xmod_fan_in
-    cur.execute("""
+    cur.execute(f"""
         SELECT n.hash, COUNT(DISTINCT n2.module) AS xmod_fan_in
         FROM nodes n
         JOIN edges e  ON e.callee_hash = n.hash
         JOIN nodes n2 ON e.caller_hash = n2.hash
         WHERE n.hash  NOT LIKE 'ext:%'
           AND n2.module IS NOT NULL AND n2.module != n.module
-          AND n2.module != '__external__'
+          AND n2.module != '__external__' {only}
         GROUP BY n.hash
-    """)
+    """, params)
     xmod_fan_in = {r["hash"]: r["xmod_fan_in"] for r in cur.fetchall()}
 
     # xmod_fan_out
-    cur.execute("""
+    cur.execute(f"""
         SELECT n.hash, COUNT(DISTINCT n2.module) AS xmod_fan_out
         FROM nodes n
         JOIN edges e  ON e.caller_hash = n.hash
         JOIN nodes n2 ON e.callee_hash = n2.hash
         WHERE n.hash  NOT LIKE 'ext:%'
           AND n2.module IS NOT NULL AND n2.module != n.module
-          AND n2.module != '__external__' AND n2.hash NOT LIKE 'ext:%'
+          AND n2.module != '__external__' AND n2.hash NOT LIKE 'ext:%' {only}
         GROUP BY n.hash
-    """)
+    """, params)
     xmod_fan_out = {r["hash"]: r["xmod_fan_out"] for r in cur.fetchall()}
 
     # xmod_call_ratio + dominant callee module
-    cur.execute("""
+    cur.execute(f"""
         SELECT n.hash,
                CAST(SUM(CASE WHEN n2.module != n.module AND n2.module != '__external__'
                              THEN 1 ELSE 0 END) AS REAL) / COUNT(*) AS xmod_ratio
         FROM nodes n
         JOIN edges e  ON e.caller_hash = n.hash
         JOIN nodes n2 ON e.callee_hash = n2.hash
-        WHERE n.hash NOT LIKE 'ext:%' AND n2.hash NOT LIKE 'ext:%'
+        WHERE n.hash NOT LIKE 'ext:%' AND n2.hash NOT LIKE 'ext:%' {only}
         GROUP BY n.hash
-    """)
+    """, params)
     xmod_ratio = {r["hash"]: round(r["xmod_ratio"] or 0, 4) for r in cur.fetchall()}
 
     # dominant callee module
-    cur.execute("""
+    cur.execute(f"""
         SELECT n.hash, n2.module AS callee_mod, COUNT(*) AS cnt
         FROM nodes n
         JOIN edges e  ON e.caller_hash = n.hash
         JOIN nodes n2 ON e.callee_hash = n2.hash
         WHERE n.hash NOT LIKE 'ext:%' AND n2.hash NOT LIKE 'ext:%'
-          AND n2.module != '__external__'
+          AND n2.module != '__external__' {only}
         GROUP BY n.hash, n2.module
-    """)
+    """, params)
     callee_counts: dict[str, dict[str, int]] = defaultdict(dict)
     for r in cur.fetchall():
         callee_counts[r["hash"]][r["callee_mod"]] = r["cnt"]
 
     result = {}
-    for h in node_meta:
+    for h, meta in node_meta.items():
+        if modules is not None and meta["module"] not in modules:
+            continue
         xfi  = xmod_fan_in.get(h, 0)
         xfo  = xmod_fan_out.get(h, 0)
         xrat = xmod_ratio.get(h, 0.0)
@@ -371,7 +419,13 @@ def _compute_community_signals(
     for cid, comm in enumerate(communities):
         for h in comm:
             hash_to_comm[h] = cid
+    return _community_rows(hash_to_comm, node_meta)
 
+
+def _community_rows(
+    hash_to_comm: dict[str, int], node_meta: dict[str, dict]
+) -> dict[str, dict]:
+    """Per-node community columns for a given community assignment."""
     # Dominant module per community
     comm_mod_counts: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
     for h, cid in hash_to_comm.items():
@@ -396,14 +450,397 @@ def _compute_community_signals(
     return result
 
 
+# ── Incremental re-enrichment (--base) ────────────────────────────────────────
+# The base is an earlier enriched DB of the same repo.  Node hashes are
+# "module_hash:content_hash", so a node present in both snapshots with the
+# same module and the same caller/callee sets is "unchanged"; everything is
+# recomputed only around the changed region and carried over elsewhere.
+
+# Fraction of nodes added, removed or rewired above which the global signals
+# (betweenness, Louvain communities) are recomputed instead of carried over.
+_GLOBAL_DRIFT_THRESHOLD = 0.05
+
+
+@dataclass(frozen=True)
+class _Base:
+    features: dict[str, dict]     # hash → node_features row
+    G:        nx.DiGraph
+    modules:  dict[str, str]
+
+
+def _load_base(base_path: Path) -> _Base | None:
+    """Read a previous enriched DB; None when it has no node_features."""
+    conn = sqlite3.connect(f"file:{base_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'node_features'"
+        ).fetchone():
+            return None
+        features = {r["hash"]: dict(r) for r in conn.execute("SELECT * FROM node_features")}
+        graph, meta = _build_graph(conn)
+    finally:
+        conn.close()
+    return _Base(features, graph.to_networkx(), {h: m["module"] for h, m in meta.items()})
+
+
+def _changed_nodes(
+    G: nx.DiGraph, node_meta: dict[str, dict], base: _Base
+) -> tuple[set[str], int]:
+    """
+    (changed, n_removed): nodes that are new, moved module or gained/lost a
+    caller or callee since the base.  Neighbours of removed nodes lost an
+    edge, so removals are covered by `changed` as well.
+    """
+    changed = set()
+    for h in G.nodes:
+        if (
+            h not in base.features
+            or h not in base.G
+            or node_meta[h]["module"] != base.modules.get(h)
+            or set(G.successors(h))   != set(base.G.successors(h))
+            or set(G.predecessors(h)) != set(base.G.predecessors(h))
+        ):
+            changed.add(h)
+    return changed, sum(1 for h in base.G.nodes if h not in G)
+
+
+def _neighbourhood(G: nx.DiGraph, nodes: set[str]) -> set[str]:
+    """nodes plus every direct caller and callee of them."""
+    out = set(nodes)
+    for h in nodes:
+        out.update(G.successors(h))
+        out.update(G.predecessors(h))
+    return out
+
+
+def _carried_dag_dp(
+    dag:     nx.DiGraph,
+    dirty:   set[int],
+    init:    Callable[[int], int],
+    combine: Callable[[int, int], int],
+    carried: Callable[[int], int],
+) -> dict[int, int]:
+    """
+    value[n] = init(n) folded with combine(value, value[p]) over predecessors,
+    in topological order.  A value depends only on the node's ancestors, so
+    nodes neither dirty nor downstream of a dirty node take carried(n).
+    """
+    values: dict[int, int] = {}
+    stale:  set[int] = set()
+    for node in nx.topological_sort(dag):
+        preds = list(dag.predecessors(node))
+        if node in dirty or any(p in stale for p in preds):
+            stale.add(node)
+            v = init(node)
+            for p in preds:
+                v = combine(v, values[p])
+            values[node] = v
+        else:
+            values[node] = carried(node)
+    return values
+
+
+def _compute_structure_incremental(
+    cond: nx.DiGraph, base: _Base, changed: set[str]
+) -> dict[str, dict]:
+    """
+    Topological depths and transitive reachability, recomputed only for
+    condensation nodes whose ancestors (callers side) or descendants (callees
+    side) include a changed node.  Matches _compute_topo_depths and
+    _compute_reachability exactly.
+    """
+    members = nx.get_node_attributes(cond, "members")
+    dirty   = {cond.graph["mapping"][h] for h in changed}
+    rev     = cond.reverse(copy=False)
+
+    def carry(column: str, offset: int = 0) -> Callable[[int], int]:
+        # Clean SCCs have identical reachable subgraphs, so any member will do
+        return lambda n: base.features[next(iter(members[n]))][column] + offset
+
+    def size(n: int) -> int:
+        return len(members[n])
+
+    def deeper(v: int, p: int) -> int:
+        return max(v, p + 1)
+
+    def add(v: int, p: int) -> int:
+        return v + p
+
+    fwd   = _carried_dag_dp(cond, dirty, lambda n: 0, deeper, carry("topological_depth"))
+    back  = _carried_dag_dp(rev,  dirty, lambda n: 0, deeper, carry("reverse_topological_depth"))
+    above = _carried_dag_dp(cond, dirty, size, add, carry("transitive_callers", 1))
+    below = _carried_dag_dp(rev,  dirty, size, add, carry("transitive_callees", 1))
+
+    result = {}
+    for scc_node in cond.nodes:
+        for h in members[scc_node]:
+            result[h] = {
+                "topological_depth":         fwd[scc_node],
+                "reverse_topological_depth": back[scc_node],
+                "transitive_callers":        above[scc_node] - 1,
+                "transitive_callees":        below[scc_node] - 1,
+            }
+    return result
+
+
+def _compute_centrality_incremental(
+    graph: CSRGraph, base: _Base, changed: set[str], recompute_global: bool
+) -> dict[str, dict]:
+    """
+    PageRank/HITS warm-started from the base scores (a few iterations instead
+    of a cold solve); clustering only around changed nodes; betweenness
+    carried over (0 for new nodes) unless recompute_global.
+    """
+    G    = graph.to_networkx()
+    prev = base.features
+    n    = graph.n_nodes
+
+    pr_start  = np.array([prev[h]["pagerank"] if h in prev else 1 / n for h in graph.hashes])
+    # svds iterates on the authority side, so seed it with the old authorities
+    auth_start = np.array([prev[h]["authority_score"] if h in prev else 1 / n for h in graph.hashes])
+    if not auth_start.any():
+        auth_start = None                 # base HITS failed to converge
+    pr, hubs, auths = _pagerank_hits(graph, pr_start, auth_start)
+
+    bc = _betweenness(graph) if recompute_global else None
+
+    # A node's clustering coefficient only sees edges among its neighbours
+    UG = G.to_undirected()
+    touched = _neighbourhood(G, changed)
+    clust = nx.clustering(UG, nodes=touched) if touched else {}
+
+    result = {}
+    for h in G.nodes:
+        old = prev.get(h, {})
+        result[h] = {
+            "betweenness_centrality": round(bc.get(h, 0), 6) if bc is not None
+                                      else old.get("betweenness_centrality", 0.0),
+            "pagerank":               round(pr.get(h, 0), 6),
+            "hub_score":              round(hubs.get(h, 0), 6),
+            "authority_score":        round(auths.get(h, 0), 6),
+            "clustering_coeff":       round(clust[h], 4) if h in clust
+                                      else old.get("clustering_coeff", 0.0),
+        }
+    return result
+
+
+def _compute_community_incremental(
+    G: nx.DiGraph, node_meta: dict[str, dict], base: _Base, recompute_global: bool
+) -> dict[str, dict]:
+    """
+    Keep the base community assignment; a new node joins the most common
+    community among its neighbours (or a fresh singleton, as Louvain would
+    give an isolated node).  Dominant module / alignment are recomputed.
+    """
+    if recompute_global:
+        return _compute_community_signals(G, node_meta)
+
+    hash_to_comm = {
+        h: base.features[h]["community_id"] for h in G.nodes
+        if h in base.features and base.features[h]["community_id"] is not None
+    }
+    next_id = max(hash_to_comm.values(), default=-1) + 1
+    for h in G.nodes:
+        if h in hash_to_comm:
+            continue
+        votes: dict[int, int] = defaultdict(int)
+        for nb in (*G.successors(h), *G.predecessors(h)):
+            if nb in hash_to_comm:
+                votes[hash_to_comm[nb]] += 1
+        if votes:
+            hash_to_comm[h] = max(votes, key=votes.get)
+        else:
+            hash_to_comm[h] = next_id
+            next_id += 1
+    return _community_rows(hash_to_comm, node_meta)
+
+
+# ── Step DAG ──────────────────────────────────────────────────────────────────
+# Steps are module-level functions reading the graph from _SHARED, which is
+# populated before the pool forks so workers inherit it copy-on-write instead
+# of receiving a pickled copy.  A step's dependency results are passed as
+# positional arguments (pickled between processes).
+
+_SHARED: dict[str, Any] = {}
+
+# Below this many nodes fork + pickling costs more than the steps themselves.
+_PARALLEL_MIN_NODES = 2000
+
+
+@dataclass(frozen=True)
+class _Step:
+    label: str
+    fn:    Callable[..., Any]
+    deps:  tuple[str, ...] = ()
+    merge: bool = True            # result is {hash: {column: value}}
+
+
+def _step_condensation() -> nx.DiGraph:
+    return nx.condensation(_SHARED["G"])
+
+
+def _step_scc(cond: nx.DiGraph) -> dict[str, dict]:
+    return _compute_scc_signals(cond, _SHARED["node_meta"])
+
+
+def _step_centrality() -> dict[str, dict]:
+    return _compute_centrality(_SHARED["graph"])
+
+
+def _step_community() -> dict[str, dict]:
+    return _compute_community_signals(_SHARED["G"], _SHARED["node_meta"])
+
+
+def _step_boundary() -> dict[str, dict]:
+    # Own read-only connection: never share a sqlite handle across a fork.
+    conn = sqlite3.connect(f"file:{_SHARED['db_path']}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        return _compute_boundary_signals(conn, _SHARED["node_meta"])
+    finally:
+        conn.close()
+
+
+_STEPS: tuple[_Step, ...] = (
+    # Longest-running first so they grab a worker before the cheap ones
+    _Step("Centrality",       _step_centrality),
+    _Step("Community",        _step_community),
+    _Step("Condensation",     _step_condensation, merge=False),
+    _Step("SCC signals",      _step_scc,             ("Condensation",)),
+    _Step("Topo depths",      _compute_topo_depths,  ("Condensation",)),
+    _Step("Reachability",     _compute_reachability, ("Condensation",)),
+    _Step("Boundary signals", _step_boundary),
+)
+
+
+# --base mode: same DAG shape, incremental step bodies.  _SHARED additionally
+# holds "base" (_Base), "changed" (set of hashes) and "recompute_global".
+
+def _step_structure_incremental(cond: nx.DiGraph) -> dict[str, dict]:
+    return _compute_structure_incremental(cond, _SHARED["base"], _SHARED["changed"])
+
+
+def _step_centrality_incremental() -> dict[str, dict]:
+    return _compute_centrality_incremental(
+        _SHARED["graph"], _SHARED["base"], _SHARED["changed"], _SHARED["recompute_global"],
+    )
+
+
+def _step_community_incremental() -> dict[str, dict]:
+    return _compute_community_incremental(
+        _SHARED["G"], _SHARED["node_meta"], _SHARED["base"], _SHARED["recompute_global"],
+    )
+
+
+def _step_boundary_incremental() -> dict[str, dict]:
+    # Boundary signals of a node depend on its edges and its neighbours'
+    # modules, so recompute every module holding a changed node or neighbour.
+    G, meta, base = _SHARED["G"], _SHARED["node_meta"], _SHARED["base"]
+    touched = _neighbourhood(G, _SHARED["changed"])
+    modules = {meta[h]["module"] for h in touched}
+    conn = sqlite3.connect(f"file:{_SHARED['db_path']}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        fresh = _compute_boundary_signals(conn, meta, modules) if modules else {}
+    finally:
+        conn.close()
+    columns = ("xmod_fan_in", "xmod_fan_out", "xmod_call_ratio",
+               "dominant_callee_mod", "dominant_callee_frac", "stability_rank")
+    return {
+        h: fresh[h] if h in fresh else {c: base.features[h][c] for c in columns}
+        for h in meta
+    }
+
+
+_INCREMENTAL_STEPS: tuple[_Step, ...] = (
+    _Step("Centrality",       _step_centrality_incremental),
+    _Step("Community",        _step_community_incremental),
+    _Step("Condensation",     _step_condensation, merge=False),
+    _Step("SCC signals",      _step_scc,                   ("Condensation",)),
+    _Step("Depth/reach",      _step_structure_incremental, ("Condensation",)),
+    _Step("Boundary signals", _step_boundary_incremental),
+)
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> tuple[Any, float, float]:
+    """Run fn, returning (result, wall seconds, CPU seconds of this process)."""
+    w0, c0 = time.perf_counter(), time.process_time()
+    result = fn(*args)
+    return result, time.perf_counter() - w0, time.process_time() - c0
+
+
+def _run_steps(
+    steps:   tuple[_Step, ...],
+    workers: int,
+    verbose: bool,
+) -> dict[str, Any]:
+    """
+    Execute steps in dependency order, up to `workers` at a time.
+
+    workers <= 1 (or no fork support) runs everything in-process.  Returns
+    {label: result}; prints per-step wall and CPU time when verbose.
+    """
+    results: dict[str, Any] = {}
+    pending = {s.label: s for s in steps}
+
+    def ready() -> list[_Step]:
+        return [s for s in pending.values() if all(d in results for d in s.deps)]
+
+    def finish(label: str, out: tuple[Any, float, float]) -> None:
+        results[label], wall, cpu = out
+        if verbose:
+            print(f"  {label}: wall {wall:.2f}s  cpu {cpu:.2f}s", flush=True)
+
+    if workers <= 1 or "fork" not in mp.get_all_start_methods():
+        while pending:
+            batch = ready()
+            if not batch:
+                raise ValueError(f"Unsatisfiable step dependencies: {sorted(pending)}")
+            for step in batch:
+                del pending[step.label]
+                finish(step.label, _timed(step.fn, *(results[d] for d in step.deps)))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("fork")) as pool:
+        running = {}
+        while pending or running:
+            for step in ready():
+                del pending[step.label]
+                fut = pool.submit(_timed, step.fn, *(results[d] for d in step.deps))
+                running[fut] = step.label
+            if not running:
+                raise ValueError(f"Unsatisfiable step dependencies: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                finish(running.pop(fut), fut.result())
+    return results
+
+
 # ── Main enrichment ───────────────────────────────────────────────────────────
 
-def enrich(db_path: Path, verbose: bool = True) -> Path:
+def enrich(
+    db_path:         Path,
+    verbose:         bool = True,
+    workers:         int | None = None,
+    base:            Path | None = None,
+    drift_threshold: float = _GLOBAL_DRIFT_THRESHOLD,
+) -> Path:
     """
     Enrich a raw semfora DB by writing computed signals into a copy.
 
     The original DB is never modified. The enriched copy is written to
     ``{stem}.enriched.db`` in the same directory and returned.
+
+    workers — process-pool size for the step DAG; defaults to the CPU count
+    (capped at the number of steps) for graphs of _PARALLEL_MIN_NODES or
+    more, and 1 (in-process) below that.
+
+    base — a previous enriched DB of the same repo.  Signals are carried over
+    for unchanged nodes and recomputed around the changed region only;
+    betweenness and communities are recomputed in full once the changed
+    fraction of nodes exceeds drift_threshold.  It may be the output path
+    itself (it is read before being overwritten).
     """
     t0 = time.time()
     out_path = enriched_path(db_path)
@@ -411,6 +848,10 @@ def enrich(db_path: Path, verbose: bool = True) -> Path:
     if verbose:
         print(f"Enriching {db_path.name} → {out_path.name} ...", flush=True)
 
+    prior = _load_base(base) if base is not None else None
+    if base is not None and prior is None and verbose:
+        print(f"  {base.name} has no node_features — running a full enrichment", flush=True)
+
     # Copy raw DB so we never touch the original
     shutil.copy2(db_path, out_path)
 
@@ -419,33 +860,75 @@ def enrich(db_path: Path, verbose: bool = True) -> Path:
     conn.execute(DDL)
     conn.commit()
 
-    G, node_meta = _build_graph(conn)
+    # Containing-class index for the explore "class" dimension
+    ts = time.time()
+    n_members = write_node_class(conn)
+    if verbose:
+        print(f"  Class index: {n_members} members in {round(time.time()-ts,2)}s", flush=True)
+
+    # Trigram symbol-search index for /search
+    ts = time.time()
+    n_symbols = write_search_index(conn)
+    if verbose:
+        print(f"  Search index: {n_symbols} symbols in {round(time.time()-ts,2)}s", flush=True)
+
+    graph, node_meta = _build_graph(conn)
+    G = graph.to_networkx()
     n = len(G.nodes)
     if verbose:
         print(f"  {n} nodes, {len(G.edges)} edges", flush=True)
 
+    # Depth-bounded upstream sets for /blast-radius
+    ts = time.time()
+    n_pairs = write_blast_index(conn, graph)
+    if verbose:
+        if n_pairs is None:
+            print(f"  Blast index: skipped, over {BLAST_MAX_PAIRS} upstream pairs "
+                  f"({round(time.time()-ts,2)}s)", flush=True)
+        else:
+            print(f"  Blast index: {n_pairs} upstream pairs in {round(time.time()-ts,2)}s", flush=True)
+
+    # Dashboard overview snapshot, so /overview is a single table read
+    write_repo_stats(conn, graph)
+
     if n == 0:
         conn.close()
         return out_path
 
-    steps = [
-        ("SCC signals",         lambda: _compute_scc_signals(G, node_meta)),
-        ("Topo depths",         lambda: _compute_topo_depths(G)),
-        ("Reachability",        lambda: _compute_reachability(G)),
-        ("Centrality",          lambda: _compute_centrality(G)),
-        ("Boundary signals",    lambda: _compute_boundary_signals(conn, node_meta)),
-        ("Community",           lambda: _compute_community_signals(G, node_meta)),
-    ]
+    steps = _STEPS
+    shared: dict[str, Any] = dict(
+        graph=graph, G=G, node_meta=node_meta, db_path=str(out_path),
+    )
+    if prior is not None:
+        changed, n_removed = _changed_nodes(G, node_meta, prior)
+        drift = (len(changed) + n_removed) / (n + n_removed)
+        recompute_global = drift > drift_threshold
+        steps = _INCREMENTAL_STEPS
+        shared.update(base=prior, changed=changed, recompute_global=recompute_global)
+        if verbose:
+            print(f"  Base {base.name}: {len(changed)} changed, {n_removed} removed "
+                  f"(drift {drift:.1%}) — global signals "
+                  f"{'recomputed' if recompute_global else 'carried over'}", flush=True)
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(steps)) if n >= _PARALLEL_MIN_NODES else 1
+
+    _SHARED.update(shared)
+    ts = time.perf_counter()
+    try:
+        results = _run_steps(steps, workers, verbose)
+    finally:
+        _SHARED.clear()
+    if verbose:
+        print(f"  Steps: {time.perf_counter()-ts:.2f}s wall on {workers} worker(s)", flush=True)
 
     merged: dict[str, dict] = {h: {} for h in node_meta}
-    for label, fn in steps:
-        ts = time.time()
-        data = fn()
-        for h, vals in data.items():
+    for step in steps:
+        if not step.merge:
+            continue
+        for h, vals in results[step.label].items():
             if h in merged:
                 merged[h].update(vals)
-        if verbose:
-            print(f"  {label}: {round(time.time()-ts,2)}s", flush=True)
 
     # Complexity percentile
     cpct = _compute_complexity_pct(node_meta)
@@ -510,6 +993,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Enrich semfora DB with graph signals.")
     parser.add_argument("db", nargs="?", help="Path to raw .db file")
     parser.add_argument("--all", action="store_true", help="Enrich all raw DBs in data/")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Process-pool size for enrichment steps (default: auto)")
+    parser.add_argument("--base", default=None,
+                        help="Previous enriched DB of the same repo: recompute only what changed")
+    parser.add_argument("--drift", type=float, default=_GLOBAL_DRIFT_THRESHOLD,
+                        help="Changed-node fraction above which --base still recomputes "
+                             "betweenness and communities (default: %(default)s)")
     args = parser.parse_args()
 
     if args.all:
@@ -518,10 +1008,11 @@ if __name__ == "__main__":
         print(f"Enriching {len(dbs)} databases in {DATA_DIR}/\n")
         for db in dbs:
             try:
-                enrich(db)
+                enrich(db, workers=args.workers)
             except Exception as ex:
                 print(f"  ERROR {db.name}: {ex}")
     elif args.db:
-        enrich(Path(args.db))
+        enrich(Path(args.db), workers=args.workers,
+               base=Path(args.base) if args.base else None, drift_threshold=args.drift)
     else:
         parser.print_help()
@@ -0,0 +1,91 @@
+"""
+Process-wide cache of per-repo call graphs.
+
+Loading a repo's nodes/edges from SQLite and building graph structures is the
+dominant cost of most analytics endpoints on large repos.  GraphStore loads
+each repo once into a CSRGraph (see analytics/csr_graph.py) and hands the same
+read-only instance to every request until the DB file changes.
+
+Entries are keyed by repo_id and validated against db_fingerprint() on every
+lookup, so a re-import or re-enrichment transparently triggers a reload.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from analytics.csr_graph import CSRGraph
+from db import db_fingerprint, open_db
+from queries.core import fetch_call_graph
+
+
+class GraphStore:
+    """Thread-safe LRU of CSRGraph instances, at most max_repos resident."""
+
+    def __init__(self, max_repos: int = 8):
+        self.max_repos = max_repos
+        self._graphs:  OrderedDict[str, tuple[tuple, CSRGraph]] = OrderedDict()
+        self._lock     = threading.Lock()
+        self._loading: dict[str, threading.Lock] = {}
+        self.hits   = 0
+        self.misses = 0
+
+    def get(self, repo_id: str) -> CSRGraph:
+        """CSRGraph for repo_id, loading it at most once per DB fingerprint."""
+        fingerprint = db_fingerprint(repo_id)
+        with self._lock:
+            graph = self._lookup(repo_id, fingerprint)
+            if graph is not None:
+                return graph
+            load_lock = self._loading.setdefault(repo_id, threading.Lock())
+
+        # One loader per repo; concurrent requests wait and reuse its result.
+        with load_lock:
+            with self._lock:
+                graph = self._lookup(repo_id, fingerprint)
+                if graph is not None:
+                    return graph
+                self.misses += 1
+
+            with open_db(repo_id) as conn:
+                graph = fetch_call_graph(conn)
+
+            with self._lock:
+                self._graphs[repo_id] = (fingerprint, graph)
+                self._graphs.move_to_end(repo_id)
+                while len(self._graphs) > self.max_repos:
+                    self._graphs.popitem(last=False)
+        return graph
+
+    def invalidate(self, repo_id: str | None = None) -> None:
+        """Drop one repo (or everything) — the next get() reloads from disk."""
+        with self._lock:
+            if repo_id is None:
+                self._graphs.clear()
+            else:
+                self._graphs.pop(repo_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "resident": list(self._graphs),
+                "hits":     self.hits,
+                "misses":   self.misses,
+            }
+
+    def _lookup(self, repo_id: str, fingerprint: tuple) -> CSRGraph | None:
+        """Caller must hold self._lock."""
+        entry = self._graphs.get(repo_id)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        self._graphs.move_to_end(repo_id)
+        self.hits += 1
+        return entry[1]
+
+
+graph_store = GraphStore()
+
+
+def get_graph(repo_id: str) -> CSRGraph:
+    """Shared CSRGraph for repo_id (raises 404 when the repo doesn't exist)."""
+    return graph_store.get(repo_id)
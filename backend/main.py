@@ -6,6 +6,7 @@ All business logic lives in:
   queries/    — DB I/O, returns plain Python data structures
   routers/    — thin HTTP handlers (call query → call analytics → return)
 """
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
@@ -16,10 +17,20 @@ from fastapi.staticfiles import StaticFiles
 from routers import (
     repos, dead_code, cycles, coupling, building,
     triage, centrality, communities, module_graph,
-    load_bearing, graph, search, explore, import_repo, patterns,
+    load_bearing, graph, search, explore, import_repo, patterns, timeline, system,
 )
+import scheduling
+from metrics import ProfileMiddleware
 
-app = FastAPI(title="Semfora Explora API", version="0.2.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduling.configure_io_threads()
+    yield
+    scheduling.shutdown()
+
+
+app = FastAPI(title="Semfora Explora API", version="0.2.0", lifespan=lifespan)
 
 import sqlite3 as _sqlite3
 
@@ -40,6 +51,7 @@ async def _db_error_handler(request: Request, exc: _sqlite3.DatabaseError):
         status = 500
     return JSONResponse(status_code=status, content={"error": "database_error", "detail": detail})
 
+app.add_middleware(ProfileMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -63,6 +75,8 @@ app.include_router(search.router)
 app.include_router(explore.router)
 app.include_router(import_repo.router)
 app.include_router(patterns.router)
+app.include_router(timeline.router)
+app.include_router(system.router)
 
 # ── User simulation report ────────────────────────────────────────────────────
 REPO_ROOT   = Path(__file__).parent.parent
@@ -0,0 +1,365 @@
+"""
+Request metrics — per-route latency, response size, SQL and analytics time.
+
+ProfileMiddleware (pure ASGI, registered in main.py) opens a RequestProfile
+for every HTTP request in a ContextVar, which AnyIO copies into the worker
+thread of a sync handler.  While it is open:
+
+  * every statement run on a db.py handle (they connect with
+    ProfiledConnection) is counted and timed against it.  Time is what is
+    spent inside execute() / fetch*(); rows pulled by iterating a cursor are
+    stepped lazily and count towards the handler's own time.
+  * analytics work is timed by analytics_span(name), and automatically for
+    jobs on the cpu lane (scheduling.py).  SQL run inside a cpu worker
+    process is not seen here.
+
+When the response has been sent, the profile is folded into process-wide
+counters and histograms, rendered in Prometheus text format by
+REGISTRY.render() (GET /metrics).  Requests slower than EXPLORA_SLOW_MS
+(default 1000) are logged to the "explora.slow" logger with their most
+expensive statements, and the last 50 are kept for
+GET /api/system/slow-requests.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator
+
+SLOW_MS = float(os.environ.get("EXPLORA_SLOW_MS", "1000"))
+
+_log = logging.getLogger("explora.slow")
+
+_TIME_BUCKETS  = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_SIZE_BUCKETS  = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+# ── Per-request profile ───────────────────────────────────────────────────────
+
+class RequestProfile:
+    """SQL and analytics time of one request; safe to update from several threads."""
+
+    def __init__(self) -> None:
+        self.sql:         dict[str, list] = {}      # statement text → [executions, seconds]
+        self.sql_count    = 0
+        self.sql_seconds  = 0.0
+        self.analytics:   dict[str, float] = {}     # span name → seconds
+        self._lock = threading.Lock()
+
+    def add_sql(self, sql: str, seconds: float, executed: bool) -> None:
+        """executed=False adds fetch time to a statement already counted."""
+        with self._lock:
+            entry = self.sql.setdefault(sql, [0, 0.0])
+            entry[0] += executed
+            entry[1] += seconds
+            self.sql_count   += executed
+            self.sql_seconds += seconds
+
+    def add_analytics(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.analytics[name] = self.analytics.get(name, 0.0) + seconds
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("explora_request_profile", default=None)
+
+
+def current_profile() -> RequestProfile | None:
+    return _current.get()
+
+
+# ── SQL instrumentation ───────────────────────────────────────────────────────
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that charges execute / fetch time to the current request, if any."""
+
+    _sql: str | None = None
+
+    def _timed(self, method, sql: str | None, executed: bool, *args):
+        profile = _current.get()
+        if profile is None or sql is None:
+            return method(*args)
+        t0 = perf_counter()
+        try:
+            return method(*args)
+        finally:
+            profile.add_sql(sql, perf_counter() - t0, executed)
+
+    def execute(self, sql, parameters=(), /):
+        self._sql = sql
+        return self._timed(super().execute, sql, True, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        self._sql = sql
+        return self._timed(super().executemany, sql, True, sql, seq_of_parameters)
+
+    def executescript(self, sql_script, /):
+        self._sql = None
+        return self._timed(super().executescript, sql_script, True, sql_script)
+
+    def fetchone(self):
+        return self._timed(super().fetchone, self._sql, False)
+
+    def fetchmany(self, size=None):
+        return self._timed(super().fetchmany, self._sql, False, *(() if size is None else (size,)))
+
+    def fetchall(self):
+        return self._timed(super().fetchall, self._sql, False)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """sqlite3.connect(..., factory=ProfiledConnection): every statement goes through ProfiledCursor."""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    # Connection's shortcut methods bypass cursor(), so route them explicitly
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script, /):
+        return self.cursor().executescript(sql_script)
+
+
+# ── Analytics spans ───────────────────────────────────────────────────────────
+
+def record_analytics(name: str, seconds: float) -> None:
+    """Charge seconds of analytics work to the histogram and the current request."""
+    REGISTRY.analytics.observe((name,), seconds)
+    profile = _current.get()
+    if profile is not None:
+        profile.add_analytics(name, seconds)
+
+
+@contextmanager
+def analytics_span(name: str) -> Iterator[None]:
+    t0 = perf_counter()
+    try:
+        yield
+    finally:
+        record_analytics(name, perf_counter() - t0)
+
+
+# ── Prometheus primitives ─────────────────────────────────────────────────────
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]):
+        self.name, self.help, self.labels = name, help, labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"] + [
+            f"{self.name}{_labels(self.labels, k)} {_num(v)}" for k, v in items
+        ]
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        self._series: dict[tuple, list] = {}      # labels → [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    s[i] += 1
+            s[-2] += value
+            s[-1] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, s in items:
+            for bound, count in zip(self.buckets, s):
+                le = 'le="%s"' % _num(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {count}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {s[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_num(s[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {s[-1]}")
+        return lines
+
+
+def render_gauges(prefix: str, values: dict, help: str) -> list[str]:
+    """Flat numeric stats (e.g. a stats() dict) as one gauge per key."""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            name = f"{prefix}_{key}"
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {_num(value)}"]
+    return lines
+
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+
+class Registry:
+    """Every request-level metric of this process."""
+
+    def __init__(self) -> None:
+        self.requests = Counter(
+            "explora_http_requests_total", "HTTP requests by route and status.",
+            ("method", "route", "status"),
+        )
+        self.latency = Histogram(
+            "explora_http_request_duration_seconds", "Time to send the full response.",
+            ("method", "route"), _TIME_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "explora_http_response_size_bytes", "Response body size.",
+            ("method", "route"), _SIZE_BUCKETS,
+        )
+        self.sql_statements = Histogram(
+            "explora_sql_statements_per_request", "SQL statements executed per request.",
+            ("route",), _COUNT_BUCKETS,
+        )
+        self.sql_time = Histogram(
+            "explora_sql_duration_seconds", "Time per request inside SQLite execute/fetch calls.",
+            ("route",), _TIME_BUCKETS,
+        )
+        self.analytics = Histogram(
+            "explora_analytics_duration_seconds", "Time per analytics span or cpu-lane job.",
+            ("name",), _TIME_BUCKETS,
+        )
+        self.slow_requests = Counter(
+            "explora_slow_requests_total", "Requests slower than EXPLORA_SLOW_MS.", ("route",),
+        )
+        self._slow: deque[dict] = deque(maxlen=50)
+
+    def observe_request(
+        self, method: str, path: str, route: str, status: int, size: int,
+        seconds: float, profile: RequestProfile,
+    ) -> None:
+        self.requests.inc((method, route, str(status)))
+        self.latency.observe((method, route), seconds)
+        self.response_size.observe((method, route), size)
+        self.sql_statements.observe((route,), profile.sql_count)
+        self.sql_time.observe((route,), profile.sql_seconds)
+        if seconds * 1000 >= SLOW_MS:
+            self.slow_requests.inc((route,))
+            self._record_slow(method, path, route, status, seconds, profile)
+
+    def slow(self) -> list[dict]:
+        """Most recent slow requests, newest first."""
+        return list(reversed(self._slow))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in (self.requests, self.latency, self.response_size, self.sql_statements,
+                       self.sql_time, self.analytics, self.slow_requests):
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+    def _record_slow(
+        self, method: str, path: str, route: str, status: int, seconds: float,
+        profile: RequestProfile,
+    ) -> None:
+        with profile._lock:
+            statements = sorted(profile.sql.items(), key=lambda kv: -kv[1][1])
+        entry = {
+            "at":           round(time.time(), 3),
+            "method":       method,
+            "path":         path,
+            "route":        route,
+            "status":       status,
+            "ms":           round(seconds * 1000, 1),
+            "sql_count":    profile.sql_count,
+            "sql_ms":       round(profile.sql_seconds * 1000, 1),
+            "analytics_ms": {k: round(v * 1000, 1) for k, v in profile.analytics.items()},
+            # Most expensive first; a high count on one statement is an N+1
+            "top_sql": [
+                {"sql": _squash(sql), "count": n, "ms": round(s * 1000, 1)}
+                for sql, (n, s) in statements[:5]
+            ],
+        }
+        self._slow.append(entry)
+        _log.warning(
+            "slow request %s %s %.0fms (sql: %d statements, %.0fms) top: %s",
+            method, path, entry["ms"], entry["sql_count"], entry["sql_ms"],
+            "; ".join(f"{q['count']}× {q['ms']}ms {q['sql'][:200]}" for q in entry["top_sql"]),
+        )
+
+
+def _squash(sql: str, limit: int = 500) -> str:
+    sql = re.sub(r"\s+", " ", sql).strip()
+    return sql if len(sql) <= limit else sql[:limit] + "…"
+
+
+REGISTRY = Registry()
+
+
+# ── Middleware ────────────────────────────────────────────────────────────────
+
+class ProfileMiddleware:
+    """Pure ASGI middleware: profiles each HTTP request into REGISTRY."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token   = _current.set(profile)
+        status, size = 500, 0
+        t0 = perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            # The router fills in scope["route"]; unmatched paths share one label
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            path  = scope.get("path", "")
+            if scope.get("query_string"):
+                path += "?" + scope["query_string"].decode("latin-1")
+            REGISTRY.observe_request(
+                scope.get("method", ""), path, route, status, size, perf_counter() - t0, profile,
+            )
@@ -0,0 +1,140 @@
+"""
+Blast-radius index — per-node upstream sets persisted by enrich.py.
+
+For every internal node, the callers reachable within BLAST_MAX_DEPTH hops
+are stored as nodes.rowid values ordered by (hop, graph index) — the order
+the BFS path returns them in — zlib-compressed, plus an int32 header with
+the number of callers first reached at each hop.  A blast-radius request is
+then one primary-key lookup, a prefix decode for the requested depth and a
+rowid fetch of the affected rows: no graph load, no traversal.
+
+Stored pairs grow with N × average upstream reach, which is quadratic on
+densely connected graphs.  Past BLAST_MAX_PAIRS the build stops, no
+blast_index table is written, and blast_index_status records why;
+/blast-radius then falls back to the CSR BFS.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import zlib
+
+import numpy as np
+
+from analytics.centrality import format_blast_radius, upstream_layers
+from analytics.csr_graph import CSRGraph
+
+# Deepest hop count the index answers (the endpoint caps max_depth at 10).
+BLAST_MAX_DEPTH = 10
+
+# Stored (node, caller) pairs beyond which the index is skipped.  Build time
+# is proportional to the pairs visited, so this bounds both time and size
+# (~40 MB of rowids before compression).
+BLAST_MAX_PAIRS = 5_000_000
+
+BLAST_INDEX_DDL = """
+CREATE TABLE IF NOT EXISTS blast_index (
+    hash     TEXT PRIMARY KEY,
+    counts   BLOB NOT NULL,   -- int32[BLAST_MAX_DEPTH]: callers first reached at hop 1..D
+    upstream BLOB NOT NULL    -- zlib(int64 nodes.rowid), ordered by (hop, graph index)
+) WITHOUT ROWID
+"""
+
+BLAST_STATUS_DDL = """
+CREATE TABLE IF NOT EXISTS blast_index_status (
+    built     INTEGER NOT NULL,  -- 1: blast_index written; 0: skipped, BFS fallback
+    pairs     INTEGER NOT NULL,  -- pairs stored, or pairs visited before giving up
+    max_pairs INTEGER NOT NULL
+)
+"""
+
+_NODE_FIELDS = "rowid AS rid, hash, name, module, file_path, complexity, caller_count, callee_count, risk"
+
+
+def write_blast_index(
+    conn:      sqlite3.Connection,
+    graph:     CSRGraph,
+    max_depth: int = BLAST_MAX_DEPTH,
+    max_pairs: int = BLAST_MAX_PAIRS,
+) -> int | None:
+    """
+    (Re)build blast_index for graph, which must come from conn's nodes table.
+    Returns the total number of stored (node, caller) pairs, or None when
+    the graph exceeds max_pairs and the index was skipped.
+    """
+    rowid_of = {h: rid for rid, h in conn.execute("SELECT rowid, hash FROM nodes")}
+    rowids = np.array([rowid_of[h] for h in graph.hashes], dtype=np.int64)
+
+    rows, total = [], 0
+    for i, reached, hops in upstream_layers(graph, max_depth):
+        total += len(reached)
+        if total > max_pairs:
+            break
+        counts = np.bincount(hops, minlength=max_depth + 1)[1:].astype(np.int32)
+        rows.append((
+            graph.hashes[i],
+            counts.tobytes(),
+            zlib.compress(rowids[reached].tobytes()),
+        ))
+    built = total <= max_pairs
+
+    conn.execute("DROP TABLE IF EXISTS blast_index")
+    conn.execute("DROP TABLE IF EXISTS blast_index_status")
+    conn.execute(BLAST_STATUS_DDL)
+    conn.execute("INSERT INTO blast_index_status VALUES (?, ?, ?)", (int(built), total, max_pairs))
+    if built:
+        conn.execute(BLAST_INDEX_DDL)
+        conn.executemany("INSERT INTO blast_index VALUES (?, ?, ?)", rows)
+    conn.commit()
+    return total if built else None
+
+
+def has_blast_index(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'blast_index'"
+    ).fetchone() is not None
+
+
+def fetch_blast_index_status(conn: sqlite3.Connection) -> dict | None:
+    """{built, pairs, max_pairs} from the last build, or None for DBs enriched before it."""
+    try:
+        row = conn.execute("SELECT built, pairs, max_pairs FROM blast_index_status").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return None if row is None else {
+        "built": bool(row[0]), "pairs": row[1], "max_pairs": row[2],
+    }
+
+
+def fetch_blast_radius(
+    conn: sqlite3.Connection, target_hash: str, max_depth: int = 5,
+) -> dict | None:
+    """
+    Indexed equivalent of analytics.centrality.compute_blast_radius.
+
+    Returns None when target_hash is not an internal node.  Assumes
+    has_blast_index(conn); max_depth is capped at the depth it was built with.
+    """
+    row = conn.execute(
+        f"SELECT {_NODE_FIELDS}, b.counts, b.upstream "
+        "FROM nodes JOIN blast_index b USING (hash) WHERE hash = ?",
+        (target_hash,),
+    ).fetchone()
+    if row is None:
+        return None
+
+    counts = np.frombuffer(row["counts"], dtype=np.int32)[:max_depth]
+    rowids = np.frombuffer(zlib.decompress(row["upstream"]), dtype=np.int64)[:int(counts.sum())]
+    hops   = np.repeat(np.arange(1, len(counts) + 1), counts).tolist()
+
+    by_rowid = {
+        r["rid"]: dict(r) for r in conn.execute(
+            f"SELECT {_NODE_FIELDS} FROM nodes WHERE rowid IN (SELECT value FROM json_each(?))",
+            (json.dumps(rowids.tolist()),),
+        )
+    }
+    return format_blast_radius(
+        dict(row),
+        ((by_rowid[rid], d) for rid, d in zip(rowids.tolist(), hops)),
+        max_depth,
+    )
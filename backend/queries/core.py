@@ -10,11 +10,13 @@ Naming convention:
   fetch_edges_*(...)        — rows from the edges table
   fetch_module_edges(...)   — rows from the module_edges table
   fetch_module_symbol_stats(...) — aggregated module stats from nodes
+  fetch_call_graph(...)     — whole internal call graph as a CSRGraph
 """
 from __future__ import annotations
 
 import sqlite3
 
+from analytics.csr_graph import CSRGraph
 from db import row_to_dict
 
 # ── Sentinel SQL fragments ────────────────────────────────────────────────────
@@ -151,3 +153,23 @@ def fetch_module_symbol_stats(conn: sqlite3.Connection) -> list[dict]:
             """
         ).fetchall()
     ]
+
+
+# ── Whole graph ───────────────────────────────────────────────────────────────
+
+_CALL_GRAPH_FIELDS = ["hash", "name", "kind", "module", "file_path", "line_start",
+                      "line_end", "complexity", "caller_count", "callee_count", "risk"]
+
+
+def fetch_call_graph(conn: sqlite3.Connection) -> CSRGraph:
+    """
+    The internal call graph in CSR form (external nodes and edges excluded).
+
+    Prefer graph_store.get_graph(repo_id) in request handlers — it caches the
+    result per DB file; call this directly only for one-shot work (enrich.py).
+    """
+    nodes = fetch_nodes(conn, fields=_CALL_GRAPH_FIELDS)
+    edges = conn.execute(
+        f"SELECT caller_hash, callee_hash, call_count FROM edges WHERE {_NOT_EXT_EDGE}"
+    ).fetchall()
+    return CSRGraph.from_rows(nodes, (tuple(e) for e in edges))
@@ -7,30 +7,24 @@ Measure format (API string):
 """
 from __future__ import annotations
 
-import math
 import sqlite3
 
+from analytics.class_index import containing_classes
+from db import _register_aggregates, temp_writes
+
 
 # ── Simple dimensions ─────────────────────────────────────────────────────────
 
-# "class" dimension: derive a node's containing class from line-range containment.
-# A node n is a member of class C when they share the same file and n's line range
-# sits entirely within C's line range.  Nodes outside any class fall back to
+# "class" dimension: a node's containing class by line-range containment, read
+# from the node_class index (see ensure_node_class).  Queries that reference
+# ncls{a} must add _class_join(a).  Nodes outside any class fall back to
 # '(top-level)' so every node always has a non-NULL class value.
-# The {a} placeholder is replaced with the SQL alias (n, n1, n2).
-_CLASS_DIM = (
-    "COALESCE("
-    "(SELECT cls.name FROM nodes cls "
-    " WHERE cls.file_path = {a}.file_path"
-    "   AND cls.kind = 'class'"
-    "   AND {a}.line_start >= cls.line_start"
-    "   AND {a}.line_end   <= cls.line_end"
-    " LIMIT 1), '(top-level)')"
-)
+# The {a} placeholder is replaced with the alias suffix ("", "1", "2").
+_CLASS_DIM = "COALESCE(ncls{a}.class_name, '(top-level)')"
 
 AVAILABLE_DIMENSIONS: dict[str, str] = {
     "module":     "n.module",
-    "class":      _CLASS_DIM.format(a="n"),   # containing class (line containment)
+    "class":      _CLASS_DIM.format(a=""),    # containing class (node_class index)
     "risk":       "n.risk",
     "kind":       "n.kind",
     "symbol":     "n.module || '::' || n.name",
@@ -58,7 +52,7 @@ _NEW_SCHEMA_DIMS = {"framework", "async", "exported"}
 # For graph edge queries we need the n1/n2-prefixed versions
 _DIM_SRC = {
     "module":     "n1.module",
-    "class":      _CLASS_DIM.format(a="n1"),
+    "class":      _CLASS_DIM.format(a="1"),
     "risk":       "n1.risk",
     "kind":       "n1.kind",
     "symbol":     "n1.module || '::' || n1.name",
@@ -72,7 +66,7 @@ _DIM_SRC = {
 }
 _DIM_TGT = {
     "module":     "n2.module",
-    "class":      _CLASS_DIM.format(a="n2"),
+    "class":      _CLASS_DIM.format(a="2"),
     "risk":       "n2.risk",
     "kind":       "n2.kind",
     "symbol":     "n2.module || '::' || n2.name",
@@ -172,6 +166,8 @@ def _resolve_dims(
                 continue   # skip enriched dim when node_features unavailable
             if d in _NEW_SCHEMA_DIMS and not has_schema:
                 continue   # skip new-schema dims on pre-enrichment DBs
+            if d == "class":
+                ensure_node_class(conn)
             safe = d.replace(".", "_")
             result.append((d, safe, AVAILABLE_DIMENSIONS[d]))
         elif _is_bucketed_dim(d):
@@ -242,33 +238,6 @@ _ENRICHED_FIELDS   = {k for k, v in FIELDS.items()          if v.get("enriched")
 _ENRICHED_SPECIALS = {k for k, v in SPECIAL_MEASURES.items() if v.get("enriched")}
 
 
-# ── Population stddev as a SQLite custom aggregate ────────────────────────────
-
-class _StddevPop:
-    """Population standard deviation — registered as stddev_pop() in SQLite."""
-    def __init__(self):
-        self._vals: list[float] = []
-
-    def step(self, x):
-        if x is not None:
-            try:
-                self._vals.append(float(x))
-            except (TypeError, ValueError):
-                pass
-
-    def finalize(self):
-        n = len(self._vals)
-        if n < 2:
-            return 0.0
-        mean = sum(self._vals) / n
-        variance = sum((v - mean) ** 2 for v in self._vals) / n
-        return round(math.sqrt(variance), 4)
-
-
-def _register_aggregates(conn: sqlite3.Connection) -> None:
-    conn.create_aggregate("stddev_pop", 1, _StddevPop)
-
-
 # ── Measure parsing ───────────────────────────────────────────────────────────
 
 def parse_measure(s: str) -> dict | None:
@@ -327,6 +296,51 @@ def measure_type(m: dict) -> str:
     return field_type
 
 
+# ── Mergeable partial aggregates (single-scan pivot rollup) ──────────────────
+# Each measure splits into partial aggregates computed once at the finest
+# pivot grain and a final expression that merges those partials at any
+# coarser level.  {e} is the field expression; {0}, {1}, … name the partial
+# columns.  Final expressions keep the rounding of the direct measures above.
+
+_SPECIAL_PARTIALS: dict[str, tuple[list[str], str]] = {
+    "symbol_count":    (["COUNT(*)"], "SUM({0})"),
+    "dead_ratio":      (["SUM(CASE WHEN n.caller_count = 0 THEN 1 ELSE 0 END)", "COUNT(*)"],
+                        "ROUND(CAST(SUM({0}) AS REAL) / NULLIF(SUM({1}), 0), 3)"),
+    "high_risk_ratio": (["SUM(CASE WHEN n.risk IN ('high','critical') THEN 1 ELSE 0 END)", "COUNT(*)"],
+                        "ROUND(CAST(SUM({0}) AS REAL) / NULLIF(SUM({1}), 0), 3)"),
+    "in_cycle_ratio":  (["SUM(CASE WHEN COALESCE(nf.scc_size, 1) > 1 THEN 1 ELSE 0 END)", "COUNT(*)"],
+                        "ROUND(CAST(SUM({0}) AS REAL) / NULLIF(SUM({1}), 0), 3)"),
+}
+
+_AGG_PARTIALS: dict[str, tuple[list[str], str]] = {
+    "avg":    (["SUM(CAST({e} AS REAL))", "COUNT({e})"], "ROUND(SUM({0}) / NULLIF(SUM({1}), 0), 4)"),
+    "min":    (["MIN({e})"],   "MIN({0})"),
+    "max":    (["MAX({e})"],   "MAX({0})"),
+    "sum":    (["SUM({e})"],   "SUM({0})"),
+    "count":  (["COUNT({e})"], "SUM({0})"),
+    "stddev": (["COUNT({e})", "SUM(CAST({e} AS REAL))", "SUM(CAST({e} AS REAL) * CAST({e} AS REAL))"],
+               "ROUND(stddev_merge({0}, {1}, {2}), 4)"),   # registered Python aggregate
+}
+
+# measure_col → parsed measure, for every measure the API can express
+_MEASURES_BY_COL: dict[str, dict] = {
+    **{name: {"type": "special", "name": name} for name in SPECIAL_MEASURES},
+    **{
+        f"{field}_{agg}": {"type": "dynamic", "field": field, "agg": agg}
+        for field in FIELDS for agg in AGGS
+    },
+}
+
+
+def measure_partials(m: dict) -> tuple[list[str], str]:
+    """(partial aggregate SQL over nodes, merge template over the partials)."""
+    if m["type"] == "special":
+        return _SPECIAL_PARTIALS[m["name"]]
+    partials, final = _AGG_PARTIALS[m["agg"]]
+    expr = FIELDS[m["field"]]["expr"]
+    return [p.replace("{e}", expr) for p in partials], final
+
+
 # ── Symbol-grain (zero-dimension) measure SQL ─────────────────────────────────
 # When dimension = "symbol", each row is one node — no aggregation, raw values.
 
@@ -463,6 +477,59 @@ def _has_inheritance_table(conn: sqlite3.Connection) -> bool:
     return row is not None
 
 
+# ── Containing-class index ───────────────────────────────────────────────────
+
+NODE_CLASS_DDL = """
+CREATE {temp} TABLE IF NOT EXISTS node_class (
+    hash        TEXT PRIMARY KEY,
+    class_name  TEXT NOT NULL,
+    class_hash  TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+
+def _class_join(suffix: str) -> str:
+    """LEFT JOIN of node_class as ncls{suffix} onto n{suffix}."""
+    return f"LEFT JOIN node_class ncls{suffix} ON ncls{suffix}.hash = n{suffix}.hash"
+
+
+def _has_node_class(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='node_class' "
+        "UNION ALL "
+        "SELECT 1 FROM sqlite_temp_master WHERE type='table' AND name='node_class'"
+    ).fetchone()
+    return row is not None
+
+
+def write_node_class(conn: sqlite3.Connection, temp: bool = False) -> int:
+    """
+    Compute the containing-class mapping in one sweep and store it in
+    node_class (a TEMP table when temp=True).  Returns the row count.
+    """
+    rows = conn.execute(
+        "SELECT hash, name, file_path, line_start, line_end, kind FROM nodes"
+    ).fetchall()
+    mapping = containing_classes(tuple(r) for r in rows)
+    conn.execute(NODE_CLASS_DDL.format(temp="TEMP" if temp else ""))
+    conn.execute("DELETE FROM node_class")
+    conn.executemany("INSERT INTO node_class VALUES (?, ?, ?)", mapping)
+    conn.commit()
+    return len(mapping)
+
+
+def ensure_node_class(conn: sqlite3.Connection) -> None:
+    """
+    Make node_class available on conn.  Enriched DBs ship it; for anything
+    else it is built once per connection as a TEMP table, which pooled
+    handles then keep for their lifetime.
+    """
+    if _has_node_class(conn):
+        return
+    with temp_writes(conn):
+        write_node_class(conn, temp=True)
+
+
 def _kinds_clause(kinds: list[str] | None, alias: str = "n") -> tuple[str, list]:
     if not kinds:
         return "", []
@@ -479,6 +546,8 @@ def _pivot_sql(
     """Build the GROUP BY pivot query from resolved dimension triples."""
     dim_selects = [f"({expr}) AS {alias}" for _, alias, expr in dim_triples]
     join        = "LEFT JOIN node_features nf ON n.hash = nf.hash" if has_nf else ""
+    if any("ncls." in expr for _, _, expr in dim_triples):
+        join += " " + _class_join("")
     kc, kp      = _kinds_clause(kinds)
     n           = len(dim_triples)
     # Use positional GROUP BY / ORDER BY to support CASE expressions as dims
@@ -494,6 +563,63 @@ def _pivot_sql(
     return sql, kp
 
 
+def _rollup_sql(
+    dim_triples: list[tuple[str, str, str]],   # (key, safe_alias, sql_expr)
+    cols: list[str],
+    has_nf: bool,
+    kinds: list[str] | None,
+) -> tuple[str, list] | None:
+    """
+    One query returning every level of an N-dim pivot.
+
+    The finest grain (all N dims) is aggregated once into partials in the
+    `grain` CTE — the only pass over nodes/node_features.  Level k is then a
+    GROUP BY over the first k+1 dims of that small table; levels are stacked
+    with UNION ALL and tagged with `lvl`, deeper dim columns padded with NULL.
+
+    Returns None if some measure has no mergeable partial form.
+    """
+    measures = [_MEASURES_BY_COL.get(c) for c in cols]
+    if any(m is None for m in measures):
+        return None
+
+    n_dims       = len(dim_triples)
+    dim_aliases  = [f"d{i}" for i in range(n_dims)]
+    partial_sels: list[str] = []
+    finals:       list[str] = []
+    for i, (m, col) in enumerate(zip(measures, cols)):
+        partials, final = measure_partials(m)
+        names = [f"p{i}_{j}" for j in range(len(partials))]
+        partial_sels += [f"{p} AS {a}" for p, a in zip(partials, names)]
+        finals.append(f"{final.format(*names)} AS {col}")
+
+    join      = "LEFT JOIN node_features nf ON n.hash = nf.hash" if has_nf else ""
+    if any("ncls." in expr for _, _, expr in dim_triples):
+        join += " " + _class_join("")
+    kc, kp    = _kinds_clause(kinds)
+    dim_sels  = [f"({expr}) AS {a}" for (_, _, expr), a in zip(dim_triples, dim_aliases)]
+    positions = ", ".join(str(i + 1) for i in range(n_dims))
+
+    # Referenced by every UNION ALL arm, so SQLite materialises it once.
+    grain = (
+        f"SELECT {', '.join(dim_sels + partial_sels)} "
+        f"FROM nodes n {join} "
+        f"WHERE n.hash NOT LIKE 'ext:%' {kc} "
+        f"GROUP BY {positions}"
+    )
+    arms = []
+    for k in range(n_dims):
+        kept = dim_aliases[: k + 1]
+        pad  = [f"NULL AS {a}" for a in dim_aliases[k + 1:]]
+        arms.append(
+            f"SELECT {k} AS lvl, {', '.join(kept + pad + finals)} "
+            f"FROM grain GROUP BY {', '.join(kept)}"
+        )
+    order = ", ".join(["lvl"] + dim_aliases)
+    sql = f"WITH grain AS ({grain}) {' UNION ALL '.join(arms)} ORDER BY {order}"
+    return sql, kp
+
+
 # ── N-level pivot tree builder ───────────────────────────────────────────────
 
 def _build_pivot_tree(
@@ -516,7 +642,10 @@ def _build_pivot_tree(
       }
 
     Algorithm:
-      1. One SQL query per level  k ∈ 0..N-1  (uses first k+1 dims).
+      1. One rollup query (_rollup_sql) that scans nodes once at the finest
+         grain and merges partial aggregates up to every level k ∈ 0..N-1.
+         Measures without a partial form fall back to one query per level
+         built from `frags`.
       2. Build a children index in O(total nodes) via dict.setdefault.
       3. Recursively assemble the tree top-down.
 
@@ -528,16 +657,21 @@ def _build_pivot_tree(
     if N == 0:
         return []
 
-    # ── 1. Query each level (k dims → aggregate at depth k) ──────────────────
-    level_maps: list[dict[tuple, dict]] = []
-    for k in range(N):
-        sql, params = _pivot_sql(dim_triples[: k + 1], frags, has_nf, kinds)
-        raw = [dict(r) for r in conn.execute(sql, params).fetchall()]
-        level_map: dict[tuple, dict] = {
-            tuple(r[t[1]] for t in dim_triples[: k + 1]): {c: r[c] for c in cols}
-            for r in raw
-        }
-        level_maps.append(level_map)
+    # ── 1. Aggregate every level (k dims → aggregate at depth k) ─────────────
+    level_maps: list[dict[tuple, dict]] = [{} for _ in range(N)]
+    rollup = _rollup_sql(dim_triples, cols, has_nf, kinds)
+    if rollup is not None:
+        sql, params = rollup
+        for r in conn.execute(sql, params):
+            k = r["lvl"]
+            level_maps[k][tuple(r[f"d{i}"] for i in range(k + 1))] = {c: r[c] for c in cols}
+    else:
+        for k in range(N):
+            sql, params = _pivot_sql(dim_triples[: k + 1], frags, has_nf, kinds)
+            level_maps[k] = {
+                tuple(r[t[1]] for t in dim_triples[: k + 1]): {c: r[c] for c in cols}
+                for r in conn.execute(sql, params)
+            }
 
     # ── 2. Children index: parent key-tuple → list of child key-tuples ────────
     children_index: list[dict[tuple, list[tuple]]] = [{} for _ in range(N)]
@@ -575,8 +709,9 @@ def fetch_pivot(
     measures_raw: list[str],
     kinds: list[str] | None = None,
 ) -> dict:
+    # Pooled handles already have them; plain sqlite3 connections do not.
+    # Re-registering just replaces the functions, so this is idempotent.
     _register_aggregates(conn)
-
     parsed = [m for m in (parse_measure(s) for s in measures_raw) if m is not None]
     has_nf = _has_node_features(conn)
 
@@ -650,6 +785,9 @@ def fetch_graph_edges(
         "LEFT JOIN node_features nf2 ON n2.hash = nf2.hash"
         if ("nf1." in src or "nf2." in tgt) else ""
     )
+    if "ncls1." in src:
+        ensure_node_class(conn)
+        nf_join += f" {_class_join('1')} {_class_join('2')}"
 
     kc_src, kp_src = _kinds_clause(kinds, alias="n1")
     kc_tgt, kp_tgt = _kinds_clause(kinds, alias="n2")
@@ -733,6 +871,37 @@ _SAFE_NODE_SORTS = {"caller_count", "callee_count", "complexity", "name", "modul
 _SAFE_NF_SORTS   = {"utility_score", "pagerank", "xmod_fan_in"}
 
 
+_OUTBOUND_PER_NODE = 8
+
+
+def _fetch_top_callees(
+    conn: sqlite3.Connection,
+    hashes: list[str],
+    per_node: int,
+) -> dict[str, list[dict]]:
+    """
+    Top `per_node` internal callees (by call_count) of every caller in hashes,
+    in one windowed query instead of one query per caller.
+    """
+    if not hashes:
+        return {}
+    ph = ",".join("?" * len(hashes))
+    sql = (
+        f"SELECT caller, hash, name, module, call_count FROM ("
+        f"  SELECT e.caller_hash AS caller, e.callee_hash AS hash, n2.name, n2.module, e.call_count, "
+        f"         ROW_NUMBER() OVER (PARTITION BY e.caller_hash ORDER BY e.call_count DESC) AS rn "
+        f"  FROM edges e JOIN nodes n2 ON e.callee_hash = n2.hash "
+        f"  WHERE e.caller_hash IN ({ph}) AND n2.hash NOT LIKE 'ext:%'"
+        f") WHERE rn <= ? ORDER BY caller, rn"
+    )
+    out: dict[str, list[dict]] = {}
+    for r in conn.execute(sql, hashes + [per_node]):
+        out.setdefault(r["caller"], []).append(
+            {"hash": r["hash"], "name": r["name"], "module": r["module"], "call_count": r["call_count"]}
+        )
+    return out
+
+
 def fetch_nodes(
     conn: sqlite3.Connection,
     sort_by:  str = "caller_count",
@@ -778,15 +947,9 @@ def fetch_nodes(
     )
     nodes = [dict(r) for r in conn.execute(sql, kp + [limit]).fetchall()]
 
+    outbound = _fetch_top_callees(conn, [n["hash"] for n in nodes], _OUTBOUND_PER_NODE)
     for node in nodes:
-        edges = conn.execute(
-            "SELECT e.callee_hash AS hash, n2.name, n2.module, e.call_count "
-            "FROM edges e JOIN nodes n2 ON e.callee_hash = n2.hash "
-            "WHERE e.caller_hash = ? AND n2.hash NOT LIKE 'ext:%' "
-            "ORDER BY e.call_count DESC LIMIT 8",
-            (node["hash"],),
-        ).fetchall()
-        node["outbound_edges"] = [dict(e) for e in edges]
+        node["outbound_edges"] = outbound.get(node["hash"], [])
 
     total_sql   = f"SELECT COUNT(*) FROM nodes n WHERE n.hash NOT LIKE 'ext:%' {kc}"
     total       = conn.execute(total_sql, kp).fetchone()[0]
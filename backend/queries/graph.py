@@ -6,7 +6,8 @@ from queries.core import fetch_nodes, fetch_edges_within, fetch_edges_all, fetch
 _GRAPH_FIELDS = ["hash", "name", "kind", "module", "file_path",
                  "line_start", "complexity", "caller_count", "callee_count", "risk"]
 _DIFF_FIELDS  = ["hash", "name", "module", "kind", "file_path",
-                 "caller_count", "callee_count"]
+                 "caller_count", "callee_count",
+                 "line_start", "line_end", "complexity"]    # move / rename similarity
 
 
 def fetch_graph(
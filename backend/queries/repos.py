@@ -3,50 +3,44 @@ Repo list and overview queries — DB I/O only.
 """
 from __future__ import annotations
 
+import json
 import sqlite3
 from pathlib import Path
 
+from analytics.csr_graph import CSRGraph
+from analytics.repo_stats import graph_stats
 from db import row_to_dict
 
+# Overview snapshot written by enrich.py: one JSON value per overview key.
+REPO_STATS_DDL = """
+CREATE TABLE IF NOT EXISTS repo_stats (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL          -- JSON
+) WITHOUT ROWID
+"""
 
-def fetch_repo_list(data_dir: Path) -> list[dict]:
-    """Scan data_dir for .db files and return basic stats for each.
 
-    Enriched DBs (*.enriched.db) are not shown as separate repos — get_db()
-    auto-upgrades to the enriched version when available.
-    """
-    repos = []
-    for db_file in sorted(data_dir.glob("*.db")):
-        if db_file.name.endswith(".enriched.db"):
-            continue  # internal enrichment artifact — not a user-visible repo
-        repo_id = db_file.stem
-        enriched = (data_dir / f"{repo_id}.enriched.db").exists()
-        try:
-            conn = sqlite3.connect(db_file)
-            conn.row_factory = sqlite3.Row
-            node_count   = conn.execute("SELECT COUNT(*) as n FROM nodes").fetchone()["n"]
-            edge_count   = conn.execute("SELECT COUNT(*) as n FROM edges").fetchone()["n"]
-            module_count = conn.execute(
-                "SELECT COUNT(DISTINCT module) as n FROM nodes "
-                "WHERE module IS NOT NULL AND hash NOT LIKE 'ext:%'"
-            ).fetchone()["n"]
-            conn.close()
-        except Exception:
-            continue
-        repos.append({
-            "id":           repo_id,
-            "name":         repo_id,
-            "node_count":   node_count,
-            "edge_count":   edge_count,
-            "module_count": module_count,
-            "enriched":     enriched,
-            "db_path":      str(db_file),
-        })
-    return repos
+def fetch_db_stats(db_file: Path) -> dict:
+    """Node, edge and module counts of one raw DB (backs the repo catalog)."""
+    conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+    try:
+        node_count   = conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+        edge_count   = conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+        module_count = conn.execute(
+            "SELECT COUNT(DISTINCT module) FROM nodes "
+            "WHERE module IS NOT NULL AND hash NOT LIKE 'ext:%'"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    return {
+        "node_count":   node_count,
+        "edge_count":   edge_count,
+        "module_count": module_count,
+    }
 
 
 def fetch_repo_overview(conn: sqlite3.Connection) -> dict:
-    """Aggregate stats for a single repo overview page."""
+    """Aggregate stats for a single repo overview page, computed live."""
     cur = conn.cursor()
 
     node_count = cur.execute("SELECT COUNT(*) as n FROM nodes").fetchone()["n"]
@@ -93,3 +87,25 @@ def fetch_repo_overview(conn: sqlite3.Connection) -> dict:
         "top_modules":          top_modules,
         "risk_distribution":    risk_dist,
     }
+
+
+def write_repo_stats(conn: sqlite3.Connection, graph: CSRGraph) -> int:
+    """(Re)build repo_stats: the live overview plus SCC and degree stats of graph."""
+    stats = {**fetch_repo_overview(conn), **graph_stats(graph)}
+    conn.execute("DROP TABLE IF EXISTS repo_stats")
+    conn.execute(REPO_STATS_DDL)
+    conn.executemany(
+        "INSERT INTO repo_stats VALUES (?, ?)",
+        ((k, json.dumps(v)) for k, v in stats.items()),
+    )
+    conn.commit()
+    return len(stats)
+
+
+def fetch_repo_stats(conn: sqlite3.Connection) -> dict | None:
+    """The precomputed overview, or None when the DB has no repo_stats table."""
+    try:
+        rows = conn.execute("SELECT key, value FROM repo_stats").fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return {k: json.loads(v) for k, v in rows} or None
@@ -0,0 +1,144 @@
+"""
+Symbol-search index — FTS5 trigram table persisted by enrich.py.
+
+symbol_search holds one row per internal node: name, its camelCase /
+snake_case words (analytics.symbol_search.identifier_words), module and
+file_path, trigram-tokenised so any substring of 3+ characters is an index
+lookup.  Its rowid is the node's popularity rank (caller_count descending),
+so MATCH … ORDER BY rowid LIMIT k streams the most-called matches first
+and stops after k — the cost of a query is bounded by the candidate cap,
+not by how many symbols contain "get".
+
+symbol_names maps lower-cased names to ranks for exact lookups.  Queries
+shorter than a trigram scan name / module / file_path with LIKE in rank
+order instead, so the most-called substring matches are kept.
+
+Repos without the index fall back to the name LIKE scan.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+
+from analytics.symbol_search import fts_phrase, identifier_words, rank_candidates, trigrams
+
+SEARCH_INDEX_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS symbol_search USING fts5(
+    name, words, module, file_path, hash UNINDEXED, tokenize = 'trigram'
+);
+CREATE TABLE IF NOT EXISTS symbol_names (
+    lname TEXT    NOT NULL,
+    rank  INTEGER NOT NULL,            -- symbol_search.rowid
+    PRIMARY KEY (lname, rank)
+) WITHOUT ROWID;
+"""
+
+# Rows pulled from the index per query before ranking.
+_CANDIDATES       = 1000
+_FUZZY_CANDIDATES = 200
+
+_RESULT_FIELDS = "hash, name, kind, module, file_path, line_start, caller_count, callee_count, risk"
+_CANDIDATE_COLS = "rowid AS rank, name, words, module, file_path, hash"
+
+
+def write_search_index(conn: sqlite3.Connection) -> int:
+    """(Re)build symbol_search and symbol_names from conn's nodes. Returns the row count."""
+    rows = conn.execute(
+        "SELECT hash, name, module, file_path FROM nodes "
+        "WHERE hash NOT LIKE 'ext:%' ORDER BY caller_count DESC, name, hash"
+    ).fetchall()
+
+    conn.execute("DROP TABLE IF EXISTS symbol_search")
+    conn.execute("DROP TABLE IF EXISTS symbol_names")
+    conn.executescript(SEARCH_INDEX_DDL)
+    conn.executemany(
+        "INSERT INTO symbol_search (rowid, name, words, module, file_path, hash) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (rank, r["name"], " ".join(identifier_words(r["name"])), r["module"], r["file_path"], r["hash"])
+            for rank, r in enumerate(rows, 1)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO symbol_names VALUES (?, ?)",
+        ((r["name"].lower(), rank) for rank, r in enumerate(rows, 1)),
+    )
+    conn.execute("INSERT INTO symbol_search (symbol_search) VALUES ('optimize')")
+    conn.commit()
+    return len(rows)
+
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'symbol_search'"
+    ).fetchone() is not None
+
+
+def _by_rank(conn: sqlite3.Connection, ranks: list[int]) -> list[dict]:
+    if not ranks:
+        return []
+    return [dict(r) for r in conn.execute(
+        f"SELECT {_CANDIDATE_COLS} FROM symbol_search "
+        "WHERE rowid IN (SELECT value FROM json_each(?))",
+        (json.dumps(ranks),),
+    )]
+
+
+def _match(conn: sqlite3.Connection, expr: str, order: str, cap: int) -> list[dict]:
+    return [dict(r) for r in conn.execute(
+        f"SELECT {_CANDIDATE_COLS} FROM symbol_search WHERE symbol_search MATCH ? "
+        f"ORDER BY {order} LIMIT ?",
+        (expr, cap),
+    )]
+
+
+def search_symbols(conn: sqlite3.Connection, q: str, limit: int = 20) -> list[dict]:
+    """
+    Ranked symbol search: exact, prefix, word-prefix, substring, module/path
+    and fuzzy (trigram similarity) matches, best tier first, then most-called.
+
+    Assumes has_search_index(conn).  Each result carries a "match" key naming
+    its tier (analytics.symbol_search.MATCH_TIERS).
+    """
+    q = q.strip()
+    lq = q.lower()
+    if not q:
+        return []
+
+    exact = [r for (r,) in conn.execute("SELECT rank FROM symbol_names WHERE lname = ?", (lq,))]
+    candidates = _by_rank(conn, exact)
+
+    if len(q) < 3:
+        # Below trigram length: substring scan over name / module / path in
+        # popularity order (rowid = caller_count rank), stopping at the cap
+        pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        candidates += [dict(r) for r in conn.execute(
+            f"SELECT {_CANDIDATE_COLS} FROM symbol_search "
+            "WHERE name LIKE ?1 ESCAPE '\\' OR module LIKE ?1 ESCAPE '\\' OR file_path LIKE ?1 ESCAPE '\\' "
+            "ORDER BY rowid LIMIT ?2",
+            (pattern, _CANDIDATES),
+        )]
+    else:
+        expr = f"{{name module file_path}} : {fts_phrase(q)}"
+        q_words = " ".join(identifier_words(q))
+        if len(q_words) >= 3:
+            expr += f" OR words : {fts_phrase(q_words)}"
+        candidates += _match(conn, expr, "rowid", _CANDIDATES)
+
+    ranked = rank_candidates(q, candidates, limit)
+
+    grams = trigrams(q)
+    if len(ranked) < limit and len(grams) >= 2:
+        # Typo tolerance: names sharing the query's rarer trigrams (bm25 order)
+        expr = "name : (" + " OR ".join(fts_phrase(g) for g in sorted(grams)) + ")"
+        candidates += _match(conn, expr, "rank", _FUZZY_CANDIDATES)
+        ranked = rank_candidates(q, candidates, limit)
+
+    hashes = [c["hash"] for c, _ in ranked]
+    by_hash = {
+        r["hash"]: dict(r) for r in conn.execute(
+            f"SELECT {_RESULT_FIELDS} FROM nodes WHERE hash IN (SELECT value FROM json_each(?))",
+            (json.dumps(hashes),),
+        )
+    }
+    return [{**by_hash[c["hash"]], "match": tier} for c, tier in ranked if c["hash"] in by_hash]
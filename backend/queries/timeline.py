@@ -0,0 +1,39 @@
+"""
+Per-snapshot rows for the repo timeline (analytics/timeline.py) — DB I/O only.
+"""
+from __future__ import annotations
+
+import sqlite3
+
+from db import row_to_dict
+
+
+def fetch_snapshot_created_at(conn: sqlite3.Connection) -> str:
+    """Export timestamp from schema_info ('' when the DB predates it)."""
+    try:
+        row = conn.execute("SELECT value FROM schema_info WHERE key = 'created_at'").fetchone()
+    except sqlite3.OperationalError:
+        return ""
+    return row[0] if row else ""
+
+
+def fetch_timeline_rows(conn: sqlite3.Connection) -> list[dict]:
+    """
+    hash, name, module, caller_count, complexity and (enriched DBs only)
+    pagerank of every internal node.
+    """
+    has_features = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'node_features'"
+    ).fetchone() is not None
+    if has_features:
+        sql = (
+            "SELECT n.hash, n.name, n.module, n.caller_count, n.complexity, f.pagerank "
+            "FROM nodes n LEFT JOIN node_features f ON f.hash = n.hash "
+            "WHERE n.hash NOT LIKE 'ext:%'"
+        )
+    else:
+        sql = (
+            "SELECT hash, name, module, caller_count, complexity, NULL AS pagerank "
+            "FROM nodes WHERE hash NOT LIKE 'ext:%'"
+        )
+    return [row_to_dict(r) for r in conn.execute(sql)]
@@ -7,17 +7,21 @@ it exists so the router calls one function instead of four.
 """
 from __future__ import annotations
 import sqlite3
+from analytics.csr_graph import CSRGraph
 from db import row_to_dict
-from queries.core import fetch_module_edges, fetch_nodes
+from queries.core import fetch_module_edges
 from queries.coupling import fetch_high_centrality_nodes
-from queries.cycles import fetch_cycle_graph_data
 
 
-def fetch_triage_inputs(conn: sqlite3.Connection) -> dict:
-    """Collect all data needed by analyze_triage() in one bundle."""
-    high_centrality_nodes    = fetch_high_centrality_nodes(conn, threshold=5)
-    module_edges             = fetch_module_edges(conn)
-    graph_nodes, graph_edges = fetch_cycle_graph_data(conn)
+def fetch_triage_inputs(conn: sqlite3.Connection, graph: CSRGraph) -> dict:
+    """
+    Collect all data needed by analyze_triage() in one bundle.
+
+    graph — the repo's shared CSRGraph (graph_store.get_graph), passed through
+            as the call graph for cycle detection instead of re-querying edges.
+    """
+    high_centrality_nodes = fetch_high_centrality_nodes(conn, threshold=5)
+    module_edges          = fetch_module_edges(conn)
 
     dead_file_stats = [
         row_to_dict(r) for r in conn.execute(
@@ -40,6 +44,6 @@ def fetch_triage_inputs(conn: sqlite3.Connection) -> dict:
     return {
         "high_centrality_nodes": high_centrality_nodes,
         "module_edges":          module_edges,
-        "call_graph":            {"nodes": graph_nodes, "edges": graph_edges},
+        "call_graph":            graph,
         "dead_file_stats":       dead_file_stats,
     }
@@ -0,0 +1,149 @@
+"""
+Persistent catalog of the repo DBs in data/ — what /api/repos lists.
+
+Listing used to open every .db and run three COUNT queries on each per
+request.  RepoCatalog keeps those stats in data/.catalog.json, one entry
+per raw DB keyed by repo_id and stamped with the file's (mtime_ns, size)
+fingerprint, so a DB is only ever opened when it is new or has changed.
+
+Reads are served from memory while the directory's own mtime is unchanged
+(one stat).  Adding, removing or renaming a file bumps it and triggers a
+rescan that re-stats every entry but only reopens the stale ones.  Imports
+call refresh(repo_id) on completion, which also catches a DB rewritten in
+place (that does not touch the directory mtime).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from queries.repos import fetch_db_stats
+
+CATALOG_NAME    = ".catalog.json"
+CATALOG_VERSION = 1
+
+
+def _fingerprint(st: os.stat_result) -> list[int]:
+    return [st.st_mtime_ns, st.st_size]
+
+
+class RepoCatalog:
+    """Thread-safe, file-backed repo list for one data directory."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self.path     = data_dir / CATALOG_NAME
+        self._lock    = threading.Lock()
+        self._entries: dict[str, dict] | None = None
+        self._dir_mtime: int | None = None
+        self.scans  = 0
+        self.opened = 0
+
+    def list(self) -> list[dict]:
+        """Repo summaries sorted by id — the /api/repos payload."""
+        with self._lock:
+            try:
+                dir_mtime = self.data_dir.stat().st_mtime_ns
+            except FileNotFoundError:
+                return []
+            if self._entries is None or dir_mtime != self._dir_mtime:
+                self._rescan(dir_mtime)
+            return [
+                {
+                    "id":           repo_id,
+                    "name":         repo_id,
+                    "node_count":   e["node_count"],
+                    "edge_count":   e["edge_count"],
+                    "module_count": e["module_count"],
+                    "enriched":     e["enriched"],
+                    "db_path":      str(self.data_dir / f"{repo_id}.db"),
+                }
+                for repo_id, e in sorted(self._entries.items())
+                if not e.get("error")
+            ]
+
+    def refresh(self, repo_id: str) -> None:
+        """Re-stat one repo's DBs now (e.g. after an import rewrote them)."""
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            if self._update(repo_id):
+                self._save()
+
+    # ── Internals (caller holds self._lock) ───────────────────────────────────
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            doc = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return doc.get("repos", {}) if doc.get("version") == CATALOG_VERSION else {}
+
+    def _save(self) -> None:
+        tmp = self.path.with_name(f"{CATALOG_NAME}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps({"version": CATALOG_VERSION, "repos": self._entries}))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass        # read-only data dir: the in-memory catalog still works
+
+    def _update(self, repo_id: str) -> bool:
+        """Bring repo_id's entry up to date. Returns True when it changed."""
+        db_file = self.data_dir / f"{repo_id}.db"
+        try:
+            fingerprint = _fingerprint(db_file.stat())
+        except FileNotFoundError:
+            return self._entries.pop(repo_id, None) is not None
+
+        enriched = (self.data_dir / f"{repo_id}.enriched.db").exists()
+        entry = self._entries.get(repo_id)
+        if entry is not None and entry["fingerprint"] == fingerprint:
+            if entry["enriched"] == enriched:
+                return False
+            entry["enriched"] = enriched
+            return True
+
+        self.opened += 1
+        try:
+            stats = fetch_db_stats(db_file)
+        except sqlite3.Error:
+            stats = {"error": True}
+        self._entries[repo_id] = {"fingerprint": fingerprint, "enriched": enriched, **stats}
+        return True
+
+    def _rescan(self, dir_mtime: int) -> None:
+        self.scans += 1
+        if self._entries is None:
+            self._entries = self._load()
+        names = {
+            e.name for e in os.scandir(self.data_dir)
+            if e.name.endswith(".db") and e.is_file()
+        }
+        # Enriched DBs are artifacts of their raw DB, not separate repos
+        repo_ids = {n[:-3] for n in names if not n.endswith(".enriched.db")}
+
+        changed = False
+        for repo_id in set(self._entries) - repo_ids:
+            del self._entries[repo_id]
+            changed = True
+        for repo_id in repo_ids:
+            changed |= self._update(repo_id)
+        if changed:
+            self._save()
+        self._dir_mtime = dir_mtime
+
+
+_catalogs: dict[Path, RepoCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(data_dir: Path) -> RepoCatalog:
+    """Process-wide RepoCatalog for data_dir."""
+    with _catalogs_lock:
+        catalog = _catalogs.get(data_dir)
+        if catalog is None:
+            catalog = _catalogs[data_dir] = RepoCatalog(data_dir)
+        return catalog
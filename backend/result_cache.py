@@ -0,0 +1,349 @@
+"""
+Process-wide memo of router results.
+
+Repo DBs are immutable between imports/enrichments, so an endpoint called
+twice with the same parameters against the same DB file returns the same
+payload.  ResultCache stores those payloads keyed on
+
+    (endpoint, repo_ids, normalised params)
+
+and tags each entry with the db_fingerprint() of every repo involved.  A
+lookup whose fingerprints no longer match (re-import, re-enrich, enriched DB
+appearing next to the base DB) is a miss and the stale entry is dropped, so
+invalidation needs no coordination with enrich.py or the import job.
+
+Concurrent misses for the same key and fingerprints are coalesced: the first
+caller computes, the rest wait on its result (single-flight), so a burst of
+identical requests after an import costs one computation.  This holds even
+with the cache disabled.
+
+Memory use is bounded by a byte budget (entry size = pickled size) with LRU
+eviction.  When a spill directory is configured, evicted entries are written
+there and promoted back into memory on the next hit.
+
+Configuration (environment):
+  EXPLORA_CACHE_MB         in-memory budget in MiB (default 256, 0 disables)
+  EXPLORA_CACHE_SPILL_DIR  directory for evicted entries (default: no spill)
+  EXPLORA_CACHE_SPILL_MB   on-disk budget in MiB (default 1024)
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from db import db_fingerprint
+
+_PICKLE = pickle.HIGHEST_PROTOCOL
+
+
+def _normalise(value: Any) -> Any:
+    """Hashable, order-independent form of a request parameter."""
+    if hasattr(value, "model_dump"):          # pydantic request bodies
+        value = value.model_dump()
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalise(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalise(v) for v in value]
+        return tuple(sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class ResultCache:
+    """Thread-safe, fingerprint-validated LRU of endpoint results."""
+
+    def __init__(
+        self,
+        max_bytes:       int,
+        spill_dir:       Path | str | None = None,
+        spill_max_bytes: int = 1 << 30,
+    ):
+        self.max_bytes       = max_bytes
+        self.spill_dir       = Path(spill_dir) if spill_dir else None
+        self.spill_max_bytes = spill_max_bytes
+        # key → (fingerprints, value, nbytes)
+        self._mem:   OrderedDict[tuple, tuple[tuple, Any, int]]  = OrderedDict()
+        # key → (fingerprints, path, nbytes)
+        self._disk:  OrderedDict[tuple, tuple[tuple, Path, int]] = OrderedDict()
+        self._bytes      = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits        = 0
+        self.disk_hits   = 0
+        self.misses      = 0
+        self.evictions   = 0
+        self.stale_drops = 0
+        self.coalesced   = 0
+        # (key, fingerprints) → Future of the computation currently running for it
+        self._flights: dict[tuple, Future] = {}
+        self._tasks:   set[asyncio.Future] = set()
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def get_or_compute(
+        self,
+        endpoint: str,
+        repo_ids: list[str] | tuple[str, ...],
+        params:   dict,
+        compute:  Callable[[], Any],
+    ) -> Any:
+        """
+        Cached result for (endpoint, repo_ids, params), calling compute() on a
+        miss.  Concurrent misses for the same key and fingerprints share one
+        compute() call.  Raises whatever db_fingerprint() raises (404 for
+        unknown repos) and whatever compute() raises.
+        """
+        key, fingerprints = self._key(endpoint, repo_ids, params)
+        if self.max_bytes > 0:
+            found, value = self._lookup(key, fingerprints)
+            if found:
+                return value
+
+        flight, leader = self._join(key, fingerprints)
+        if not leader:
+            return flight.result()
+        try:
+            value = compute()
+        except BaseException as exc:
+            self._land(key, fingerprints, flight, exc=exc)
+            raise
+        self._land(key, fingerprints, flight, value=value)
+        return value
+
+    async def aget_or_compute(
+        self,
+        endpoint: str,
+        repo_ids: list[str] | tuple[str, ...],
+        params:   dict,
+        compute:  Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        get_or_compute() for async handlers: compute is awaited on a miss.
+        It runs as its own task, so a caller that disconnects doesn't cancel
+        it for the others waiting on the same flight.
+        """
+        key, fingerprints = self._key(endpoint, repo_ids, params)
+        if self.max_bytes > 0:
+            found, value = self._lookup(key, fingerprints)
+            if found:
+                return value
+
+        flight, leader = self._join(key, fingerprints)
+        if leader:
+            task = asyncio.ensure_future(self._fly(key, fingerprints, flight, compute))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(asyncio.wrap_future(flight))
+
+    def invalidate(self, repo_id: str | None = None) -> None:
+        """Drop every entry involving repo_id (or everything)."""
+        with self._lock:
+            for key in [k for k in self._mem if repo_id is None or repo_id in k[1]]:
+                self._drop_mem(key)
+            for key in [k for k in self._disk if repo_id is None or repo_id in k[1]]:
+                self._drop_disk(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries":      len(self._mem),
+                "bytes":        self._bytes,
+                "max_bytes":    self.max_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes":   self._disk_bytes,
+                "hits":         self.hits,
+                "disk_hits":    self.disk_hits,
+                "misses":       self.misses,
+                "evictions":    self.evictions,
+                "stale_drops":  self.stale_drops,
+                "in_flight":    len(self._flights),
+                "coalesced":    self.coalesced,
+            }
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _key(endpoint: str, repo_ids, params: dict) -> tuple[tuple, tuple]:
+        key = (endpoint, tuple(repo_ids), _normalise(params))
+        return key, tuple(db_fingerprint(r) for r in repo_ids)
+
+    def _join(self, key: tuple, fingerprints: tuple) -> tuple[Future, bool]:
+        """The in-flight computation for (key, fingerprints), and whether the caller leads it."""
+        with self._lock:
+            flight = self._flights.get((key, fingerprints))
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[(key, fingerprints)] = Future()
+            return flight, True
+
+    def _land(self, key: tuple, fingerprints: tuple, flight: Future, value: Any = None,
+              exc: BaseException | None = None) -> None:
+        """Store the result (cache first, so no newcomer misses both), then wake the followers."""
+        if exc is None and self.max_bytes > 0:
+            self._store(key, fingerprints, value)
+        with self._lock:
+            self._flights.pop((key, fingerprints), None)
+        if exc is None:
+            flight.set_result(value)
+        else:
+            flight.set_exception(exc)
+
+    async def _fly(self, key: tuple, fingerprints: tuple, flight: Future,
+                   compute: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            value = await compute()
+        except BaseException as exc:
+            self._land(key, fingerprints, flight, exc=exc)
+            return
+        self._land(key, fingerprints, flight, value=value)
+
+    def _lookup(self, key: tuple, fingerprints: tuple) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if entry[0] == fingerprints:
+                    self._mem.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                self._drop_mem(key)
+                self.stale_drops += 1
+
+            spilled = self._disk.get(key)
+            if spilled is None:
+                self.misses += 1
+                return False, None
+            self._drop_disk(key, unlink=False)
+            path = spilled[1]
+            if spilled[0] != fingerprints:
+                self.stale_drops += 1
+                self.misses += 1
+                path.unlink(missing_ok=True)
+                return False, None
+
+        try:
+            blob = path.read_bytes()
+            path.unlink(missing_ok=True)
+            value = pickle.loads(blob)
+        except (OSError, pickle.PickleError, EOFError):
+            with self._lock:
+                self.misses += 1
+            return False, None
+        with self._lock:
+            self.disk_hits += 1
+        self._insert(key, fingerprints, value, len(blob))
+        return True, value
+
+    def _store(self, key: tuple, fingerprints: tuple, value: Any) -> None:
+        try:
+            nbytes = len(pickle.dumps(value, protocol=_PICKLE))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return                                  # unpicklable → don't cache
+        if nbytes > self.max_bytes:
+            return
+        self._insert(key, fingerprints, value, nbytes)
+
+    def _insert(self, key: tuple, fingerprints: tuple, value: Any, nbytes: int) -> None:
+        evicted: list[tuple[tuple, tuple, Any]] = []
+        with self._lock:
+            if key in self._mem:
+                self._drop_mem(key)
+            self._mem[key] = (fingerprints, value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and len(self._mem) > 1:
+                old_key, (old_fp, old_value, _) = next(iter(self._mem.items()))
+                self._drop_mem(old_key)
+                self.evictions += 1
+                evicted.append((old_key, old_fp, old_value))
+        if self.spill_dir is not None:
+            for old_key, old_fp, old_value in evicted:
+                self._spill(old_key, old_fp, old_value)
+
+    def _spill(self, key: tuple, fingerprints: tuple, value: Any) -> None:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        path   = self.spill_dir / f"{digest}.pkl"
+        try:
+            blob = pickle.dumps(value, protocol=_PICKLE)
+            if len(blob) > self.spill_max_bytes:
+                return
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(blob)
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError):
+            return
+        with self._lock:
+            if key in self._disk:
+                self._drop_disk(key, unlink=False)
+            self._disk[key] = (fingerprints, path, len(blob))
+            self._disk_bytes += len(blob)
+            while self._disk_bytes > self.spill_max_bytes and self._disk:
+                self._drop_disk(next(iter(self._disk)))
+
+    def _drop_mem(self, key: tuple) -> None:
+        """Caller must hold self._lock."""
+        _, _, nbytes = self._mem.pop(key)
+        self._bytes -= nbytes
+
+    def _drop_disk(self, key: tuple, unlink: bool = True) -> None:
+        """Caller must hold self._lock."""
+        _, path, nbytes = self._disk.pop(key)
+        self._disk_bytes -= nbytes
+        if unlink:
+            path.unlink(missing_ok=True)
+
+
+result_cache = ResultCache(
+    max_bytes       = int(float(os.environ.get("EXPLORA_CACHE_MB", "256")) * (1 << 20)),
+    spill_dir       = os.environ.get("EXPLORA_CACHE_SPILL_DIR") or None,
+    spill_max_bytes = int(float(os.environ.get("EXPLORA_CACHE_SPILL_MB", "1024")) * (1 << 20)),
+)
+
+
+def cached(endpoint: str, repo_params: tuple[str, ...] = ("repo_id",)):
+    """
+    Memoise a router handler in result_cache.
+
+    repo_params names the handler arguments that hold repo ids (their DB
+    fingerprints validate the entry); every other argument becomes part of
+    the key.  The wrapper keeps the handler's signature so FastAPI still sees
+    the original parameters, and is async when the handler is.
+    """
+    def decorator(fn):
+        sig = inspect.signature(fn)
+
+        def split(args, kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params   = dict(bound.arguments)
+            repo_ids = [params.pop(p) for p in repo_params]
+            return repo_ids, params
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                repo_ids, params = split(args, kwargs)
+                return await result_cache.aget_or_compute(
+                    endpoint, repo_ids, params, lambda: fn(*args, **kwargs),
+                )
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            repo_ids, params = split(args, kwargs)
+            return result_cache.get_or_compute(
+                endpoint, repo_ids, params, lambda: fn(*args, **kwargs),
+            )
+        return wrapper
+    return decorator
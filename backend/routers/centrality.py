@@ -1,25 +1,103 @@
+import json
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
-from db import get_db
-from queries.centrality import fetch_graph_for_centrality, fetch_blast_radius_data
-from analytics.centrality import compute_centrality, compute_blast_radius
+from db import open_db
+from graph_store import get_graph
+from result_cache import cached
+from scheduling import run_cpu
+from analytics.centrality import (
+    changeset_seeds, compute_blast_radius, compute_centrality, compute_changeset_blast_radius,
+    iter_changeset_blast_radius,
+)
+from queries.blast_index import fetch_blast_radius, has_blast_index
 
 router = APIRouter()
 
+# Affected nodes per NDJSON line batch when a changeset response is streamed.
+_STREAM_CHUNK = 500
+
 
 @router.get("/api/repos/{repo_id}/centrality")
-def centrality(repo_id: str, top_n: int = Query(30, le=100)):
-    conn = get_db(repo_id)
-    nodes, edges = fetch_graph_for_centrality(conn)
-    conn.close()
-    return {"nodes": compute_centrality(nodes, edges, top_n)}
+@cached("centrality")
+async def centrality(
+    repo_id:        str,
+    top_n:          int   = Query(30, le=100),
+    epsilon:        float = Query(0.05, ge=0, le=1.0),
+    time_budget_ms: int   = Query(2000, ge=10, le=60000),
+):
+    return await run_cpu(_centrality, repo_id, top_n, epsilon, time_budget_ms)
+
+
+def _centrality(repo_id: str, top_n: int, epsilon: float, time_budget_ms: int) -> dict:
+    """Runs in a cpu worker (scheduling.py), so betweenness stays in-process."""
+    nodes, info = compute_centrality(get_graph(repo_id), top_n, epsilon, time_budget_ms, workers=1)
+    return {"nodes": nodes, "betweenness": info}
 
 
 @router.get("/api/repos/{repo_id}/blast-radius/{node_hash}")
 def blast_radius(repo_id: str, node_hash: str, max_depth: int = Query(5, le=10)):
-    conn = get_db(repo_id)
-    target, reverse_adj, all_nodes = fetch_blast_radius_data(conn, node_hash)
-    conn.close()
-    if not target:
+    # Enriched DBs carry a precomputed index; otherwise BFS the shared graph
+    with open_db(repo_id) as conn:
+        indexed = has_blast_index(conn)
+        if indexed:
+            result = fetch_blast_radius(conn, node_hash, max_depth)
+    if not indexed:
+        result = compute_blast_radius(node_hash, get_graph(repo_id), max_depth)
+    if result is None:
         raise HTTPException(status_code=404, detail="Node not found")
-    return compute_blast_radius(node_hash, target, reverse_adj, all_nodes, max_depth)
+    return result
+
+
+class BlastRadiusRequest(BaseModel):
+    hashes:     Optional[list[str]] = None   # changed symbols, or …
+    compare_to: Optional[str] = None         # … every node added/modified since this snapshot
+    max_depth:  int = Field(5, ge=1, le=10)
+    stream:     bool = False                 # NDJSON: summary line, then one line per node
+
+
+def _ndjson(events):
+    """
+    NDJSON lines for iter_changeset_blast_radius: a "seeds" line, "node"
+    lines as each BFS level is reached, "attribution" lines once the bitsets
+    are final, then a "summary" line with the totals.
+    """
+    for event in events:
+        kind = event[0]
+        if kind == "seeds":
+            yield json.dumps({"type": "seeds", **event[1]}) + "\n"
+        elif kind == "level":
+            nodes = event[2]
+            for start in range(0, len(nodes), _STREAM_CHUNK):
+                yield "".join(
+                    json.dumps({"type": "node", **n}) + "\n" for n in nodes[start:start + _STREAM_CHUNK]
+                )
+        elif kind == "attribution":
+            yield "".join(
+                json.dumps({"type": "attribution", "hash": h, "seeds": seeds}) + "\n"
+                for h, seeds in event[1]
+            )
+        else:
+            yield json.dumps({"type": "summary", **event[1]}) + "\n"
+
+
+@router.post("/api/repos/{repo_id}/blast-radius")
+def changeset_blast_radius(repo_id: str, req: BlastRadiusRequest):
+    """Union blast radius of a changeset — explicit hashes and/or a diff against compare_to."""
+    if not req.hashes and not req.compare_to:
+        raise HTTPException(status_code=400, detail="Provide hashes or compare_to")
+
+    graph = get_graph(repo_id)
+    seeds = list(req.hashes or [])
+    if req.compare_to:
+        seeds += changeset_seeds(graph, get_graph(req.compare_to))
+
+    if req.stream:
+        return StreamingResponse(
+            _ndjson(iter_changeset_blast_radius(seeds, graph, req.max_depth)),
+            media_type="application/x-ndjson",
+        )
+    return compute_changeset_blast_radius(seeds, graph, req.max_depth)
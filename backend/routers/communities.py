@@ -1,15 +1,19 @@
 from fastapi import APIRouter, Query
 
-from db import get_db
-from queries.communities import fetch_community_data
+from graph_store import get_graph
+from result_cache import cached
+from scheduling import run_cpu
 from analytics.communities import detect_communities
 
 router = APIRouter()
 
 
 @router.get("/api/repos/{repo_id}/communities")
-def communities(repo_id: str, resolution: float = Query(1.0, ge=0.1, le=5.0)):
-    conn = get_db(repo_id)
-    nodes, edges = fetch_community_data(conn)
-    conn.close()
-    return detect_communities(nodes, edges, resolution)
+@cached("communities")
+async def communities(repo_id: str, resolution: float = Query(1.0, ge=0.1, le=5.0)):
+    return await run_cpu(_communities, repo_id, resolution)
+
+
+def _communities(repo_id: str, resolution: float) -> dict:
+    """Runs in a cpu worker (scheduling.py)."""
+    return detect_communities(get_graph(repo_id), resolution)
@@ -1,16 +1,20 @@
 from fastapi import APIRouter
 
-from db import get_db
-from queries.cycles import fetch_cycle_graph_data
+from graph_store import get_graph
+from result_cache import cached
+from scheduling import run_cpu
 from analytics.cycles import find_cycles
 
 router = APIRouter()
 
 
 @router.get("/api/repos/{repo_id}/cycles")
-def repo_cycles(repo_id: str):
-    conn = get_db(repo_id)
-    nodes, edges = fetch_cycle_graph_data(conn)
-    conn.close()
-    cycles = find_cycles(nodes, edges)
+@cached("cycles")
+async def repo_cycles(repo_id: str):
+    cycles = await run_cpu(_cycles, repo_id)
     return {"cycles": cycles, "total_cycles": len(cycles)}
+
+
+def _cycles(repo_id: str) -> list:
+    """Runs in a cpu worker (scheduling.py)."""
+    return find_cycles(get_graph(repo_id))
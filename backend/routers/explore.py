@@ -2,7 +2,7 @@ from collections import defaultdict
 
 from fastapi import APIRouter, Query
 
-from db import get_db
+from db import open_db
 from queries.explore import (
     AVAILABLE_DIMENSIONS,
     BUCKET_FIELDS,
@@ -15,6 +15,7 @@ from queries.explore import (
     fetch_nodes,
     fetch_dim_values,
     _has_new_schema,
+    _class_join,
 )
 
 router = APIRouter()
@@ -60,6 +61,8 @@ def _annotate_diff(result: dict, dims: list[str], conn, status_map: dict, snap_a
         if dim_expr:
             needs_nf = first_dim in {"in_cycle", "community"}
             nf_join  = "LEFT JOIN node_features nf ON n.hash = nf.hash" if needs_nf else ""
+            if "ncls." in dim_expr:   # node_class is already ensured by fetch_pivot
+                nf_join += " " + _class_join("")
             node_rows = conn.execute(
                 f"SELECT {dim_expr} AS gk, n.module, n.name "
                 f"FROM nodes n {nf_join} "
@@ -159,33 +162,24 @@ def explore_pivot(
     meas_raw  = [m.strip() for m in measures.split(",")   if m.strip()]
     kinds_lst = [k.strip() for k in kinds.split(",")      if k.strip()] or None
 
-    conn   = get_db(repo_id)
-    result = fetch_pivot(conn, dims, meas_raw, kinds_lst)
+    with open_db(repo_id) as conn:
+        result = fetch_pivot(conn, dims, meas_raw, kinds_lst)
 
-    # Available kind values for the filter chips
-    kind_rows       = conn.execute(
-        "SELECT DISTINCT kind FROM nodes WHERE hash NOT LIKE 'ext:%' AND kind IS NOT NULL ORDER BY kind"
-    ).fetchall()
-    available_kinds = [r[0] for r in kind_rows]
+        # Available kind values for the filter chips
+        kind_rows       = conn.execute(
+            "SELECT DISTINCT kind FROM nodes WHERE hash NOT LIKE 'ext:%' AND kind IS NOT NULL ORDER BY kind"
+        ).fetchall()
+        available_kinds = [r[0] for r in kind_rows]
 
-    # Diff overlay — annotate rows + edges with diff_status_value / diff_status
-    if compare_to:
-        from queries.graph import fetch_diff_snapshot
-        from analytics.diff import compute_diff_status_map
+        # Diff overlay — annotate rows + edges with diff_status_value / diff_status
+        if compare_to:
+            from diff_store import diff_store
 
-        conn_base = get_db(compare_to)
-        snap_a    = fetch_diff_snapshot(conn_base)
-        snap_b    = fetch_diff_snapshot(conn)
-        conn_base.close()
+            status_map = diff_store.status_map(compare_to, repo_id)
+            _annotate_diff(result, dims, conn, status_map, diff_store.snapshot(compare_to))
+            result["diff_moves"] = diff_store.moves(compare_to, repo_id)
 
-        status_map = compute_diff_status_map(
-            list(snap_a["nodes_by_key"].values()),
-            list(snap_b["nodes_by_key"].values()),
-        )
-        _annotate_diff(result, dims, conn, status_map, snap_a)
-
-    has_schema = _has_new_schema(conn)
-    conn.close()
+        has_schema = _has_new_schema(conn)
 
     # Filter new-schema dims from the menu when the DB predates schema enrichment v2
     available_dims = [
@@ -220,20 +214,18 @@ def explore_dim_values(
     regardless of the current Group By selection.
     """
     kinds_lst = [k.strip() for k in kinds.split(",") if k.strip()] or None
-    conn = get_db(repo_id)
-    result = fetch_dim_values(conn, kinds_lst)
-    conn.close()
+    with open_db(repo_id) as conn:
+        result = fetch_dim_values(conn, kinds_lst)
     return {"dims": result}
 
 
 @router.get("/api/repos/{repo_id}/explore/kinds")
 def explore_kinds(repo_id: str):
-    conn  = get_db(repo_id)
-    rows  = conn.execute(
-        "SELECT DISTINCT kind FROM nodes "
-        "WHERE hash NOT LIKE 'ext:%' AND kind IS NOT NULL ORDER BY kind"
-    ).fetchall()
-    conn.close()
+    with open_db(repo_id) as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT kind FROM nodes "
+            "WHERE hash NOT LIKE 'ext:%' AND kind IS NOT NULL ORDER BY kind"
+        ).fetchall()
     return {"kinds": [r[0] for r in rows]}
 
 
@@ -246,7 +238,6 @@ def explore_nodes(
     kinds:    str = Query(""),
 ):
     kinds_lst = [k.strip() for k in kinds.split(",") if k.strip()] or None
-    conn      = get_db(repo_id)
-    result    = fetch_nodes(conn, sort_by, sort_dir, limit, kinds_lst)
-    conn.close()
+    with open_db(repo_id) as conn:
+        result = fetch_nodes(conn, sort_by, sort_dir, limit, kinds_lst)
     return result
@@ -4,9 +4,11 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
-from db import get_db, DATA_DIR
-from queries.graph import fetch_graph, fetch_diff_snapshot
-from analytics.diff import compute_diff, compute_diff_graph, compute_diff_status_map
+from db import open_db, DATA_DIR
+from diff_store import diff_store, get_snapshot
+from metrics import analytics_span
+from queries.graph import fetch_graph
+from analytics.diff import compute_diff_graph
 
 router = APIRouter()
 
@@ -18,9 +20,8 @@ def get_graph(
     limit:   int           = Query(300, le=2000),
     offset:  int           = 0,
 ):
-    conn = get_db(repo_id)
-    nodes, edges = fetch_graph(conn, module, limit, offset)
-    conn.close()
+    with open_db(repo_id) as conn:
+        nodes, edges = fetch_graph(conn, module, limit, offset)
     return {"nodes": nodes, "edges": edges, "total_nodes": len(nodes)}
 
 
@@ -99,24 +100,18 @@ def _get_node_detail(conn, node_hash: str) -> dict:
 @router.get("/api/repos/{repo_id}/nodes/lookup")
 def lookup_node(repo_id: str, sym: str = Query(..., description="module::name symbol ID")):
     """Fetch node detail by symbol ID (module::name format)."""
-    from db import row_to_dict
-    conn = get_db(repo_id)
-    cur  = conn.cursor()
     parts = sym.split("::", 1)
     if len(parts) != 2:
-        conn.close()
         raise HTTPException(status_code=400, detail="sym must be module::name format")
     module, name = parts
-    row = cur.execute(
-        "SELECT hash FROM nodes WHERE module = ? AND name = ? LIMIT 1",
-        (module, name)
-    ).fetchone()
-    if not row:
-        conn.close()
-        raise HTTPException(status_code=404, detail=f"Node not found: {sym}")
-    node_hash = row[0]
-    result = _get_node_detail(conn, node_hash)
-    conn.close()
+    with open_db(repo_id) as conn:
+        row = conn.execute(
+            "SELECT hash FROM nodes WHERE module = ? AND name = ? LIMIT 1",
+            (module, name)
+        ).fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail=f"Node not found: {sym}")
+        result = _get_node_detail(conn, row[0])
     if result is None:
         raise HTTPException(status_code=404, detail="Node not found")
     return result
@@ -124,9 +119,8 @@ def lookup_node(repo_id: str, sym: str = Query(..., description="module::name sy
 
 @router.get("/api/repos/{repo_id}/nodes/{node_hash}")
 def get_node(repo_id: str, node_hash: str):
-    conn = get_db(repo_id)
-    result = _get_node_detail(conn, node_hash)
-    conn.close()
+    with open_db(repo_id) as conn:
+        result = _get_node_detail(conn, node_hash)
     if result is None:
         raise HTTPException(status_code=404, detail="Node not found")
     return result
@@ -143,18 +137,16 @@ def get_node_flags(repo_id: str):
     Falls back to empty if schema doesn't have new columns.
     """
     from queries.explore import _has_new_schema
-    conn = get_db(repo_id)
-    if not _has_new_schema(conn):
-        conn.close()
-        return {"flags": {}, "has_schema": False}
-
-    rows = conn.execute(
-        "SELECT module, name, is_async, is_self_recursive, is_exported, framework_entry_point "
-        "FROM nodes WHERE hash NOT LIKE 'ext:%' "
-        "  AND (is_async = 1 OR is_self_recursive = 1 OR is_exported = 1 "
-        "       OR (framework_entry_point != '' AND framework_entry_point IS NOT NULL))"
-    ).fetchall()
-    conn.close()
+    with open_db(repo_id) as conn:
+        if not _has_new_schema(conn):
+            return {"flags": {}, "has_schema": False}
+
+        rows = conn.execute(
+            "SELECT module, name, is_async, is_self_recursive, is_exported, framework_entry_point "
+            "FROM nodes WHERE hash NOT LIKE 'ext:%' "
+            "  AND (is_async = 1 OR is_self_recursive = 1 OR is_exported = 1 "
+            "       OR (framework_entry_point != '' AND framework_entry_point IS NOT NULL))"
+        ).fetchall()
 
     flags = {}
     for r in rows:
@@ -173,28 +165,26 @@ def get_inheritance_graph(repo_id: str):
     """Return the full inheritance graph (class hierarchy) for a repo."""
     from db import row_to_dict
     from queries.explore import _has_inheritance_table
-    conn = get_db(repo_id)
-    if not _has_inheritance_table(conn):
-        conn.close()
-        return {"nodes": [], "edges": [], "has_inheritance": False}
+    with open_db(repo_id) as conn:
+        if not _has_inheritance_table(conn):
+            return {"nodes": [], "edges": [], "has_inheritance": False}
+
+        # Resolved child nodes
+        node_rows = conn.execute(
+            "SELECT DISTINCT n.hash, n.name, n.module, n.file_path, n.kind "
+            "FROM inheritance i "
+            "JOIN nodes n ON n.hash = i.child_hash "
+            "WHERE n.hash NOT LIKE 'unresolved:%' "
+            "LIMIT 500"
+        ).fetchall()
 
-    cur = conn.cursor()
-    # Resolved child nodes
-    node_rows = cur.execute(
-        "SELECT DISTINCT n.hash, n.name, n.module, n.file_path, n.kind "
-        "FROM inheritance i "
-        "JOIN nodes n ON n.hash = i.child_hash "
-        "WHERE n.hash NOT LIKE 'unresolved:%' "
-        "LIMIT 500"
-    ).fetchall()
+        # All edges — child must be resolved; parent may be unresolved (external lib)
+        edge_rows = conn.execute(
+            "SELECT child_hash, parent_hash, parent_name FROM inheritance "
+            "WHERE child_hash NOT LIKE 'unresolved:%'"
+        ).fetchall()
     nodes = [row_to_dict(r) for r in node_rows]
 
-    # All edges — child must be resolved; parent may be unresolved (external lib)
-    edge_rows = cur.execute(
-        "SELECT child_hash, parent_hash, parent_name FROM inheritance "
-        "WHERE child_hash NOT LIKE 'unresolved:%'"
-    ).fetchall()
-
     # Synthesise stub nodes for unresolved (external) parents so edges can render
     seen_ids = {n["hash"] for n in nodes}
     for child_hash, parent_hash, parent_name in edge_rows:
@@ -213,7 +203,6 @@ def get_inheritance_graph(repo_id: str):
         {"source": r[0], "target": r[1], "parent_name": r[2]}
         for r in edge_rows
     ]
-    conn.close()
     return {"nodes": nodes, "edges": edges, "has_inheritance": True}
 
 
@@ -224,19 +213,7 @@ class DiffRequest(BaseModel):
 
 @router.post("/api/diff")
 def graph_diff(req: DiffRequest):
-    conn_a = get_db(req.repo_a)
-    conn_b = get_db(req.repo_b)
-    snap_a = fetch_diff_snapshot(conn_a)
-    snap_b = fetch_diff_snapshot(conn_b)
-    conn_a.close()
-    conn_b.close()
-
-    result = compute_diff(
-        list(snap_a["nodes_by_key"].values()),
-        list(snap_b["nodes_by_key"].values()),
-        snap_a["module_edges"],
-        snap_b["module_edges"],
-    )
+    result = diff_store.summary(req.repo_a, req.repo_b)
     return {"repo_a": req.repo_a, "repo_b": req.repo_b, **result}
 
 
@@ -246,21 +223,18 @@ def diff_graph(
     max_context: int = Query(4, le=10),
     max_nodes:   int = Query(120, le=300),
 ):
-    conn_a = get_db(req.repo_a)
-    conn_b = get_db(req.repo_b)
-    snap_a = fetch_diff_snapshot(conn_a)
-    snap_b = fetch_diff_snapshot(conn_b)
-    conn_a.close()
-    conn_b.close()
-
-    result = compute_diff_graph(
-        list(snap_a["nodes_by_key"].values()),
-        list(snap_b["nodes_by_key"].values()),
-        snap_a["edges"],
-        snap_b["edges"],
-        max_context,
-        max_nodes,
-    )
+    snap_a = get_snapshot(req.repo_a)
+    snap_b = get_snapshot(req.repo_b)
+
+    with analytics_span("diff_graph"):
+        result = compute_diff_graph(
+            list(snap_a["nodes_by_key"].values()),
+            list(snap_b["nodes_by_key"].values()),
+            snap_a["edges"],
+            snap_b["edges"],
+            max_context,
+            max_nodes,
+        )
 
     # GitHub compare link (optional metadata)
     github_url = None
@@ -287,20 +261,16 @@ def get_diff_status(
     Returns per-node diff status for all *changed* nodes when comparing
     compare_to (base) → repo_id (head).
 
-    Response: { status_map: { "module::name": "added"|"removed"|"modified" } }
+    Response: { status_map: { "module::name": "added"|"removed"|"modified" },
+                moves:      [{from, to, kind: "moved"|"renamed", exact, similarity}] }
 
     Uses module::name key format to match explore page node IDs.
-    Only changed nodes are included (unchanged nodes are absent).
+    Only changed nodes are included (unchanged nodes are absent).  A moved
+    or renamed symbol stays "removed" under its old key and "added" under its
+    new one in status_map; moves pairs them up.
     """
-    conn_a = get_db(compare_to)   # base / older
-    conn_b = get_db(repo_id)      # head / newer
-    snap_a = fetch_diff_snapshot(conn_a)
-    snap_b = fetch_diff_snapshot(conn_b)
-    conn_a.close()
-    conn_b.close()
-
-    status_map = compute_diff_status_map(
-        list(snap_a["nodes_by_key"].values()),
-        list(snap_b["nodes_by_key"].values()),
-    )
-    return {"status_map": status_map}
+    # a = base / older, b = head / newer
+    return {
+        "status_map": diff_store.status_map(compare_to, repo_id),
+        "moves":      diff_store.moves(compare_to, repo_id),
+    }
@@ -10,6 +10,7 @@ Status progression:  queued → cloning → indexing → exporting → enriching
 """
 from __future__ import annotations
 
+import glob
 import re
 import shutil
 import subprocess
@@ -21,6 +22,11 @@ from pathlib import Path
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from diff_store import diff_store
+from graph_store import graph_store
+from repo_catalog import get_catalog
+from result_cache import result_cache
+
 router = APIRouter()
 
 # In-memory job store (process lifetime; fine for a dev tool)
@@ -61,6 +67,12 @@ def _parse_github_url(url: str) -> tuple[str, str, str | None]:
     return owner, repo, ref
 
 
+def _latest_enriched(repo: str) -> Path | None:
+    """Most recently written enriched DB of any ref of `repo`, if one exists."""
+    candidates = list(DATA_DIR.glob(f"{glob.escape(repo)}@*.enriched.db"))
+    return max(candidates, key=lambda p: p.stat().st_mtime, default=None)
+
+
 def _run_import(job_id: str, url: str) -> None:
     def upd(status: str, message: str, progress: int = 0) -> None:
         jobs[job_id].update({"status": status, "message": message, "progress": progress})
@@ -77,6 +89,10 @@ def _run_import(job_id: str, url: str) -> None:
 
         jobs[job_id]["repo_id"] = repo_id
 
+        # Earlier enriched snapshot of this repo, if any — enrichment then
+        # only recomputes what the new commit changed
+        base_db = _latest_enriched(repo)
+
         # ── Step 1: Clone ──────────────────────────────────────────────────
         upd("cloning", f"Cloning {owner}/{repo}…", 10)
         tmpdir = tempfile.mkdtemp(prefix="semfora_import_")
@@ -126,14 +142,23 @@ def _run_import(job_id: str, url: str) -> None:
 
         # ── Step 4: Enrich ─────────────────────────────────────────────────
         upd("enriching", "Running enrichment analysis…", 80)
-        res = subprocess.run(
-            ["python3", str(BACKEND_DIR / "enrich.py"), str(db_path)],
-            capture_output=True, text=True, timeout=600,
-        )
+        enrich_cmd = ["python3", str(BACKEND_DIR / "enrich.py"), str(db_path)]
+        if base_db is not None:
+            enrich_cmd += ["--base", str(base_db)]
+        res = subprocess.run(enrich_cmd, capture_output=True, text=True, timeout=600)
         if res.returncode != 0:
             # Enrichment failure is non-fatal — base DB is still usable
             jobs[job_id]["enrich_warning"] = res.stderr[-200:]
 
+        # Fingerprints already make stale entries unreachable; this just
+        # releases the memory held for the previous DB right away.
+        result_cache.invalidate(repo_id)
+        graph_store.invalidate(repo_id)
+        diff_store.invalidate(repo_id)
+        # A re-import rewrites the DB in place, which the catalog's
+        # directory-mtime check cannot see
+        get_catalog(DATA_DIR).refresh(repo_id)
+
         upd("done", f"Import complete — {repo_id}", 100)
 
     except Exception as exc:
@@ -3,7 +3,8 @@ from typing import Optional
 from fastapi import APIRouter, Query
 from pydantic import BaseModel
 
-from db import get_db, read_lb_config, write_lb_config
+from db import open_db, read_lb_config, write_lb_config
+from result_cache import result_cache
 from queries.load_bearing import fetch_lb_candidates
 from analytics.load_bearing import analyze_load_bearing
 
@@ -12,10 +13,9 @@ router = APIRouter()
 
 @router.get("/api/repos/{repo_id}/load-bearing")
 def load_bearing(repo_id: str, threshold: int = Query(3, le=50)):
-    conn       = get_db(repo_id)
-    candidates = fetch_lb_candidates(conn, threshold)
-    lb_config  = read_lb_config(repo_id)
-    conn.close()
+    with open_db(repo_id) as conn:
+        candidates = fetch_lb_candidates(conn, threshold)
+    lb_config = read_lb_config(repo_id)
     result = analyze_load_bearing(candidates, lb_config)
     result["threshold_modules"] = threshold
     return result
@@ -46,4 +46,6 @@ def declare_lb(repo_id: str, req: LBDeclareRequest):
         elif req.module not in config["declared_modules"]:
             config["declared_modules"].append(req.module)
     write_lb_config(repo_id, config)
+    # Triage results embed the declared load-bearing set
+    result_cache.invalidate(repo_id)
     return {"ok": True, "config": config}
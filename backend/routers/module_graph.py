@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Query
 
-from db import get_db
+from db import open_db
+from result_cache import cached
+from scheduling import run_cpu
 from queries.module_graph import fetch_module_graph_data
 from analytics.module_graph import compute_module_graph
 
@@ -8,10 +10,15 @@ router = APIRouter()
 
 
 @router.get("/api/repos/{repo_id}/module-graph")
-def module_graph(repo_id: str, depth: int = Query(2, ge=1, le=6)):
-    conn = get_db(repo_id)
-    symbol_rows, edge_rows, max_depth = fetch_module_graph_data(conn)
-    conn.close()
+@cached("module-graph")
+async def module_graph(repo_id: str, depth: int = Query(2, ge=1, le=6)):
+    return await run_cpu(_module_graph, repo_id, depth)
+
+
+def _module_graph(repo_id: str, depth: int) -> dict:
+    """Runs in a cpu worker (scheduling.py)."""
+    with open_db(repo_id) as conn:
+        symbol_rows, edge_rows, max_depth = fetch_module_graph_data(conn)
     result = compute_module_graph(symbol_rows, edge_rows, depth)
     result["max_depth"] = min(max_depth, 6)
     return result
@@ -3,24 +3,36 @@ GET /api/repos/{repo_id}/patterns
 Detects classic programming patterns in the call graph.
 """
 from fastapi import APIRouter, Query
-from db import get_db
-from analytics.pattern_detector import detect_all_patterns
+from graph_store import get_graph
+from result_cache import cached
+from scheduling import run_cpu
+from analytics.pattern_detector import detect_patterns_timed
 
 router = APIRouter()
 
 
 @router.get("/api/repos/{repo_id}/patterns")
-def get_patterns(
+@cached("patterns")
+async def get_patterns(
     repo_id: str,
     min_confidence: float = Query(0.60, ge=0.0, le=1.0),
     kinds: str = Query(""),
 ):
-    with get_db(repo_id) as conn:
-        results = detect_all_patterns(conn, min_confidence=min_confidence)
+    results, timings = await run_cpu(_patterns, repo_id, min_confidence)
 
     return {
         "repo_id":  repo_id,
         "patterns": results,
         "total_pattern_types": len(results),
         "total_instances": sum(r["count"] for r in results),
+        "timings_ms": timings,
     }
+
+
+def _patterns(repo_id: str, min_confidence: float) -> tuple[list[dict], dict[str, float]]:
+    """
+    Runs in a cpu worker (scheduling.py).  workers=1: the lane already bounds
+    CPU use, and with EXPLORA_CPU_WORKERS=0 this is a server thread that must
+    not fork.
+    """
+    return detect_patterns_timed(min_confidence=min_confidence, graph=get_graph(repo_id), workers=1)
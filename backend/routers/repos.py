@@ -1,19 +1,26 @@
 from fastapi import APIRouter
 
-from db import DATA_DIR, get_db
-from queries.repos import fetch_repo_list, fetch_repo_overview
+from db import DATA_DIR, open_db
+from queries.repos import fetch_repo_overview, fetch_repo_stats
+from repo_catalog import get_catalog
 
 router = APIRouter()
 
 
 @router.get("/api/repos")
 def list_repos():
-    return {"repos": fetch_repo_list(DATA_DIR)}
+    return {"repos": get_catalog(DATA_DIR).list()}
 
 
 @router.get("/api/repos/{repo_id}/overview")
 def repo_overview(repo_id: str):
-    conn = get_db(repo_id)
-    result = fetch_repo_overview(conn)
-    conn.close()
+    # Enriched DBs carry a precomputed repo_stats row set; otherwise aggregate
+    # live.  Cycle / degree stats need the graph, so without repo_stats they
+    # are null rather than loading it on the Dashboard's first request.
+    with open_db(repo_id) as conn:
+        result = fetch_repo_stats(conn)
+        if result is None:
+            result = fetch_repo_overview(conn)
+    result.setdefault("cycles", None)
+    result.setdefault("degree_histograms", None)
     return {"repo_id": repo_id, **result}
@@ -1,22 +1,25 @@
 from fastapi import APIRouter, Query
 
-from db import get_db, row_to_dict
+from db import open_db, row_to_dict
+from queries.search_index import has_search_index, search_symbols
 
 router = APIRouter()
 
 
 @router.get("/api/repos/{repo_id}/search")
-def search_nodes(repo_id: str, q: str = Query(..., min_length=1), limit: int = 20):
-    conn = get_db(repo_id)
-    rows = conn.execute(
-        """
-        SELECT hash, name, kind, module, file_path, line_start, caller_count, callee_count, risk
-        FROM nodes
-        WHERE name LIKE ? AND hash NOT LIKE 'ext:%'
-        ORDER BY caller_count DESC
-        LIMIT ?
-        """,
-        (f"%{q}%", limit),
-    ).fetchall()
-    conn.close()
+def search_nodes(repo_id: str, q: str = Query(..., min_length=1), limit: int = Query(20, ge=1, le=200)):
+    # Enriched DBs carry a trigram index; otherwise scan names with LIKE
+    with open_db(repo_id) as conn:
+        if has_search_index(conn):
+            return {"results": search_symbols(conn, q, limit), "query": q}
+        rows = conn.execute(
+            """
+            SELECT hash, name, kind, module, file_path, line_start, caller_count, callee_count, risk
+            FROM nodes
+            WHERE name LIKE ? AND hash NOT LIKE 'ext:%'
+            ORDER BY caller_count DESC
+            LIMIT ?
+            """,
+            (f"%{q}%", limit),
+        ).fetchall()
     return {"results": [row_to_dict(r) for r in rows], "query": q}
@@ -0,0 +1,47 @@
+"""
+Operational endpoints:
+
+  GET /api/system/stats          scheduler lanes and process-wide cache counters
+  GET /api/system/slow-requests  recent slow requests with their costliest SQL
+  GET /metrics                   Prometheus text exposition (metrics.py)
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+import scheduling
+from diff_store import diff_store
+from graph_store import graph_store
+from metrics import REGISTRY, render_gauges
+from result_cache import result_cache
+
+router = APIRouter()
+
+
+@router.get("/api/system/stats")
+async def system_stats():
+    # async: io_stats() reads AnyIO's thread limiter, which lives on the event loop
+    return {
+        "scheduler":    scheduling.stats(),
+        "graph_store":  graph_store.stats(),
+        "result_cache": result_cache.stats(),
+        "diff_store":   diff_store.stats(),
+    }
+
+
+@router.get("/api/system/slow-requests")
+def slow_requests():
+    return {"requests": REGISTRY.slow()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    sched = scheduling.stats()
+    lines = (
+        render_gauges("explora_io_lane", sched["io"], "Sync handler thread pool (AnyIO limiter).")
+        + render_gauges("explora_cpu_lane", sched["cpu"], "Analytics process pool (scheduling.py).")
+        + render_gauges("explora_result_cache", result_cache.stats(), "Router result cache (result_cache.py).")
+    )
+    return PlainTextResponse(
+        REGISTRY.render() + "\n".join(lines) + "\n",
+        media_type="text/plain; version=0.0.4",
+    )
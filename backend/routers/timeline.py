@@ -0,0 +1,47 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from analytics.timeline import METRICS, Timeline
+from timeline_store import get_timeline
+
+router = APIRouter()
+
+
+def _timeline(base: str) -> Timeline:
+    timeline = get_timeline(base)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail=f"No snapshots of '{base}' (expected data/{base}@<ref>.db)")
+    return timeline
+
+
+@router.get("/api/timelines/{base}")
+def timeline_summary(base: str, top: int = Query(20, le=200)):
+    """Snapshots in commit order, per-step added/removed/modified, most-changed symbols."""
+    timeline = _timeline(base)
+    return {"base": base, **timeline.summary(), "most_changed": timeline.most_changed(top)}
+
+
+@router.get("/api/timelines/{base}/symbol")
+def timeline_symbol(base: str, key: str = Query(..., description="module::name")):
+    history = _timeline(base).symbol_history(key)
+    if history is None:
+        raise HTTPException(status_code=404, detail="Symbol not found in any snapshot")
+    return history
+
+
+@router.get("/api/timelines/{base}/churn")
+def timeline_churn(base: str, top: int = Query(30, le=500)):
+    timeline = _timeline(base)
+    return {"snapshots": timeline.snapshots, "modules": timeline.module_churn(top)}
+
+
+@router.get("/api/timelines/{base}/trends")
+def timeline_trends(
+    base:   str,
+    metric: str           = Query("caller_count"),
+    module: Optional[str] = None,
+):
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of {', '.join(METRICS)}")
+    return {"metric": metric, "module": module, "trend": _timeline(base).metric_trend(metric, module)}
@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 
-from db import get_db, read_lb_config
+from db import open_db, read_lb_config
+from graph_store import get_graph
+from result_cache import cached
+from scheduling import run_cpu
 from queries.triage import fetch_triage_inputs
 from analytics.triage import analyze_triage
 
@@ -8,9 +11,15 @@ router = APIRouter()
 
 
 @router.get("/api/repos/{repo_id}/triage")
-def triage(repo_id: str):
-    conn      = get_db(repo_id)
-    inputs    = fetch_triage_inputs(conn)
+@cached("triage")
+async def triage(repo_id: str):
+    return await run_cpu(_triage, repo_id)
+
+
+def _triage(repo_id: str) -> dict:
+    """Runs in a cpu worker (scheduling.py)."""
+    graph = get_graph(repo_id)
+    with open_db(repo_id) as conn:
+        inputs = fetch_triage_inputs(conn, graph)
     lb_config = read_lb_config(repo_id)
-    conn.close()
     return analyze_triage(inputs, lb_config)
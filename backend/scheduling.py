@@ -0,0 +1,201 @@
+"""
+Request scheduling — keeps whole-graph analytics from starving fast endpoints.
+
+Handlers fall into two classes:
+
+  io   — SQLite lookups and light aggregation (search, node detail, explore…).
+         These stay plain `def` handlers, which FastAPI runs on AnyIO's
+         worker threads; configure_io_threads() caps that pool.
+  cpu  — whole-graph analytics (communities, patterns, centrality, cycles,
+         triage, module graph).  These are `async def` handlers that await
+         run_cpu(fn, ...), which ships fn to a ProcessPoolExecutor: the work
+         escapes the GIL and never occupies an io thread while it runs.
+
+A cpu job is a module-level function taking plain arguments (it must pickle)
+that loads what it needs itself.  Each worker process has its own GraphStore,
+so a repo's graph is loaded once per worker, not once per job.
+
+The cpu lane runs at most EXPLORA_CPU_WORKERS jobs and queues at most
+EXPLORA_CPU_QUEUE more; past that run_cpu raises 503 so clients back off
+instead of piling up.  stats() reports concurrency, queue depth and
+wait / run times for both lanes.
+
+Configuration (environment):
+  EXPLORA_IO_WORKERS   threads for sync handlers (default 40, AnyIO's default)
+  EXPLORA_CPU_WORKERS  analytics worker processes (default min(4, CPUs);
+                       0 runs jobs on a single in-process thread instead)
+  EXPLORA_CPU_QUEUE    queued analytics jobs before 503 (default 32)
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, NamedTuple
+
+from fastapi import HTTPException
+
+from metrics import record_analytics
+
+IO_WORKERS  = int(os.environ.get("EXPLORA_IO_WORKERS", "40"))
+CPU_WORKERS = int(os.environ.get("EXPLORA_CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+CPU_QUEUE   = int(os.environ.get("EXPLORA_CPU_QUEUE", "32"))
+
+
+class _HTTPError(NamedTuple):
+    """An HTTPException raised by a job — the exception itself does not survive unpickling."""
+    status_code: int
+    detail:      Any
+    headers:     dict | None
+
+
+def _timed(fn: Callable, args: tuple, kwargs: dict) -> tuple[float, Any]:
+    """Runs in the executor: (wall-clock start, result) so wait time is measurable."""
+    started = time.time()
+    try:
+        return started, fn(*args, **kwargs)
+    except HTTPException as exc:
+        return started, _HTTPError(exc.status_code, exc.detail, exc.headers)
+
+
+class Lane:
+    """A lazily created executor with admission control and queue / latency counters."""
+
+    def __init__(self, name: str, make_executor: Callable[[], Executor], workers: int, max_queue: int):
+        self.name      = name
+        self.workers   = workers
+        self.max_queue = max_queue
+        self._make     = make_executor
+        self._executor: Executor | None = None
+        self._lock     = threading.Lock()
+        self.pending     = 0      # submitted and not yet finished (running + queued)
+        self.peak_queued = 0
+        self.completed   = 0
+        self.failed      = 0
+        self.rejected    = 0
+        self._wait_s     = 0.0
+        self._run_s      = 0.0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        fn(*args, **kwargs) on this lane's executor.  Raises 503 when the lane
+        is full; exceptions raised by fn propagate unchanged.
+        """
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Too many {self.name} jobs in flight; retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            self.peak_queued = max(self.peak_queued, self.pending - self.workers)
+            executor = self._executor
+            if executor is None:
+                executor = self._executor = self._make()
+
+        submitted = time.time()
+        try:
+            future = executor.submit(_timed, fn, args, kwargs)
+        except BaseException:
+            self._finish(None)
+            raise
+        # Counted down when the job really ends, even if this request is cancelled
+        future.add_done_callback(self._finish)
+        try:
+            started, result = await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed): start a fresh pool for later jobs
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise HTTPException(status_code=503, detail=f"{self.name} worker crashed; retry shortly")
+
+        run_s = time.time() - started
+        with self._lock:
+            self._wait_s += max(started - submitted, 0.0)
+            self._run_s  += run_s
+        record_analytics(getattr(fn, "__name__", "job").lstrip("_"), run_s)
+        if isinstance(result, _HTTPError):
+            raise HTTPException(result.status_code, detail=result.detail, headers=result.headers)
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = max(self.completed, 1)
+            return {
+                "workers":      self.workers,
+                "max_queue":    self.max_queue,
+                "running":      min(self.pending, self.workers),
+                "queued":       max(self.pending - self.workers, 0),
+                "peak_queued":  self.peak_queued,
+                "completed":    self.completed,
+                "failed":       self.failed,
+                "rejected":     self.rejected,
+                "mean_wait_ms": round(self._wait_s / done * 1000, 2),
+                "mean_run_ms":  round(self._run_s / done * 1000, 2),
+            }
+
+    def _finish(self, future: Future | None) -> None:
+        with self._lock:
+            self.pending -= 1
+            if future is None or future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+
+def _cpu_executor() -> Executor:
+    if CPU_WORKERS <= 0:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="explora-cpu")
+    # spawn, not fork: the server process is multi-threaded and holds SQLite handles
+    return ProcessPoolExecutor(max_workers=CPU_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+cpu_lane = Lane("cpu", _cpu_executor, max(CPU_WORKERS, 1), CPU_QUEUE)
+
+
+async def run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    """Run a CPU-heavy analytics job off the event loop and off the io threads."""
+    return await cpu_lane.run(fn, *args, **kwargs)
+
+
+# ── io lane (AnyIO's thread pool) ─────────────────────────────────────────────
+
+def configure_io_threads() -> None:
+    """Cap AnyIO's default thread limiter, which runs every sync handler.  Call on startup."""
+    import anyio.to_thread
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = IO_WORKERS
+
+
+def io_stats() -> dict:
+    """Concurrency / queue depth of sync handlers.  Must be called on the event loop."""
+    import anyio.to_thread
+
+    s = anyio.to_thread.current_default_thread_limiter().statistics()
+    return {
+        "workers": int(s.total_tokens),
+        "running": s.borrowed_tokens,
+        "queued":  s.tasks_waiting,
+    }
+
+
+def stats() -> dict:
+    return {"io": io_stats(), "cpu": cpu_lane.stats()}
+
+
+def shutdown() -> None:
+    cpu_lane.shutdown()
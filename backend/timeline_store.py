@@ -0,0 +1,119 @@
+"""
+Process-wide cache of per-repo snapshot timelines (analytics/timeline.py).
+
+A repo's snapshots are the DBs named data/{base}@{ref}.db, ordered by their
+export time (schema_info.created_at, then id).  TimelineStore builds one
+Timeline per base name and keeps it with the fingerprint of every snapshot
+it was built from.  On each lookup:
+
+  * nothing changed                 → the cached Timeline is returned
+  * only new snapshots, all newer   → just those are loaded and appended
+  * anything else (a snapshot was re-imported, removed, or an older ref
+    arrived late)                   → the timeline is rebuilt
+
+Timelines are shared between requests: treat them as read-only.
+"""
+from __future__ import annotations
+
+import glob
+import threading
+
+from analytics.timeline import Timeline
+from db import DATA_DIR, db_fingerprint, open_db
+from queries.timeline import fetch_snapshot_created_at, fetch_timeline_rows
+
+
+def snapshot_ids(base: str) -> list[str]:
+    """Repo ids of base's @ref snapshots present in data/ (unordered)."""
+    return [
+        p.name[:-3] for p in DATA_DIR.glob(f"{glob.escape(base)}@*.db")
+        if not p.name.endswith(".enriched.db")
+    ]
+
+
+class TimelineStore:
+    """Thread-safe map of base name → (Timeline, {repo_id: fingerprint}, order keys)."""
+
+    def __init__(self):
+        self._timelines: dict[str, tuple[Timeline, dict[str, tuple], list[tuple]]] = {}
+        self._lock     = threading.Lock()
+        self._loading: dict[str, threading.Lock] = {}
+        self.hits     = 0
+        self.appends  = 0
+        self.rebuilds = 0
+
+    def get(self, base: str) -> Timeline | None:
+        """Timeline over every snapshot of base, or None when it has none."""
+        with self._lock:
+            load_lock = self._loading.setdefault(base, threading.Lock())
+
+        # One builder per base; concurrent requests wait and reuse its result.
+        with load_lock:
+            current = {rid: db_fingerprint(rid) for rid in snapshot_ids(base)}
+            if not current:
+                return None
+            with self._lock:
+                entry = self._timelines.get(base)
+
+            if entry is not None and entry[1] == current:
+                with self._lock:
+                    self.hits += 1
+                return entry[0]
+
+            new_ids = set(current)
+            if entry is not None and all(current.get(r) == fp for r, fp in entry[1].items()):
+                new_ids -= set(entry[1])
+            else:
+                entry = None
+            loaded = sorted(self._load(rid) for rid in new_ids)
+
+            if entry is not None and loaded[0][0] > entry[2][-1]:
+                # Append to a copy: requests may still be reading the old one
+                timeline, order = entry[0].copy(), list(entry[2])
+                with self._lock:
+                    self.appends += 1
+            else:
+                if entry is not None:
+                    # An older ref arrived late: reload everything in order
+                    loaded = sorted(loaded + [self._load(rid) for rid in entry[1]])
+                timeline, order = Timeline(), []
+                with self._lock:
+                    self.rebuilds += 1
+
+            for order_key, rows in loaded:
+                timeline.append(order_key[1], rows)
+                order.append(order_key)
+
+            with self._lock:
+                self._timelines[base] = (timeline, current, order)
+            return timeline
+
+    def invalidate(self, base: str | None = None) -> None:
+        """Drop one timeline (or all) — the next get() rebuilds it."""
+        with self._lock:
+            if base is None:
+                self._timelines.clear()
+            else:
+                self._timelines.pop(base, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "resident": {b: len(e[0].snapshots) for b, e in self._timelines.items()},
+                "hits":     self.hits,
+                "appends":  self.appends,
+                "rebuilds": self.rebuilds,
+            }
+
+    @staticmethod
+    def _load(repo_id: str) -> tuple[tuple[str, str], list[dict]]:
+        """((created_at, repo_id), rows) for one snapshot."""
+        with open_db(repo_id) as conn:
+            return (fetch_snapshot_created_at(conn), repo_id), fetch_timeline_rows(conn)
+
+
+timeline_store = TimelineStore()
+
+
+def get_timeline(base: str) -> Timeline | None:
+    return timeline_store.get(base)
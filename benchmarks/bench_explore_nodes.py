@@ -0,0 +1,87 @@
+"""
+Benchmark: /explore/nodes outbound-edge lookup, per-node queries vs one
+windowed query.
+
+Times queries/explore.fetch_nodes (batched ROW_NUMBER() query) against the
+previous implementation, which issued one edges JOIN per returned node, on
+the largest DBs in data/.
+
+Usage:
+    python benchmarks/bench_explore_nodes.py               # 3 largest DBs, limit=1000
+    python benchmarks/bench_explore_nodes.py --limit 300 --repeat 20 data/foo.db
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+import queries.explore as explore                   # noqa: E402
+from db import _open_readonly                       # noqa: E402
+from queries.explore import fetch_nodes             # noqa: E402
+
+
+def fetch_nodes_per_node_queries(conn, limit: int) -> dict:
+    """The pre-batching implementation: node query + one edges query per node."""
+    batched = explore._fetch_top_callees
+    explore._fetch_top_callees = lambda *a: {}
+    try:
+        result = fetch_nodes(conn, limit=limit)
+    finally:
+        explore._fetch_top_callees = batched
+    for node in result["nodes"]:
+        edges = conn.execute(
+            "SELECT e.callee_hash AS hash, n2.name, n2.module, e.call_count "
+            "FROM edges e JOIN nodes n2 ON e.callee_hash = n2.hash "
+            "WHERE e.caller_hash = ? AND n2.hash NOT LIKE 'ext:%' "
+            "ORDER BY e.call_count DESC LIMIT 8",
+            (node["hash"],),
+        ).fetchall()
+        node["outbound_edges"] = [dict(e) for e in edges]
+    return result
+
+
+def _time(fn, repeat: int) -> list[float]:
+    fn()                                             # warm page cache
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("dbs", nargs="*", help="DB files (default: 3 largest in data/)")
+    parser.add_argument("--limit",  type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    dbs = [Path(p) for p in args.dbs] or sorted(
+        (p for p in (ROOT / "data").glob("*.db")), key=os.path.getsize, reverse=True,
+    )[:3]
+
+    print(f"limit={args.limit}  repeat={args.repeat}  (median / p95 ms)\n")
+    print(f"{'db':45} {'per-node':>18} {'batched':>18} {'speedup':>8}")
+    for path in dbs:
+        conn = _open_readonly(path)
+        old = _time(lambda: fetch_nodes_per_node_queries(conn, args.limit), args.repeat)
+        new = _time(lambda: fetch_nodes(conn, limit=args.limit), args.repeat)
+        conn.close()
+
+        def fmt(s):
+            return f"{statistics.median(s):7.1f} / {sorted(s)[int(0.95 * (len(s) - 1))]:7.1f}"
+
+        speedup = statistics.median(old) / max(statistics.median(new), 1e-9)
+        print(f"{path.name[:45]:45} {fmt(old):>18} {fmt(new):>18} {speedup:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: PageRank / HITS, NetworkX vs the CSR sparse kernels in
+analytics/link_analysis.py.
+
+Builds a synthetic call graph (power-law-ish fan-in, random fan-out) so the
+edge count can be pushed well past what the fixture DBs hold.  NetworkX
+times include its graph → SciPy conversion, which is part of what
+enrich.py used to pay per call.
+
+Usage:
+    python benchmarks/bench_link_analysis.py                 # 100k nodes, ~500k distinct edges
+    python benchmarks/bench_link_analysis.py --nodes 20000 --edges 100000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from analytics.csr_graph import CSRGraph                 # noqa: E402
+from analytics.link_analysis import hits, pagerank       # noqa: E402
+
+
+def synthetic_graph(n_nodes: int, n_edges: int, seed: int = 0) -> CSRGraph:
+    rng = np.random.default_rng(seed)
+    src = rng.integers(0, n_nodes, n_edges)
+    dst = np.minimum(rng.zipf(1.6, n_edges) - 1, n_nodes - 1)   # popular callees
+    dst = rng.permutation(n_nodes)[dst]
+    nodes = [{"hash": f"n{i}", "module": f"m{i % 50}"} for i in range(n_nodes)]
+    return CSRGraph(nodes, src, dst, np.ones(n_edges, dtype=np.int64))
+
+
+def _time(fn) -> tuple[float, object]:
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=800_000)
+    args = parser.parse_args()
+
+    graph = synthetic_graph(args.nodes, args.edges)
+    G = graph.to_networkx()
+    print(f"{graph.n_nodes} nodes, {graph.n_edges} distinct edges\n")
+    print(f"{'':10} {'networkx':>10} {'sparse':>10} {'speedup':>8} {'max |Δ|':>10}")
+
+    t_nx, pr_nx = _time(lambda: nx.pagerank(G, alpha=0.85, max_iter=200))
+    t_sp, pr_sp = _time(lambda: pagerank(graph, alpha=0.85, max_iter=200))
+    err = max(abs(pr_nx[h] - pr_sp[i]) for i, h in enumerate(graph.hashes))
+    print(f"{'pagerank':10} {t_nx:9.2f}s {t_sp:9.2f}s {t_nx / t_sp:7.1f}x {err:10.1e}")
+
+    t_nx, (hub_nx, _) = _time(lambda: nx.hits(G, max_iter=200))
+    t_sp, (hub_sp, _) = _time(lambda: hits(graph, max_iter=200))
+    err = max(abs(hub_nx[h] - hub_sp[i]) for i, h in enumerate(graph.hashes))
+    print(f"{'hits':10} {t_nx:9.2f}s {t_sp:9.2f}s {t_nx / t_sp:7.1f}x {err:10.1e}")
+
+    t_cold, _ = _time(lambda: pagerank(graph, max_iter=200))
+    t_warm, _ = _time(lambda: pagerank(graph, max_iter=200, start=pr_sp))
+    print(f"\npagerank warm start from previous solution: {t_cold:.2f}s → {t_warm:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
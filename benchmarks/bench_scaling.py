@@ -0,0 +1,315 @@
+"""
+Benchmark: every query and analytics entry point across synthetic graph sizes.
+
+Generates semfora DBs with benchmarks/synth_graph.py (10k … 2M symbols by
+default), times each entry point the API serves from them, and writes a JSON
+report.  Two reports — e.g. from two commits — can be compared with
+--compare, which exits non-zero when anything slowed down past --threshold.
+
+Timings are per call, after one untimed warm-up (page cache, lazy TEMP
+tables).  A benchmark that ran past --budget seconds at one size is skipped
+at the larger ones, so the 2M tier only runs what can finish.
+
+Usage:
+    python benchmarks/bench_scaling.py                           # 10k, 100k, 500k, 2M
+    python benchmarks/bench_scaling.py --sizes 10000,100000 --out before.json
+    python benchmarks/bench_scaling.py --sizes 10000,100000 --out after.json --compare before.json
+    python benchmarks/bench_scaling.py --only pivot_module,communities --cache-dir /tmp/synth
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from analytics.centrality import compute_centrality               # noqa: E402
+from analytics.communities import detect_communities              # noqa: E402
+from analytics.cycles import find_cycles                          # noqa: E402
+from analytics.dead_code import analyze_dead_code                 # noqa: E402
+from analytics.diff import compute_diff, compute_diff_graph, match_moves  # noqa: E402
+from analytics.module_graph import compute_module_graph           # noqa: E402
+from analytics.pattern_detector import detect_all_patterns        # noqa: E402
+from analytics.repo_stats import graph_stats                      # noqa: E402
+from analytics.triage import analyze_triage                       # noqa: E402
+from db import _open_readonly                                     # noqa: E402
+from queries.core import fetch_call_graph                         # noqa: E402
+from queries.dead_code import fetch_dead_candidates               # noqa: E402
+from queries.explore import fetch_nodes, fetch_pivot              # noqa: E402
+from queries.graph import fetch_diff_snapshot                     # noqa: E402
+from queries.module_graph import fetch_module_graph_data          # noqa: E402
+from queries.search_index import search_symbols, write_search_index  # noqa: E402
+from queries.triage import fetch_triage_inputs                    # noqa: E402
+from synth_graph import GraphSpec, generate, mutate               # noqa: E402
+
+DEFAULT_SIZES = "10000,100000,500000,2000000"
+LB_CONFIG     = {"declared_modules": [], "declared_nodes": []}
+
+
+# ── Entry points ──────────────────────────────────────────────────────────────
+# Each takes the run context {conn, graph, path, head_path, snap_a, snap_b, ...}.
+
+def _search(ctx: dict) -> None:
+    for q in ("get_user", "Board", "prs_tkn", "mod3"):
+        search_symbols(ctx["conn"], q)
+
+
+def _write_search_index(ctx: dict) -> None:
+    conn = sqlite3.connect(ctx["path"])
+    conn.row_factory = sqlite3.Row
+    try:
+        write_search_index(conn)
+    finally:
+        conn.close()
+
+
+def _triage(ctx: dict) -> None:
+    analyze_triage(fetch_triage_inputs(ctx["conn"], ctx["graph"]), LB_CONFIG)
+
+
+def _dead_code(ctx: dict) -> None:
+    analyze_dead_code(*fetch_dead_candidates(ctx["conn"]))
+
+
+def _module_graph(ctx: dict) -> None:
+    symbols, edges, _ = fetch_module_graph_data(ctx["conn"])
+    compute_module_graph(symbols, edges, 2)
+
+
+def _diff_sides(ctx: dict) -> tuple[list[dict], list[dict]]:
+    return list(ctx["snap_a"]["nodes_by_key"].values()), list(ctx["snap_b"]["nodes_by_key"].values())
+
+
+def _diff(ctx: dict) -> None:
+    a, b = _diff_sides(ctx)
+    compute_diff(a, b, ctx["snap_a"]["module_edges"], ctx["snap_b"]["module_edges"])
+
+
+def _diff_graph(ctx: dict) -> None:
+    a, b = _diff_sides(ctx)
+    compute_diff_graph(a, b, ctx["snap_a"]["edges"], ctx["snap_b"]["edges"])
+
+
+def _enrich(ctx: dict) -> None:
+    from enrich import enrich
+
+    enrich(ctx["path"], verbose=False).unlink()
+
+
+# name → fn(ctx).  Setup work (graph load, diff snapshots) is timed
+# by its own entries so the analytics rows measure only the analytics.
+BENCHMARKS: dict[str, Callable[[dict], object]] = {
+    "fetch_call_graph":     lambda ctx: fetch_call_graph(ctx["conn"]),
+    "fetch_diff_snapshot":  lambda ctx: fetch_diff_snapshot(ctx["conn"]),
+    "pivot_module":         lambda ctx: fetch_pivot(ctx["conn"], ["module"], ["symbol_count", "caller_count:avg"]),
+    "pivot_module_kind":    lambda ctx: fetch_pivot(ctx["conn"], ["module", "kind"], ["symbol_count", "complexity:max"]),
+    "explore_nodes":        lambda ctx: fetch_nodes(ctx["conn"], limit=300),
+    "search_index_build":   _write_search_index,
+    "search":               _search,
+    "graph_stats":          lambda ctx: graph_stats(ctx["graph"]),
+    "cycles":               lambda ctx: find_cycles(ctx["graph"]),
+    "communities":          lambda ctx: detect_communities(ctx["graph"]),
+    "patterns":             lambda ctx: detect_all_patterns(min_confidence=0.6, graph=ctx["graph"]),
+    "centrality":           lambda ctx: compute_centrality(ctx["graph"], 30, 0.05, 2000),
+    "triage":               _triage,
+    "dead_code":            _dead_code,
+    "module_graph":         _module_graph,
+    "match_moves":          lambda ctx: match_moves(*_diff_sides(ctx)),
+    "diff":                 _diff,
+    "diff_graph":           _diff_graph,
+    "enrich":               _enrich,
+}
+
+
+# ── Timing ────────────────────────────────────────────────────────────────────
+
+def _time(fn, ctx: dict, repeat: int, budget_s: float) -> dict:
+    """Warm-up + up to `repeat` timed calls, stopping early once past budget_s."""
+    t0 = time.perf_counter()
+    fn(ctx)
+    warm = time.perf_counter() - t0
+    samples = []
+    if warm < budget_s:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(ctx)
+            samples.append(time.perf_counter() - t0)
+            if sum(samples) + warm >= budget_s:
+                break
+    samples = samples or [warm]
+    return {
+        "min_ms":    round(min(samples) * 1000, 2),
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "max_ms":    round(max(samples) * 1000, 2),
+        "runs":      len(samples),
+    }
+
+
+def _db_for(size: int, args, cache_dir: Path) -> tuple[Path, Path, dict, float]:
+    """(base DB, mutated head DB, counts, generation seconds), reused from cache_dir."""
+    stem = f"synth-{size}-{args.degree}-c{args.cycles}-s{args.seed}"
+    path, head = cache_dir / f"{stem}.db", cache_dir / f"{stem}-head.db"
+    meta = cache_dir / f"{stem}.json"
+    if path.exists() and head.exists() and meta.exists():
+        cached = json.loads(meta.read_text())
+        return path, head, cached["info"], cached["generate_s"]
+
+    t0 = time.perf_counter()
+    info = generate(path, GraphSpec(nodes=size, degree=args.degree, cycles=args.cycles, seed=args.seed))
+    generate_s = time.perf_counter() - t0
+    mutate(path, head, fraction=0.01, seed=args.seed + 1)
+    meta.write_text(json.dumps({"info": info, "generate_s": generate_s}))
+    return path, head, info, generate_s
+
+
+def run_size(size: int, args, cache_dir: Path, names: list[str], over_budget: set[str]) -> dict:
+    path, head, info, generate_s = _db_for(size, args, cache_dir)
+    print(f"\n── {size:,} symbols  ({info['edges']:,} edges, {info['modules']} modules, "
+          f"generated in {generate_s:.1f}s)")
+
+    conn = _open_readonly(path)
+    head_conn = _open_readonly(head)
+    ctx = {"conn": conn, "path": path, "head_path": head}
+    results: dict[str, dict] = {}
+    try:
+        ctx["graph"] = fetch_call_graph(conn)
+        if {"match_moves", "diff", "diff_graph"} & set(names):
+            ctx["snap_a"] = fetch_diff_snapshot(conn)
+            ctx["snap_b"] = fetch_diff_snapshot(head_conn)
+        if "search" in names:
+            _write_search_index(ctx)
+
+        for name in names:
+            if name in over_budget:
+                results[name] = {"skipped": "over budget at a smaller size"}
+            elif name == "enrich" and size > args.enrich_max:
+                results[name] = {"skipped": f"above --enrich-max {args.enrich_max}"}
+            else:
+                try:
+                    results[name] = _time(BENCHMARKS[name], ctx, args.repeat, args.budget)
+                except Exception as exc:                  # report, keep benchmarking
+                    results[name] = {"error": f"{type(exc).__name__}: {exc}"}
+                if results[name].get("min_ms", 0) >= args.budget * 1000:
+                    over_budget.add(name)
+            print(f"  {name:22} {_fmt(results[name])}")
+    finally:
+        conn.close()
+        head_conn.close()
+
+    return {
+        "nodes": info["nodes"], "edges": info["edges"], "modules": info["modules"],
+        "generate_s": round(generate_s, 2), "db_bytes": path.stat().st_size,
+        "results": results,
+    }
+
+
+def _fmt(r: dict) -> str:
+    if "median_ms" in r:
+        return f"{r['median_ms']:10.1f} ms  (min {r['min_ms']:.1f}, {r['runs']} runs)"
+    return r.get("error") or f"skipped: {r['skipped']}"
+
+
+# ── Report comparison ─────────────────────────────────────────────────────────
+
+def compare(old: dict, new: dict, threshold: float) -> list[str]:
+    """Print old → new medians per size / benchmark; returns the regressions."""
+    regressions = []
+    print(f"\n{'size':>9} {'benchmark':22} {'old ms':>10} {'new ms':>10} {'ratio':>7}")
+    for size, run in new["sizes"].items():
+        before = old.get("sizes", {}).get(size, {}).get("results", {})
+        for name, r in run["results"].items():
+            o = before.get(name, {})
+            if "median_ms" not in r or "median_ms" not in o:
+                continue
+            ratio = r["median_ms"] / max(o["median_ms"], 1e-3)
+            flag = ""
+            # ignore sub-millisecond noise
+            if ratio > 1 + threshold and r["median_ms"] - o["median_ms"] > 1.0:
+                flag = "  REGRESSION"
+                regressions.append(f"{size}/{name}")
+            print(f"{int(size):>9,} {name:22} {o['median_ms']:10.1f} {r['median_ms']:10.1f} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes",      default=DEFAULT_SIZES, help="comma-separated symbol counts")
+    parser.add_argument("--only",       default="", help="comma-separated benchmark names (default: all)")
+    parser.add_argument("--repeat",     type=int,   default=5)
+    parser.add_argument("--budget",     type=float, default=60.0, help="seconds per benchmark per size")
+    parser.add_argument("--enrich-max", type=int,   default=100_000, help="largest size to run enrich at")
+    parser.add_argument("--degree",     choices=("powerlaw", "poisson"), default="powerlaw")
+    parser.add_argument("--cycles",     type=float, default=0.01)
+    parser.add_argument("--seed",       type=int,   default=0)
+    parser.add_argument("--cache-dir",  help="keep generated DBs here and reuse them (default: temp dir)")
+    parser.add_argument("--out",        default="bench_scaling.json")
+    parser.add_argument("--compare",    help="previous report to compare against")
+    parser.add_argument("--threshold",  type=float, default=0.25, help="allowed slowdown ratio before failing")
+    args = parser.parse_args()
+
+    names = [n for n in args.only.split(",") if n] or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))} (have {', '.join(BENCHMARKS)})")
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    tmp = None
+    if args.cache_dir:
+        cache_dir = Path(args.cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix="explora-bench-")
+        cache_dir = Path(tmp.name)
+
+    report = {
+        "meta": {
+            "commit":   _git_commit(),
+            "date":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python":   platform.python_version(),
+            "platform": platform.platform(),
+            "cpus":     os.cpu_count(),
+            "args":     vars(args),
+        },
+        "sizes": {},
+    }
+    over_budget: set[str] = set()
+    try:
+        for size in sorted(sizes):
+            report["sizes"][str(size)] = run_size(size, args, cache_dir, names, over_budget)
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"\nreport → {args.out}")
+
+    if args.compare:
+        regressions = compare(json.loads(Path(args.compare).read_text()), report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: /search latency, name LIKE scan vs the FTS5 trigram index.
+
+Builds a synthetic DB of --symbols camelCase / snake_case identifiers (or
+uses the given DBs), writes the search index into it, and times a mix of
+prefix, substring, multi-word, typo and short queries — what the search
+box sends per keystroke.
+
+Usage:
+    python benchmarks/bench_search.py                     # synthetic, 200k symbols
+    python benchmarks/bench_search.py --symbols 50000 --repeat 5
+    python benchmarks/bench_search.py data/foo.db
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+from queries.search_index import search_symbols, write_search_index   # noqa: E402
+
+_WORDS = (
+    "get set update create delete parse load save render handle fetch build "
+    "user task board column card comment http request response session token "
+    "cache index query filter sort page item list map node edge graph config "
+    "auth login logout event queue worker job retry timeout error state store"
+).split()
+
+QUERIES = [
+    "get", "getUser", "handle_request", "http request", "TaskBoard", "cach",
+    "sesion", "udpate_card", "ge", "x", "renderPageItem", "services/", "zzzzqq",
+]
+
+
+def synthetic_db(path: Path, n: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE nodes (hash TEXT PRIMARY KEY, name TEXT NOT NULL, kind TEXT NOT NULL,
+                            module TEXT, file_path TEXT, line_start INTEGER, line_end INTEGER,
+                            risk TEXT DEFAULT 'low', complexity INTEGER DEFAULT 0,
+                            caller_count INTEGER DEFAULT 0, callee_count INTEGER DEFAULT 0);
+        CREATE INDEX idx_nodes_name ON nodes(name);
+    """)
+    rows = []
+    for i in range(n):
+        words = rng.sample(_WORDS, rng.randint(2, 4))
+        name = (
+            words[0] + "".join(w.title() for w in words[1:]) if rng.random() < 0.5
+            else "_".join(words)
+        ) + (str(i % 97) if rng.random() < 0.3 else "")
+        module = f"{rng.choice(_WORDS)}s.{rng.choice(_WORDS)}"
+        rows.append((
+            f"m{i % 1000}:{i}", name, "function", module, module.replace(".", "/") + ".py",
+            1, 10, "low", rng.randint(1, 30), int(rng.paretovariate(1.2)) - 1, rng.randint(0, 10),
+        ))
+    conn.executemany("INSERT INTO nodes VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def like_scan(conn, q: str, limit: int = 20) -> list:
+    return conn.execute(
+        "SELECT hash, name, kind, module, file_path, line_start, caller_count, callee_count, risk "
+        "FROM nodes WHERE name LIKE ? AND hash NOT LIKE 'ext:%' ORDER BY caller_count DESC LIMIT ?",
+        (f"%{q}%", limit),
+    ).fetchall()
+
+
+def _time(fn, repeat: int) -> list[float]:
+    samples = []
+    for q in QUERIES:
+        fn(q)                                        # warm page cache
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(q)
+            samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("dbs", nargs="*", help="DB files (default: synthetic)")
+    parser.add_argument("--symbols", type=int, default=200_000)
+    parser.add_argument("--repeat",  type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dbs:
+            paths = [Path(shutil.copy2(p, tmp)) for p in args.dbs]
+        else:
+            paths = [Path(tmp) / f"synthetic-{args.symbols}.db"]
+            synthetic_db(paths[0], args.symbols)
+
+        print(f"{len(QUERIES)} queries × {args.repeat}  (median / p99 ms)\n")
+        print(f"{'db':32} {'index build':>12} {'LIKE scan':>18} {'trigram index':>18}")
+        for path in paths:
+            conn = sqlite3.connect(path)
+            conn.row_factory = sqlite3.Row
+            t0 = time.perf_counter()
+            write_search_index(conn)
+            build = time.perf_counter() - t0
+            old = _time(lambda q: like_scan(conn, q), args.repeat)
+            new = _time(lambda q: search_symbols(conn, q), args.repeat)
+            conn.close()
+
+            def fmt(s):
+                s = sorted(s)
+                return f"{statistics.median(s):7.2f} / {s[int(0.99 * (len(s) - 1))]:7.2f}"
+
+            print(f"{path.name[:32]:32} {build:11.1f}s {fmt(old):>18} {fmt(new):>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Load test: concurrent simulated dashboard sessions against the API.
+
+Each virtual user replays a page flow in a loop — by default Dashboard →
+Explore pivot (2–3 dims) → node detail → blast radius → Explore diff
+overlay.  Requests on one page are fired together, as the frontend does;
+users pause --think seconds between pages.  Values a later page needs (a
+node hash) are extracted from earlier responses.
+
+Runs in-process against backend/main.py's app (httpx ASGI transport, with
+the app's lifespan, so the io / cpu lanes of scheduling.py are live) or
+against a running server with --url.  For each concurrency level in
+--users it reports throughput, error rate and p50 / p95 / p99 latency per
+endpoint, plus the peak running / queued jobs of the server's io and cpu
+lanes (sampled from /api/system/stats) — enough to see where sync handlers
+start queueing and to size EXPLORA_IO_WORKERS / EXPLORA_CPU_WORKERS.
+
+A flow file (--flow) is JSON: a list of pages, each
+    {"page": name, "requests": [{"name", "method", "path", "body"?}],
+     "extract": {var: "dotted.path.into.the.first.response"}}
+where a "*" path segment picks a random list element (of the first 50).
+Paths / bodies are formatted with {repo}, {compare}, {dims} and any
+extracted variable; a request whose variables are missing is skipped.
+
+Needs httpx, which is in the dev extras (pip install -e ".[dev]").
+
+Usage:
+    python benchmarks/load_test.py                                  # in-process, 1,4,16 users
+    python benchmarks/load_test.py --users 1,8,32,64 --duration 60 --json load.json
+    python benchmarks/load_test.py --url http://localhost:8000 --repo ca_rts@e871e68
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+DIMENSIONS = ("module", "kind", "risk", "directory", "dead")
+
+DEFAULT_FLOW = [
+    {"page": "dashboard", "requests": [
+        {"name": "repos",    "method": "GET", "path": "/api/repos"},
+        {"name": "overview", "method": "GET", "path": "/api/repos/{repo}/overview"},
+        {"name": "triage",   "method": "GET", "path": "/api/repos/{repo}/triage"},
+    ]},
+    {"page": "explore", "requests": [
+        {"name": "explore_nodes", "method": "GET",
+         "path": "/api/repos/{repo}/explore/nodes?sort_by=caller_count&sort_dir=desc&limit=200"},
+        {"name": "explore_pivot", "method": "GET",
+         "path": "/api/repos/{repo}/explore?dimensions={dims}&measures=symbol_count,dead_ratio,caller_count:avg"},
+        {"name": "explore_kinds", "method": "GET", "path": "/api/repos/{repo}/explore/kinds"},
+        {"name": "dim_values",    "method": "GET", "path": "/api/repos/{repo}/explore/dim-values"},
+        {"name": "node_flags",    "method": "GET", "path": "/api/repos/{repo}/node-flags"},
+    ], "extract": {"hash": "nodes.*.hash"}},
+    {"page": "node", "requests": [
+        {"name": "node_detail", "method": "GET", "path": "/api/repos/{repo}/nodes/{hash}"},
+    ]},
+    {"page": "blast_radius", "requests": [
+        {"name": "blast_radius", "method": "GET", "path": "/api/repos/{repo}/blast-radius/{hash}?max_depth=5"},
+    ]},
+    {"page": "diff_overlay", "requests": [
+        {"name": "diff_pivot",  "method": "GET",
+         "path": "/api/repos/{repo}/explore?dimensions={dims}&measures=symbol_count,caller_count:avg&compare_to={compare}"},
+        {"name": "diff_status", "method": "GET", "path": "/api/repos/{repo}/diff-status?compare_to={compare}"},
+    ]},
+]
+
+
+# ── Flow execution ────────────────────────────────────────────────────────────
+
+def _dig(data, dotted: str, rng: random.Random):
+    for part in dotted.split("."):
+        if isinstance(data, list):
+            if part == "*":
+                data = rng.choice(data[:50]) if data else None
+            else:
+                data = data[int(part)] if part.isdigit() and int(part) < len(data) else None
+        elif isinstance(data, dict):
+            data = data.get(part)
+        if data is None:
+            return None
+    return data
+
+
+def _format(template, session: dict):
+    """template with {vars} filled from session; None if a variable is missing."""
+    if isinstance(template, str):
+        try:
+            return template.format_map(session)
+        except KeyError:
+            return None
+    if isinstance(template, dict):
+        out = {k: _format(v, session) for k, v in template.items()}
+        return None if None in out.values() else out
+    return template
+
+
+class Recorder:
+    """Per-endpoint latency samples, error and status counts."""
+
+    def __init__(self):
+        self.latency: dict[str, list[float]] = defaultdict(list)
+        self.errors:  dict[str, int] = defaultdict(int)
+        self.status:  dict[int, int] = defaultdict(int)
+        self.sessions = 0
+
+    def record(self, name: str, seconds: float, status: int) -> None:
+        self.latency[name].append(seconds)
+        self.status[status] += 1
+        if status >= 400:
+            self.errors[name] += 1
+
+
+async def _request(client: httpx.AsyncClient, req: dict, session: dict, rec: Recorder):
+    path = _format(req["path"], session)
+    body = _format(req.get("body"), session)
+    if path is None or ("body" in req and body is None):
+        return None
+    t0 = time.perf_counter()
+    try:
+        resp = await client.request(req.get("method", "GET"), path, json=body)
+        status = resp.status_code
+    except httpx.HTTPError:
+        resp, status = None, 599
+    rec.record(req["name"], time.perf_counter() - t0, status)
+    if resp is None or status >= 400:
+        return None
+    try:
+        return resp.json()
+    except ValueError:
+        return None
+
+
+async def _user(
+    client: httpx.AsyncClient, flow: list[dict], base: dict, rec: Recorder,
+    deadline: float, think: float, rng: random.Random,
+) -> None:
+    while time.perf_counter() < deadline:
+        session = {**base, "dims": ",".join(rng.sample(DIMENSIONS, rng.choice((2, 3))))}
+        for page in flow:
+            if time.perf_counter() >= deadline:
+                return
+            results = await asyncio.gather(*(_request(client, r, session, rec) for r in page["requests"]))
+            for var, dotted in page.get("extract", {}).items():
+                value = _dig(results[0], dotted, rng)
+                if value is not None:
+                    session[var] = value
+            if think:
+                await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+        rec.sessions += 1
+
+
+# ── Reporting ─────────────────────────────────────────────────────────────────
+
+def _pct(sorted_s: list[float], p: float) -> float:
+    return sorted_s[min(len(sorted_s) - 1, int(round(p * (len(sorted_s) - 1))))] * 1000
+
+
+def summarize(rec: Recorder, users: int, elapsed: float) -> dict:
+    endpoints = {}
+    for name, samples in rec.latency.items():
+        s = sorted(samples)
+        endpoints[name] = {
+            "requests":   len(s),
+            "errors":     rec.errors[name],
+            "error_rate": round(rec.errors[name] / len(s), 4),
+            "rps":        round(len(s) / elapsed, 2),
+            "p50_ms":     round(_pct(s, 0.50), 1),
+            "p95_ms":     round(_pct(s, 0.95), 1),
+            "p99_ms":     round(_pct(s, 0.99), 1),
+            "max_ms":     round(s[-1] * 1000, 1),
+        }
+    total = sum(len(s) for s in rec.latency.values())
+    every = sorted(x for s in rec.latency.values() for x in s) or [0.0]
+    return {
+        "users":      users,
+        "seconds":    round(elapsed, 1),
+        "sessions":   rec.sessions,
+        "requests":   total,
+        "rps":        round(total / elapsed, 2),
+        "error_rate": round(sum(rec.errors.values()) / max(total, 1), 4),
+        "p50_ms":     round(_pct(every, 0.50), 1),
+        "p95_ms":     round(_pct(every, 0.95), 1),
+        "p99_ms":     round(_pct(every, 0.99), 1),
+        "status":     dict(sorted(rec.status.items())),
+        "endpoints":  endpoints,
+    }
+
+
+def print_level(s: dict) -> None:
+    print(f"\n── {s['users']} users: {s['requests']} requests in {s['seconds']}s = {s['rps']} req/s, "
+          f"{s['sessions']} sessions, errors {s['error_rate']:.1%}, "
+          f"p50/p95/p99 {s['p50_ms']}/{s['p95_ms']}/{s['p99_ms']} ms")
+    print(f"  {'endpoint':16} {'reqs':>6} {'err%':>6} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name, e in sorted(s["endpoints"].items(), key=lambda kv: -kv[1]["p95_ms"]):
+        print(f"  {name:16} {e['requests']:6} {e['error_rate']:6.1%} {e['rps']:7.1f} "
+              f"{e['p50_ms']:8.1f} {e['p95_ms']:8.1f} {e['p99_ms']:8.1f} {e['max_ms']:8.1f}")
+    if s.get("lanes"):
+        for lane, peak in s["lanes"].items():
+            print(f"  {lane} lane: peak running {peak['running']}/{peak['workers']}, peak queued {peak['queued']}")
+
+
+async def _sample_lanes(client: httpx.AsyncClient, peaks: dict, interval: float = 0.5) -> None:
+    """Track the peak running / queued counts of the server's io and cpu lanes."""
+    while True:
+        try:
+            sched = (await client.get("/api/system/stats")).json()["scheduler"]
+        except (httpx.HTTPError, ValueError, KeyError):
+            return
+        for lane, st in sched.items():
+            peak = peaks.setdefault(lane, {"workers": st["workers"], "running": 0, "queued": 0})
+            peak["running"] = max(peak["running"], st["running"])
+            peak["queued"]  = max(peak["queued"], st["queued"])
+        await asyncio.sleep(interval)
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def _pick_repos(repos: list[dict], repo: str | None, compare: str | None) -> tuple[str, str | None]:
+    """The largest repo with another snapshot of the same base to diff against."""
+    ids = [r["id"] for r in sorted(repos, key=lambda r: -(r.get("node_count") or 0))]
+    base_of = lambda rid: re.sub(r"@[^@]*$", "", rid)
+    if repo is None:
+        paired = [rid for rid in ids if sum(base_of(o) == base_of(rid) for o in ids) > 1]
+        repo = (paired or ids or [None])[0]
+    if compare is None and repo is not None:
+        compare = next((o for o in ids if o != repo and base_of(o) == base_of(repo)), None)
+    return repo, compare
+
+
+async def run(args) -> list[dict]:
+    async with AsyncExitStack() as stack:
+        if args.url:
+            transport = httpx.AsyncHTTPTransport(retries=0)
+            base_url = args.url.rstrip("/")
+        else:
+            from main import app
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://explora"
+        client = await stack.enter_async_context(httpx.AsyncClient(
+            transport=transport, base_url=base_url, timeout=args.timeout,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        ))
+
+        repos = (await client.get("/api/repos")).json()["repos"]
+        repo, compare = _pick_repos(repos, args.repo, args.compare)
+        if repo is None:
+            sys.exit("no repos in data/ — nothing to load-test")
+        print(f"repo {repo}, diff overlay against {compare or '(none — overlay skipped)'}")
+
+        flow = json.loads(Path(args.flow).read_text()) if args.flow else DEFAULT_FLOW
+        base = {"repo": repo, **({"compare": compare} if compare else {})}
+        levels = []
+        for users in (int(u) for u in args.users.split(",") if u):
+            rec, peaks = Recorder(), {}
+            sampler = asyncio.create_task(_sample_lanes(client, peaks))
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(
+                _user(client, flow, base, rec, deadline, args.think, random.Random(args.seed + i))
+                for i in range(users)
+            ))
+            summary = summarize(rec, users, time.perf_counter() - started)
+            sampler.cancel()
+            summary["lanes"] = peaks
+            print_level(summary)
+            levels.append(summary)
+        return levels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url",      help="running server (default: the app in-process)")
+    parser.add_argument("--repo",     help="repo id (default: largest repo with another snapshot)")
+    parser.add_argument("--compare",  help="repo id for the diff overlay (default: a sibling snapshot)")
+    parser.add_argument("--users",    default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per level")
+    parser.add_argument("--think",    type=float, default=0.0, help="mean pause between pages (s)")
+    parser.add_argument("--timeout",  type=float, default=60.0, help="per-request timeout (s)")
+    parser.add_argument("--flow",     help="JSON page-flow file (default: dashboard → diff overlay)")
+    parser.add_argument("--seed",     type=int, default=0)
+    parser.add_argument("--json",     help="write the per-level summaries here")
+    args = parser.parse_args()
+
+    levels = asyncio.run(run(args))
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "levels": levels}, indent=2))
+        print(f"\nreport → {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+"""
+Synthetic semfora-schema DBs at production scale.
+
+Writes schema_info / nodes / edges / module_edges (optionally inheritance +
+imports, and node_features via enrich.py) for a call graph with:
+
+  * nodes        10k … 2M internal symbols (+ ~2% external ext: symbols)
+  * modules      module count; sizes are log-normal, nested under packages
+  * degree       "powerlaw" (Zipf out-degree, hub callees) or "poisson"
+  * cycles       fraction of edges allowed to point "up" the layering; 0 is
+                 a DAG, 0.05 gives large SCCs
+  * communities  modules are grouped into communities; `locality` of a
+                 node's calls stay in its module, `mixing` leave its
+                 community, the rest go elsewhere in it
+
+Everything is vectorised (numpy), so 1M nodes take seconds, not minutes; a
+fixed seed gives a byte-identical graph.  mutate() derives a "next
+snapshot" with modified, moved, renamed, added and removed symbols for the
+diff benchmarks.
+
+Usage:
+    python benchmarks/synth_graph.py /tmp/synth.db --nodes 100000 --modules 400
+    python benchmarks/synth_graph.py /tmp/big.db --nodes 2000000 --degree poisson --cycles 0.01
+    python benchmarks/synth_graph.py /tmp/s.db --nodes 50000 --inheritance --features
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import time
+import zlib
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+_VERBS = ("get set update create delete parse load save render handle fetch build "
+          "resolve apply validate format compute merge split emit read write").split()
+_NOUNS = ("user task board column card comment request response session token cache "
+          "index query filter page item node edge graph config event queue job state").split()
+_EXT_PKGS = ("os", "json", "re", "logging", "numpy", "requests", "typing", "collections",
+             "itertools", "sqlalchemy", "pydantic", "asyncio")
+
+_SCHEMA = """
+CREATE TABLE schema_info (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE nodes (
+    hash TEXT PRIMARY KEY, name TEXT NOT NULL, kind TEXT NOT NULL, module TEXT,
+    file_path TEXT, line_start INTEGER, line_end INTEGER, risk TEXT DEFAULT 'low',
+    complexity INTEGER DEFAULT 0, caller_count INTEGER DEFAULT 0, callee_count INTEGER DEFAULT 0,
+    is_exported INTEGER, decorators TEXT, framework_entry_point TEXT, arity INTEGER,
+    is_self_recursive INTEGER, is_async INTEGER, return_type TEXT, ext_package TEXT,
+    base_classes TEXT
+);
+CREATE TABLE edges (
+    caller_hash TEXT NOT NULL, callee_hash TEXT NOT NULL, call_count INTEGER DEFAULT 1,
+    edge_kind TEXT NOT NULL DEFAULT 'call',
+    PRIMARY KEY (caller_hash, callee_hash, edge_kind)
+);
+CREATE TABLE module_edges (
+    caller_module TEXT NOT NULL, callee_module TEXT NOT NULL, edge_count INTEGER NOT NULL,
+    PRIMARY KEY (caller_module, callee_module)
+);
+"""
+
+_INDEXES = """
+CREATE INDEX idx_nodes_name ON nodes(name);
+CREATE INDEX idx_nodes_module ON nodes(module);
+CREATE INDEX idx_nodes_kind ON nodes(kind);
+CREATE INDEX idx_nodes_risk ON nodes(risk);
+CREATE INDEX idx_nodes_file ON nodes(file_path);
+CREATE INDEX idx_nodes_caller_count ON nodes(caller_count DESC);
+CREATE INDEX idx_nodes_callee_count ON nodes(callee_count DESC);
+CREATE INDEX idx_edges_caller ON edges(caller_hash);
+CREATE INDEX idx_edges_callee ON edges(callee_hash);
+CREATE INDEX idx_module_edges_caller ON module_edges(caller_module);
+CREATE INDEX idx_module_edges_callee ON module_edges(callee_module);
+CREATE INDEX idx_module_edges_count ON module_edges(edge_count DESC);
+"""
+
+_INHERITANCE = """
+CREATE TABLE inheritance (
+    child_hash TEXT NOT NULL, parent_hash TEXT NOT NULL, child_module TEXT,
+    parent_module TEXT, parent_name TEXT NOT NULL,
+    PRIMARY KEY (child_hash, parent_hash)
+);
+CREATE TABLE imports (
+    importer_module TEXT NOT NULL, imported_module TEXT NOT NULL,
+    import_count INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (importer_module, imported_module)
+);
+"""
+
+
+@dataclass(frozen=True)
+class GraphSpec:
+    nodes:       int   = 10_000
+    modules:     int   = 0          # 0 → nodes // 250, at least 4
+    degree:      str   = "powerlaw" # or "poisson"
+    avg_degree:  float = 4.0        # mean calls per internal symbol
+    cycles:      float = 0.01       # fraction of edges that may point up the layering
+    communities: int   = 0          # 0 → ~sqrt(modules)
+    locality:    float = 0.55       # calls within the caller's module
+    mixing:      float = 0.10       # calls leaving the caller's community
+    external:    float = 0.15       # calls to ext: symbols
+    inheritance: bool  = False
+    seed:        int   = 0
+
+    def resolved(self) -> "GraphSpec":
+        modules = self.modules or max(4, self.nodes // 250)
+        return replace(
+            self,
+            modules=modules,
+            communities=self.communities or max(1, int(round(modules ** 0.5))),
+        )
+
+
+# ── Graph ─────────────────────────────────────────────────────────────────────
+
+def _hex(rng: np.random.Generator, n: int, digits: int) -> list[str]:
+    return [f"{v:0{digits}x}" for v in rng.integers(0, 1 << (4 * digits), n, dtype=np.uint64).tolist()]
+
+
+def build_graph(spec: GraphSpec) -> dict:
+    """
+    The synthetic graph as column arrays:
+        nodes — dict of per-node lists / arrays (internal symbols only)
+        ext   — external symbol names
+        src, dst, calls — edge arrays; dst ≥ n indexes ext[dst - n]
+    """
+    spec = spec.resolved()
+    rng  = np.random.default_rng(spec.seed)
+    n, m, c = spec.nodes, spec.modules, spec.communities
+
+    # Modules: log-normal sizes, grouped into communities, nested under packages
+    weights = rng.lognormal(0.0, 0.8, m)
+    module_of = np.sort(rng.choice(m, n, p=weights / weights.sum()))
+    community_of_module = np.sort(rng.integers(0, c, m))
+    community_of = community_of_module[module_of]
+    module_names = [f"pkg{community_of_module[i]}/sub{i % 7}/mod{i}" for i in range(m)]
+
+    # Nodes are ordered by (community, module), so both are contiguous ranges
+    mod_start = np.searchsorted(module_of, np.arange(m))
+    mod_end   = np.searchsorted(module_of, np.arange(m), side="right")
+    com_start = np.searchsorted(community_of, np.arange(c))
+    com_end   = np.searchsorted(community_of, np.arange(c), side="right")
+
+    # Callee popularity (hubs) and layering: popular symbols sit deep
+    popularity = rng.pareto(1.5, n) + 1.0 if spec.degree == "powerlaw" else np.ones(n)
+    layer = np.argsort(np.argsort(np.log(popularity) + rng.normal(0, 1.0, n)))
+    cum_pop = np.cumsum(popularity)
+
+    if spec.degree == "powerlaw":
+        out_deg = np.minimum(rng.zipf(2.2, n), 500).astype(np.float64)
+        out_deg *= spec.avg_degree / out_deg.mean()
+        out_deg = rng.poisson(out_deg)
+    else:
+        out_deg = rng.poisson(spec.avg_degree, n)
+    src = np.repeat(np.arange(n), out_deg)
+    e = len(src)
+
+    # Pick a target range per edge, then a popularity-weighted node within it
+    r = rng.random(e)
+    lo = np.where(r < spec.locality, mod_start[module_of[src]], com_start[community_of[src]])
+    hi = np.where(r < spec.locality, mod_end[module_of[src]], com_end[community_of[src]])
+    leave = r >= 1.0 - spec.mixing
+    lo[leave], hi[leave] = 0, n
+    base  = np.where(lo > 0, cum_pop[lo - 1], 0.0)
+    total = cum_pop[hi - 1] - base
+    dst = np.minimum(np.searchsorted(cum_pop, base + rng.random(e) * total, side="right"), n - 1)
+
+    # Calls go down the layering except for the cycles fraction
+    up = (layer[src] > layer[dst]) & (rng.random(e) >= spec.cycles)
+    src[up], dst[up] = dst[up], src[up]
+
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+
+    # External calls
+    n_ext = max(20, n // 50)
+    ext = [f"{_EXT_PKGS[i % len(_EXT_PKGS)]}.{_VERBS[i % len(_VERBS)]}_{i}" for i in range(n_ext)]
+    n_ext_calls = int(len(src) * spec.external / max(1 - spec.external, 1e-9))
+    src = np.concatenate([src, rng.integers(0, n, n_ext_calls)])
+    dst = np.concatenate([dst, n + np.minimum(rng.zipf(1.8, n_ext_calls) - 1, n_ext - 1)])
+
+    pairs, calls = np.unique(src.astype(np.int64) * (n + n_ext) + dst, return_counts=True)
+    src, dst = pairs // (n + n_ext), pairs % (n + n_ext)
+
+    # Per-node attributes
+    kind = rng.choice(np.array(["function", "method", "class"]), n, p=[0.72, 0.22, 0.06])
+    complexity = np.minimum(rng.geometric(0.25, n) - 1, 80)
+    span = 3 + complexity * 4 + rng.integers(0, 15, n)
+    names = [
+        f"{_VERBS[a]}_{_NOUNS[b]}_{i}" if k != "class" else f"{_NOUNS[b].title()}{_VERBS[a].title()}{i}"
+        for i, (a, b, k) in enumerate(zip(
+            rng.integers(0, len(_VERBS), n).tolist(), rng.integers(0, len(_NOUNS), n).tolist(), kind.tolist(),
+        ))
+    ]
+    files_per_module = np.maximum(1, (mod_end - mod_start) // 15)
+    file_idx = rng.integers(0, 1 << 30, n) % files_per_module[module_of]
+    file_paths = [f"src/{module_names[mo]}/file{f}.py" for mo, f in zip(module_of.tolist(), file_idx.tolist())]
+    # line numbers: consecutive spans within each file
+    order = np.lexsort((np.arange(n), file_idx, module_of))
+    ends  = np.cumsum(span[order] + 2)
+    first = np.r_[True, (module_of[order][1:] != module_of[order][:-1]) | (file_idx[order][1:] != file_idx[order][:-1])]
+    file_base = np.maximum.accumulate(np.where(first, np.r_[0, ends[:-1]], 0))
+    line_start = np.empty(n, dtype=np.int64)
+    line_start[order] = np.r_[0, ends[:-1]] - file_base + 1
+    line_end = line_start + span
+
+    mod_hash = [f"{zlib.crc32(name.encode()):08x}" for name in module_names]
+    hashes = [f"{mod_hash[mo]}:{h}" for mo, h in zip(module_of.tolist(), _hex(rng, n, 16))]
+
+    return {
+        "spec": spec,
+        "module_names": module_names,
+        "nodes": {
+            "hash": hashes, "name": names, "kind": kind.tolist(),
+            "module": [module_names[i] for i in module_of.tolist()],
+            "file_path": file_paths, "line_start": line_start, "line_end": line_end,
+            "complexity": complexity,
+            "is_async": (rng.random(n) < 0.1).astype(np.int64),
+            "is_exported": (rng.random(n) < 0.4).astype(np.int64),
+            "arity": rng.integers(0, 6, n),
+        },
+        "ext": ext,
+        "src": src, "dst": dst, "calls": calls,
+        "rng": rng,
+    }
+
+
+# ── Writing ───────────────────────────────────────────────────────────────────
+
+def write_db(path: Path, g: dict) -> dict:
+    """Write the graph from build_graph() as a semfora DB; returns counts."""
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    spec, nd = g["spec"], g["nodes"]
+    n, n_ext = len(nd["hash"]), len(g["ext"])
+    src, dst, calls = g["src"], g["dst"], g["calls"]
+
+    all_hash   = nd["hash"] + [f"ext:{x}" for x in g["ext"]]
+    all_module = nd["module"] + ["__external__"] * n_ext
+    caller_count = np.bincount(dst[src < n], minlength=n + n_ext)   # internal callers only
+    callee_count = np.bincount(src, minlength=n + n_ext)
+    self_recursive = np.zeros(n, dtype=np.int64)                    # self loops are dropped
+
+    conn = sqlite3.connect(path)
+    conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + _SCHEMA)
+    conn.executemany("INSERT INTO schema_info VALUES (?, ?)", [
+        ("version", "1.0"), ("created_at", time.strftime("%Y-%m-%d %H:%M:%S")),
+        ("generator", "synth_graph"), ("spec", repr(spec)),
+    ])
+    risk = np.where(nd["complexity"] >= 20, "high", np.where(nd["complexity"] >= 8, "medium", "low"))
+    conn.executemany(
+        "INSERT INTO nodes VALUES (?,?,?,?,?,?,?,?,?,?,?,?,'','',?,?,?,'','','')",
+        zip(
+            nd["hash"], nd["name"], nd["kind"], nd["module"], nd["file_path"],
+            nd["line_start"].tolist(), nd["line_end"].tolist(), risk.tolist(),
+            nd["complexity"].tolist(), caller_count[:n].tolist(), callee_count[:n].tolist(),
+            nd["is_exported"].tolist(), nd["arity"].tolist(), self_recursive.tolist(),
+            nd["is_async"].tolist(),
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO nodes VALUES (?,?,'external','__external__',NULL,NULL,NULL,'low',0,?,0,"
+        "0,'','',0,0,0,'',?,'')",
+        zip(all_hash[n:], g["ext"], caller_count[n:].tolist(), [x.split(".")[0] for x in g["ext"]]),
+    )
+    conn.executemany(
+        "INSERT INTO edges VALUES (?, ?, ?, 'call')",
+        zip(
+            (all_hash[i] for i in src.tolist()),
+            (all_hash[i] for i in dst.tolist()),
+            calls.tolist(),
+        ),
+    )
+
+    # module_edges: every (caller module, callee module) pair, __external__ included
+    mod_index = {name: i for i, name in enumerate(g["module_names"] + ["__external__"])}
+    mod_of = np.array([mod_index[mo] for mo in all_module], dtype=np.int64)
+    n_mod = len(mod_index)
+    pair, counts = np.unique(mod_of[src] * n_mod + mod_of[dst], return_counts=True)
+    names = list(mod_index)
+    conn.executemany(
+        "INSERT INTO module_edges VALUES (?, ?, ?)",
+        ((names[p // n_mod], names[p % n_mod], int(k)) for p, k in zip(pair.tolist(), counts.tolist())),
+    )
+
+    n_inherit = 0
+    if spec.inheritance:
+        conn.executescript(_INHERITANCE)
+        rng = g["rng"]
+        classes = np.flatnonzero(np.array(nd["kind"]) == "class")
+        children = classes[rng.random(len(classes)) < 0.5]
+        if len(classes):
+            parents = classes[rng.integers(0, len(classes), len(children))]
+            ok = children != parents
+            rows = [
+                (nd["hash"][c], nd["hash"][p], nd["module"][c], nd["module"][p], nd["name"][p])
+                for c, p in zip(children[ok].tolist(), parents[ok].tolist())
+            ]
+            conn.executemany("INSERT INTO inheritance VALUES (?, ?, ?, ?, ?)", rows)
+            conn.executemany(
+                "UPDATE nodes SET base_classes = ? WHERE hash = ?", [(r[4], r[0]) for r in rows],
+            )
+            n_inherit = len(rows)
+        conn.execute(
+            "INSERT INTO imports SELECT caller_module, callee_module, edge_count FROM module_edges "
+            "WHERE caller_module != callee_module AND callee_module != '__external__'"
+        )
+
+    conn.executescript(_INDEXES)
+    conn.commit()
+    conn.close()
+    return {
+        "nodes": n, "external": n_ext, "edges": int(len(src)),
+        "modules": len(g["module_names"]), "module_edges": int(len(pair)),
+        "inheritance": n_inherit,
+    }
+
+
+def generate(path: Path, spec: GraphSpec, features: bool = False) -> dict:
+    """build_graph + write_db (+ enrich.py when features=True); returns counts."""
+    info = write_db(path, build_graph(spec))
+    if features:
+        from enrich import enrich
+
+        info["enriched"] = str(enrich(Path(path), verbose=False))
+    return info
+
+
+def mutate(src_path: Path, dst_path: Path, fraction: float = 0.02, seed: int = 1) -> dict:
+    """
+    Copy a DB as the "next snapshot": of the internal symbols, `fraction`
+    each get a new body (content hash), move to another module, are renamed,
+    are removed, and new ones are added.  module_edges are left as they were.
+    """
+    import shutil
+
+    shutil.copyfile(src_path, dst_path)
+    rng  = np.random.default_rng(seed)
+    conn = sqlite3.connect(dst_path)
+    rows = conn.execute(
+        "SELECT rowid, hash, name, module FROM nodes WHERE hash NOT LIKE 'ext:%'"
+    ).fetchall()
+    modules = sorted({r[3] for r in rows})
+    picks = rng.permutation(len(rows))
+    k = int(len(rows) * fraction)
+    modified, moved, renamed, removed = (picks[i * k:(i + 1) * k] for i in range(4))
+
+    def rehash(old: str) -> str:
+        return f"{old.split(':', 1)[0]}:{rng.integers(0, 1 << 63):016x}"
+
+    updates = []
+    for i in modified.tolist():
+        updates.append((rehash(rows[i][1]), rows[i][2], rows[i][3], rows[i][1]))
+    for i in moved.tolist():
+        module = modules[int(rng.integers(0, len(modules)))]
+        updates.append((f"{zlib.crc32(module.encode()):08x}:{rows[i][1].split(':', 1)[1]}",
+                        rows[i][2], module, rows[i][1]))
+    for i in renamed.tolist():
+        updates.append((rows[i][1], rows[i][2] + "_v2", rows[i][3], rows[i][1]))
+    conn.executescript("PRAGMA foreign_keys = OFF;")
+    for new_hash, name, module, old_hash in updates:
+        conn.execute("UPDATE nodes SET hash = ?, name = ?, module = ? WHERE hash = ?",
+                     (new_hash, name, module, old_hash))
+        if new_hash != old_hash:
+            conn.execute("UPDATE edges SET caller_hash = ? WHERE caller_hash = ?", (new_hash, old_hash))
+            conn.execute("UPDATE edges SET callee_hash = ? WHERE callee_hash = ?", (new_hash, old_hash))
+    gone = [rows[i][1] for i in removed.tolist()]
+    conn.executemany("DELETE FROM nodes WHERE hash = ?", ((h,) for h in gone))
+    conn.executemany("DELETE FROM edges WHERE caller_hash = ? OR callee_hash = ?", ((h, h) for h in gone))
+    added = [
+        (f"{zlib.crc32(modules[j].encode()):08x}:{rng.integers(0, 1 << 63):016x}",
+         f"new_symbol_{i}", "function", modules[j], f"src/{modules[j]}/new.py", i * 10 + 1, i * 10 + 8)
+        for i, j in enumerate(rng.integers(0, len(modules), k).tolist())
+    ]
+    conn.executemany(
+        "INSERT INTO nodes (hash, name, kind, module, file_path, line_start, line_end) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)", added,
+    )
+    conn.execute("UPDATE schema_info SET value = datetime('now', '+1 second') WHERE key = 'created_at'")
+    conn.commit()
+    conn.close()
+    return {"modified": k, "moved": k, "renamed": k, "removed": k, "added": k}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("out", help="DB path to write")
+    parser.add_argument("--nodes",       type=int,   default=GraphSpec.nodes)
+    parser.add_argument("--modules",     type=int,   default=GraphSpec.modules)
+    parser.add_argument("--degree",      choices=("powerlaw", "poisson"), default=GraphSpec.degree)
+    parser.add_argument("--avg-degree",  type=float, default=GraphSpec.avg_degree)
+    parser.add_argument("--cycles",      type=float, default=GraphSpec.cycles)
+    parser.add_argument("--communities", type=int,   default=GraphSpec.communities)
+    parser.add_argument("--locality",    type=float, default=GraphSpec.locality)
+    parser.add_argument("--mixing",      type=float, default=GraphSpec.mixing)
+    parser.add_argument("--inheritance", action="store_true")
+    parser.add_argument("--features",    action="store_true", help="also run enrich.py (node_features)")
+    parser.add_argument("--seed",        type=int,   default=GraphSpec.seed)
+    args = parser.parse_args()
+
+    spec = GraphSpec(
+        nodes=args.nodes, modules=args.modules, degree=args.degree, avg_degree=args.avg_degree,
+        cycles=args.cycles, communities=args.communities, locality=args.locality,
+        mixing=args.mixing, inheritance=args.inheritance, seed=args.seed,
+    )
+    t0 = time.perf_counter()
+    info = generate(Path(args.out), spec, features=args.features)
+    print(f"{args.out}: {info}  ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -65,7 +65,7 @@ export const api = {
     post(`/diff-graph?max_context=${maxContext}`, { repo_a: repoA, repo_b: repoB }),
   diffBuilding: (repoA, repoB) =>
     post("/diff-building", { repo_a: repoA, repo_b: repoB }),
-  // Lightweight: just {status_map: {"module::name": "added"|"removed"|"modified"}}
+  // Lightweight: {status_map: {"module::name": "added"|"removed"|"modified"}, moves: [{from, to, kind}]}
   diffStatus: (repoId, compareTo) =>
     get(`/repos/${encodeURIComponent(repoId)}/diff-status?compare_to=${encodeURIComponent(compareTo)}`),
   patterns: (repoId, minConfidence = 0.60) =>
@@ -527,6 +527,13 @@ export default function BuildingPage() {
               <div style={{ fontSize: 12, color: "var(--text2)", lineHeight: 1.9, marginBottom: 12 }}>
                 <div><strong>Module:</strong> {selectedNode.module}</div>
                 <div><strong>Layer:</strong> {LAYER_COLORS[selectedNode.layer ?? 4]?.label}</div>
+                {selectedNode.module_layer != null && (
+                  <div><strong>Module layer:</strong> {selectedNode.module_layer}
+                    {selectedNode.module_in_cycle && (
+                      <span style={{ color: "var(--red)" }}> (module cycle)</span>
+                    )}
+                  </div>
+                )}
                 <div><strong>Callers:</strong> {selectedNode.caller_count}</div>
                 <div><strong>Called by modules:</strong>{" "}
                   <span style={{ color: selectedNode.calling_module_count >= 5 ? "var(--red)" : "var(--text)" }}>
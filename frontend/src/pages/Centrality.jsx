@@ -27,7 +27,7 @@ export default function Centrality() {
         <h1>⭐ Centrality — High-Risk Nodes</h1>
         <p>
           The most central nodes in the call graph — everything flows through them. Changes here
-          have the widest blast radius. Scored by in-degree (proxy for betweenness centrality).
+          have the widest blast radius. Scored by betweenness centrality (adaptively sampled on large repos).
         </p>
       </div>
 
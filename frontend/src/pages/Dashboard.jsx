@@ -64,10 +64,12 @@ export default function Dashboard() {
           <div className="stat-value" style={{ color: "var(--yellow)" }}>{o.dead_symbol_estimate.toLocaleString()}</div>
           <div className="stat-label">Unreachable symbols</div>
         </div>
-        <div className="stat-card">
-          <div className="stat-value" style={{ color: "var(--red)" }}>{o.cycle_candidates.toLocaleString()}</div>
-          <div className="stat-label">Cycle candidates</div>
-        </div>
+        {o.cycles && (
+          <div className="stat-card">
+            <div className="stat-value" style={{ color: "var(--red)" }}>{o.cycles.count.toLocaleString()}</div>
+            <div className="stat-label" title={`${o.cycles.nodes.toLocaleString()} symbols in cycles, largest ${o.cycles.largest}`}>Call cycles (SCCs)</div>
+          </div>
+        )}
       </div>
 
       {/* Triage — top issues */}
@@ -8,6 +8,8 @@ const DIFF_NODE_COLORS = {
   added:    "#3fb950",
   removed:  "#f85149",
   modified: "#e3b341",
+  moved:    "#58a6ff",
+  renamed:  "#bc8cff",
   context:  "#3d4450",
 };
 const DIFF_EDGE_COLORS = {
@@ -354,6 +356,8 @@ export default function Diff() {
                         { color: DIFF_NODE_COLORS.added,    key: "added",    label: `Added (${diffRenderData.stats.added ?? 0})` },
                         { color: DIFF_NODE_COLORS.removed,  key: "removed",  label: `Removed (${diffRenderData.stats.removed ?? 0})` },
                         { color: DIFF_NODE_COLORS.modified, key: "modified", label: `Modified (${diffRenderData.stats.modified ?? 0})` },
+                        { color: DIFF_NODE_COLORS.moved,    key: "moved",    label: `Moved (${diffRenderData.stats.moved ?? 0})` },
+                        { color: DIFF_NODE_COLORS.renamed,  key: "renamed",  label: `Renamed (${diffRenderData.stats.renamed ?? 0})` },
                         { color: DIFF_NODE_COLORS.context,  key: "context",  label: `Context (${diffRenderData.stats.context ?? 0})` },
                       ].filter(item => {
                         const m = item.label.match(/\((\d+)\)/);
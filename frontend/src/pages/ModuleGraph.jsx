@@ -353,6 +353,15 @@ export default function ModuleGraph() {
               </div>
               <div className="stat-label">Avg instability</div>
             </div>
+            {data?.layering && (
+              <div className="stat-card">
+                <div className="stat-value"
+                  style={{ color: data.layering.back_edges ? "var(--yellow)" : "var(--green)" }}>
+                  {data.layering.layers}
+                </div>
+                <div className="stat-label">Layers · {data.layering.back_edges} back-edges</div>
+              </div>
+            )}
             {mostCoupled && (
               <div className="stat-card">
                 <div className="stat-value" style={{ fontSize: 14, color: "var(--yellow)", fontFamily: "monospace" }}>
@@ -397,6 +406,11 @@ export default function ModuleGraph() {
                     <div><strong>Symbols:</strong> {selectedNode.symbol_count}</div>
                     <div><strong>Sub-modules:</strong> {selectedNode.submodule_count}</div>
                     <div><strong>Intra calls:</strong> {selectedNode.intra_calls}</div>
+                    <div><strong>Layer:</strong> {selectedNode.layer}
+                      {selectedNode.in_cycle && (
+                        <span style={{ color: "var(--red)" }}> (in module cycle, {selectedNode.back_edges} back-edges)</span>
+                      )}
+                    </div>
                     <div><strong>Afferent (Ca):</strong>{" "}
                       <span style={{ color: "var(--green)" }}>{selectedNode.afferent}</span>
                     </div>
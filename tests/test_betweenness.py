@@ -0,0 +1,107 @@
+"""
+Tests for analytics/betweenness.py — batched Brandes with adaptive source
+sampling.
+"""
+import sys
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from analytics.betweenness import betweenness
+from analytics.centrality import compute_centrality
+from analytics.csr_graph import CSRGraph
+from db import _open_readonly
+from queries.core import fetch_call_graph
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+FIXTURES = sorted(p for p in DATA_DIR.glob("taskboard-*@HEAD.db") if ".enriched" not in p.name)
+
+
+def make_graph(edges, n):
+    nodes = [{"hash": f"n{i}", "module": "m"} for i in range(n)]
+    src, dst = zip(*edges)
+    return CSRGraph(nodes, np.array(src), np.array(dst), np.ones(len(edges), dtype=np.int64))
+
+
+def random_graph(n=400, m=1600, seed=1):
+    rng = np.random.default_rng(seed)
+    return make_graph(list(zip(rng.integers(0, n, m), rng.integers(0, n, m))), n)
+
+
+def nx_scores(graph):
+    ref = nx.betweenness_centrality(graph.to_networkx(), normalized=True)
+    return np.array([ref[h] for h in graph.hashes])
+
+
+class TestExact:
+    def test_diamond_splits_paths(self):
+        # 0 → {1, 2} → 3: each middle node carries half of the 0→3 paths
+        graph = make_graph([(0, 1), (0, 2), (1, 3), (2, 3)], 4)
+        scores, info = betweenness(graph, epsilon=0)
+        assert info["exact"] and info["error_bound"] == 0
+        assert np.allclose(scores, nx_scores(graph))
+        assert scores[1] == scores[2] > 0
+
+    def test_random_graph_matches_networkx(self):
+        graph = random_graph()
+        assert np.allclose(betweenness(graph, epsilon=0)[0], nx_scores(graph), atol=1e-12)
+
+    @pytest.mark.parametrize("db", FIXTURES, ids=lambda p: p.stem)
+    def test_fixtures_match_networkx(self, db):
+        conn = _open_readonly(db)
+        graph = fetch_call_graph(conn)
+        conn.close()
+        assert np.allclose(betweenness(graph, epsilon=0)[0], nx_scores(graph), atol=1e-12)
+
+    def test_pool_matches_in_process(self):
+        graph = random_graph()
+        single, _ = betweenness(graph, epsilon=0, workers=1)
+        pooled, _ = betweenness(graph, epsilon=0, workers=2)
+        assert np.allclose(single, pooled)
+
+
+class TestSampling:
+    def test_error_within_reported_bound(self):
+        graph = random_graph(n=1500, m=4500)
+        exact = nx_scores(graph)
+        scores, info = betweenness(graph, epsilon=0.05)
+        assert info["converged"] and not info["exact"]
+        assert info["samples"] < graph.n_nodes
+        assert np.abs(scores - exact).max() <= info["error_bound"]
+
+    def test_ranking_converges_to_exact_top_k(self):
+        # Stability stops well before the Bonferroni bound reaches epsilon
+        graph = random_graph(n=1500, m=4500)
+        exact = nx_scores(graph)
+        scores, info = betweenness(graph, epsilon=0.05, top_k=30)
+        assert info["converged"] and info["error_bound"] > 0.05 * np.sort(exact)[-30]
+        top = set(np.argsort(-scores)[:30]) & set(np.argsort(-exact)[:30])
+        assert len(top) >= 25
+
+    def test_seeded_runs_are_identical(self):
+        graph = random_graph(n=1500, m=4500)
+        a, _ = betweenness(graph, epsilon=0.05, seed=7)
+        b, _ = betweenness(graph, epsilon=0.05, seed=7)
+        assert np.array_equal(a, b)
+
+    def test_time_budget_stops_sampling(self):
+        graph = random_graph(n=1500, m=4500)
+        _, info = betweenness(graph, epsilon=1e-9, time_budget_ms=0)
+        assert not info["converged"]
+        assert info["samples"] < graph.n_nodes
+
+    def test_max_samples_caps_sources(self):
+        graph = random_graph(n=1500, m=4500)
+        _, info = betweenness(graph, epsilon=0, max_samples=100)
+        assert 100 <= info["samples"] < 100 + 64
+        assert not info["exact"] and not info["converged"]
+
+
+def test_compute_centrality_reports_estimate():
+    nodes, info = compute_centrality(random_graph(), top_n=5)
+    assert len(nodes) == 5 and info["exact"]
+    assert [n["centrality"] for n in nodes] == sorted((n["centrality"] for n in nodes), reverse=True)
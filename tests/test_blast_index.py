@@ -0,0 +1,83 @@
+"""
+Tests for queries/blast_index.py — the indexed blast radius must return
+exactly what the per-request BFS (analytics.centrality) returns.
+"""
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from analytics.centrality import compute_blast_radius
+from queries.blast_index import (
+    fetch_blast_index_status, fetch_blast_radius, has_blast_index, write_blast_index,
+)
+from queries.core import fetch_call_graph
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture(scope="module")
+def indexed(tmp_path_factory):
+    raw = DATA_DIR / "taskboard-antipattern-circular-deps@HEAD.db"
+    if not raw.exists():
+        pytest.skip(f"Fixture DB not found: {raw}")
+    path = shutil.copy2(raw, tmp_path_factory.mktemp("blast"))
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    graph = fetch_call_graph(conn)
+    write_blast_index(conn, graph)
+    yield conn, graph
+    conn.close()
+
+
+def normalise(result):
+    result = dict(result)
+    result["modules_affected"] = sorted(result["modules_affected"])
+    return result
+
+
+@pytest.mark.parametrize("max_depth", [1, 3, 10])
+def test_matches_bfs_for_every_node(indexed, max_depth):
+    conn, graph = indexed
+    assert has_blast_index(conn)
+    for h in graph.hashes:
+        expected = compute_blast_radius(h, graph, max_depth)
+        assert normalise(fetch_blast_radius(conn, h, max_depth)) == normalise(expected)
+
+
+def test_unknown_and_external_nodes(indexed):
+    conn, _ = indexed
+    assert fetch_blast_radius(conn, "no-such-hash") is None
+    ext = conn.execute("SELECT hash FROM nodes WHERE hash LIKE 'ext:%' LIMIT 1").fetchone()
+    if ext:
+        assert fetch_blast_radius(conn, ext["hash"]) is None
+
+
+def test_status_records_built_index(indexed):
+    conn, _ = indexed
+    status = fetch_blast_index_status(conn)
+    assert status["built"] and 0 < status["pairs"] <= status["max_pairs"]
+
+
+def test_skipped_over_pair_budget(tmp_path):
+    raw = DATA_DIR / "taskboard-antipattern-circular-deps@HEAD.db"
+    if not raw.exists():
+        pytest.skip(f"Fixture DB not found: {raw}")
+    conn = sqlite3.connect(shutil.copy2(raw, tmp_path))
+    conn.row_factory = sqlite3.Row
+    graph = fetch_call_graph(conn)
+    assert write_blast_index(conn, graph) is not None
+    assert has_blast_index(conn)
+
+    # A rebuild over budget drops the stale index and records the skip
+    assert write_blast_index(conn, graph, max_pairs=10) is None
+    assert not has_blast_index(conn)
+    status = fetch_blast_index_status(conn)
+    assert not status["built"]
+    assert status["max_pairs"] == 10 and status["pairs"] > 10
+    conn.close()
+
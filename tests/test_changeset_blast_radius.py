@@ -0,0 +1,135 @@
+"""
+Tests for the changeset blast radius (POST /blast-radius) — the union over
+seeds must agree with the single-node BFS, with per-seed attribution.
+"""
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from analytics.centrality import (
+    changeset_seeds, compute_blast_radius, compute_changeset_blast_radius,
+    iter_changeset_blast_radius,
+)
+from analytics.csr_graph import CSRGraph
+from queries.core import fetch_call_graph
+from routers.centrality import _ndjson
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def make_graph(edges, modules=None):
+    """edges: (caller, callee) pairs; hashes are 'm:<name>' so content hash = name."""
+    names = sorted({h for e in edges for h in e})
+    modules = modules or {}
+    nodes = [{"hash": f"m:{h}", "name": h, "module": modules.get(h, "mod")} for h in names]
+    return CSRGraph.from_rows(nodes, [(f"m:{a}", f"m:{b}", 1) for a, b in edges])
+
+
+@pytest.fixture(scope="module")
+def real_graph():
+    path = DATA_DIR / "taskboard-antipattern-circular-deps@HEAD.db"
+    if not path.exists():
+        pytest.skip(f"Fixture DB not found: {path}")
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    graph = fetch_call_graph(conn)
+    conn.close()
+    return graph
+
+
+def test_union_matches_single_node_bfs(real_graph):
+    seeds = real_graph.hashes[::7][:12]
+    result = compute_changeset_blast_radius(seeds, real_graph, 4)
+
+    nearest: dict[str, int] = {}
+    reached_by: dict[str, set[int]] = {}
+    for pos, h in enumerate(seeds):
+        for n in compute_blast_radius(h, real_graph, 4)["affected_nodes"]:
+            if n["hash"] in seeds:
+                continue
+            nearest[n["hash"]] = min(n["depth"], nearest.get(n["hash"], 99))
+            reached_by.setdefault(n["hash"], set()).add(pos)
+
+    got = {n["hash"]: n for n in result["affected_nodes"]}
+    assert {h: n["depth"] for h, n in got.items()} == nearest
+    assert {h: set(n["seeds"]) for h, n in got.items()} == reached_by
+    assert sum(result["depth_counts"]) == result["affected_count"] == len(nearest)
+    assert sum(m["count"] for m in result["modules_affected"]) == result["affected_count"]
+
+
+def test_attribution_and_depth_counts():
+    # a → b → c ← d,  e → d: changing c and d
+    graph = make_graph(
+        [("a", "b"), ("b", "c"), ("d", "c"), ("e", "d")],
+        modules={"a": "top", "e": "top"},
+    )
+    result = compute_changeset_blast_radius(["m:c", "m:d", "m:nope"], graph, 5)
+
+    assert [s["hash"] for s in result["seeds"]] == ["m:c", "m:d"]
+    assert [s["affected_count"] for s in result["seeds"]] == [3, 1]
+    assert result["unknown_seeds"] == ["m:nope"]
+    by_hash = {n["hash"]: (n["depth"], n["seeds"]) for n in result["affected_nodes"]}
+    assert by_hash == {"m:b": (1, [0]), "m:e": (1, [0, 1]), "m:a": (2, [0])}
+    assert result["depth_counts"] == [2, 1, 0, 0, 0]
+    assert result["modules_affected"] == [
+        {"module": "top", "count": 2}, {"module": "mod", "count": 1},
+    ]
+
+
+def test_changeset_seeds_by_content_hash():
+    base  = make_graph([("a", "b"), ("b", "c")])
+    nodes = [
+        {"hash": "moved:a", "name": "a"},    # same content, new module hash
+        {"hash": "m:b2",    "name": "b"},    # body changed
+        {"hash": "m:c",     "name": "c"},
+        {"hash": "m:new",   "name": "new"},
+    ]
+    head = CSRGraph.from_rows(nodes, [])
+    assert changeset_seeds(head, base) == ["m:b2", "m:new"]
+
+
+def test_ndjson_stream_shape():
+    # 1200 direct callers of t, one caller above each of the first 10
+    edges = [(f"x{i}", "t") for i in range(1200)] + [(f"y{i}", f"x{i}") for i in range(10)]
+    graph = make_graph(edges)
+    chunks = list(_ndjson(iter_changeset_blast_radius(["m:t"], graph, 3)))
+    lines = [json.loads(l) for c in chunks for l in c.splitlines()]
+    types = [l["type"] for l in lines]
+
+    # seeds, level 1 in 500-node chunks, level 2, attribution chunks, summary
+    assert len(chunks) == 1 + 3 + 1 + 3 + 1
+    assert types == ["seeds"] + ["node"] * 1210 + ["attribution"] * 1210 + ["summary"]
+    assert lines[0]["seeds"][0]["hash"] == "m:t" and lines[0]["attributed_seeds"] == 1
+    assert [l["depth"] for l in lines[1:1211]] == [1] * 1200 + [2] * 10
+    assert all(l["seeds"] == [0] for l in lines[1211:1211 + 1210])
+    assert lines[-1]["affected_count"] == 1210
+    assert lines[-1]["depth_counts"] == [1200, 10, 0]
+    assert lines[-1]["seed_counts"] == [1210]
+
+
+def test_attribution_past_seed_cap(monkeypatch):
+    import analytics.centrality as centrality
+
+    monkeypatch.setattr(centrality, "MAX_ATTRIBUTED_SEEDS", 1)
+    graph = make_graph([("a", "c"), ("b", "d"), ("e", "a"), ("e", "b")])
+    result = compute_changeset_blast_radius(["m:c", "m:d"], graph, 5)
+
+    assert result["attributed_seeds"] == 1
+    assert [s["affected_count"] for s in result["seeds"]] == [2, None]
+    by_hash = {n["hash"]: (n["depth"], n["seeds"]) for n in result["affected_nodes"]}
+    assert by_hash == {"m:a": (1, [0]), "m:b": (1, []), "m:e": (2, [0])}
+
+
+def test_many_seeds_match_single_node_bfs(real_graph):
+    # Several bitset words: every node is a seed except a handful
+    seeds = [h for i, h in enumerate(real_graph.hashes) if i % 11]
+    result = compute_changeset_blast_radius(seeds, real_graph, 3)
+    for pos in range(0, len(seeds), 17):
+        single = compute_blast_radius(seeds[pos], real_graph, 3)
+        expected = sum(1 for n in single["affected_nodes"] if n["hash"] not in set(seeds))
+        assert result["seeds"][pos]["affected_count"] == expected
@@ -0,0 +1,96 @@
+"""
+Tests for the containing-class index: the pure sweep in
+analytics/class_index.py and the node_class table behind the explore
+"class" dimension.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from analytics.class_index import containing_classes
+from queries.explore import ensure_node_class, fetch_graph_edges, fetch_pivot
+
+
+def as_map(rows):
+    return {h: name for h, name, _ in containing_classes(rows)}
+
+
+class TestContainingClasses:
+    def test_members_and_top_level(self):
+        rows = [
+            ("C", "Cls",    "a.py", 1,  20, "class"),
+            ("m", "method", "a.py", 2,  5,  "method"),
+            ("f", "func",   "a.py", 30, 40, "function"),
+        ]
+        assert as_map(rows) == {"C": "Cls", "m": "Cls"}
+
+    def test_innermost_class_wins(self):
+        rows = [
+            ("O", "Outer", "a.py", 1,  50, "class"),
+            ("I", "Inner", "a.py", 10, 20, "class"),
+            ("x", "x",     "a.py", 12, 14, "method"),
+            ("y", "y",     "a.py", 30, 35, "method"),
+        ]
+        assert as_map(rows) == {"O": "Outer", "I": "Inner", "x": "Inner", "y": "Outer"}
+
+    def test_files_are_independent(self):
+        rows = [
+            ("C", "Cls", "a.py", 1, 20, "class"),
+            ("m", "m",   "b.py", 2, 5,  "method"),
+        ]
+        assert as_map(rows) == {"C": "Cls"}
+
+    def test_partial_overlap_is_not_containment(self):
+        rows = [
+            ("C", "Cls", "a.py", 1,  10, "class"),
+            ("m", "m",   "a.py", 5,  15, "method"),
+        ]
+        assert as_map(rows) == {"C": "Cls"}
+
+    def test_missing_lines_skipped(self):
+        rows = [
+            ("C", "Cls", "a.py", None, 10, "class"),
+            ("m", "m",   None,   2,    5,  "method"),
+        ]
+        assert as_map(rows) == {}
+
+
+def make_conn(read_only: bool = False) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE nodes (hash TEXT, name TEXT, module TEXT, file_path TEXT,
+                            line_start INTEGER, line_end INTEGER, kind TEXT,
+                            risk TEXT, caller_count INTEGER, callee_count INTEGER);
+        CREATE TABLE edges (caller_hash TEXT, callee_hash TEXT, call_count INTEGER);
+        INSERT INTO nodes VALUES
+          ('C', 'Cls',  'm', 'a.py', 1,  20, 'class',    'low', 0, 1),
+          ('a', 'meth', 'm', 'a.py', 2,  5,  'method',   'low', 1, 1),
+          ('f', 'func', 'm', 'a.py', 30, 40, 'function', 'low', 1, 0);
+        INSERT INTO edges VALUES ('a', 'f', 1);
+    """)
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+class TestNodeClassTable:
+    def test_class_pivot(self):
+        result = fetch_pivot(make_conn(), ["class"], ["symbol_count"])
+        counts = {r["key"]["class"]: r["values"]["symbol_count"] for r in result["rows"]}
+        assert counts == {"Cls": 2, "(top-level)": 1}
+
+    def test_class_graph_edges(self):
+        edges = fetch_graph_edges(make_conn(), "class")
+        assert [(e["source"], e["target"]) for e in edges] == [("Cls", "(top-level)")]
+
+    def test_built_as_temp_table_on_read_only_handle(self):
+        conn = make_conn(read_only=True)
+        ensure_node_class(conn)
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert conn.execute(
+            "SELECT name FROM sqlite_temp_master WHERE name = 'node_class'"
+        ).fetchone() is not None
+        assert conn.execute("SELECT COUNT(*) FROM node_class").fetchone()[0] == 2
@@ -0,0 +1,88 @@
+"""
+Unit tests for analytics/csr_graph.py — the shared in-memory CSR call graph.
+
+All graphs are synthetic; no DB files required.
+"""
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pytest
+from backend.analytics.csr_graph import CSRGraph
+
+
+def make_graph(edges, n=None, module="mod"):
+    """edges: list of (caller, callee[, call_count]) using short string hashes."""
+    names = sorted({h for e in edges for h in e[:2]}) if n is None else [f"n{i}" for i in range(n)]
+    nodes = [{"hash": h, "name": h, "module": module} for h in names]
+    rows  = [(e[0], e[1], e[2] if len(e) > 2 else 1) for e in edges]
+    return CSRGraph.from_rows(nodes, rows)
+
+
+class TestConstruction:
+    def test_empty(self):
+        g = CSRGraph.from_rows([], [])
+        assert g.n_nodes == 0 and g.n_edges == 0
+        assert list(g.out_offsets) == [0]
+
+    def test_forward_and_reverse_agree(self):
+        g = make_graph([("a", "b"), ("a", "c"), ("b", "c")])
+        a, b, c = (g.index_of(h) for h in "abc")
+        assert sorted(g.successors(a).tolist()) == [b, c]
+        assert sorted(g.predecessors(c).tolist()) == [a, b]
+        assert g.in_degree().tolist() == [0, 1, 2]
+        assert g.out_degree().tolist() == [2, 1, 0]
+
+    def test_parallel_rows_collapse(self):
+        g = make_graph([("a", "b", 2), ("a", "b", 3)])
+        assert g.n_edges == 1
+        assert g.out_weights.tolist() == [5]
+        assert g.out_rows.tolist() == [2]
+
+    def test_unknown_endpoints_dropped(self):
+        nodes = [{"hash": "a", "module": "m"}, {"hash": "b", "module": "m"}]
+        g = CSRGraph.from_rows(nodes, [("a", "b", 1), ("a", "ext:x", 1), ("ghost", "b", 1)])
+        assert g.n_edges == 1
+
+    def test_accepts_edge_dicts(self):
+        nodes = [{"hash": "a", "module": "m"}, {"hash": "b", "module": "m"}]
+        g = CSRGraph.from_rows(nodes, [{"caller_hash": "a", "callee_hash": "b", "call_count": 4}])
+        assert g.out_weights.tolist() == [4]
+
+    def test_module_ids(self):
+        nodes = [{"hash": "a", "module": "x"}, {"hash": "b", "module": "y"}, {"hash": "c", "module": "x"}]
+        g = CSRGraph.from_rows(nodes, [])
+        assert [g.modules[m] for m in g.module_ids] == ["x", "y", "x"]
+
+
+class TestTraversal:
+    def test_bfs_upstream_depths(self):
+        # d → c → b → a   (a is the target; callers are upstream)
+        g = make_graph([("b", "a"), ("c", "b"), ("d", "c")])
+        depth = g.bfs_depths([g.index_of("a")], max_depth=2, reverse=True)
+        by_hash = dict(zip(g.hashes, depth.tolist()))
+        assert by_hash == {"a": 0, "b": 1, "c": 2, "d": -1}
+
+    def test_bfs_handles_cycles(self):
+        g = make_graph([("a", "b"), ("b", "a"), ("b", "c")])
+        depth = g.bfs_depths([g.index_of("a")], max_depth=10)
+        assert sorted(depth.tolist()) == [0, 1, 2]
+
+    def test_gather_concatenates_slices(self):
+        g = make_graph([("a", "b"), ("a", "c"), ("b", "c")])
+        got = g.gather(np.array([g.index_of("a"), g.index_of("b")]))
+        assert sorted(got.tolist()) == sorted([g.index_of("b"), g.index_of("c"), g.index_of("c")])
+
+
+class TestNetworkxViews:
+    def test_directed_view_is_cached_and_frozen(self):
+        g = make_graph([("a", "b", 7)])
+        G = g.to_networkx()
+        assert G is g.to_networkx()
+        assert G["a"]["b"]["call_count"] == 7
+        with pytest.raises(Exception):
+            G.add_edge("b", "a")
+
+    def test_undirected_weight_counts_rows_both_directions(self):
+        g = make_graph([("a", "b"), ("a", "b"), ("b", "a")])
+        assert g.to_undirected_weighted()["a"]["b"]["weight"] == 3
@@ -0,0 +1,105 @@
+"""
+Unit tests for the pooled read-only connections in backend/db.py.
+
+Each test builds a throwaway repo DB under tmp_path; no fixture DBs required.
+"""
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import db
+from db import ConnectionPool
+
+
+def write_repo(data_dir: Path, repo_id: str, n_nodes: int = 3) -> Path:
+    path = data_dir / f"{repo_id}.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE nodes (hash TEXT, file_path TEXT, complexity INTEGER)")
+    conn.executemany(
+        "INSERT INTO nodes VALUES (?, ?, ?)",
+        [(f"h{i}", f"pkg/sub/f{i}.py", i) for i in range(n_nodes)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DATA_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    p = ConnectionPool(max_idle=2)
+    monkeypatch.setattr(db, "pool", p)
+    yield p
+    p.close_all()
+
+
+def test_handles_are_reused(data_dir, pool):
+    write_repo(data_dir, "r")
+    with db.open_db("r") as c1:
+        pass
+    with db.open_db("r") as c2:
+        pass
+    assert c1 is c2
+    assert pool.stats() == {"idle": {"r": 1}, "opened": 1, "reused": 1}
+
+
+def test_concurrent_checkouts_get_distinct_handles(data_dir, pool):
+    write_repo(data_dir, "r")
+    with db.open_db("r") as c1, db.open_db("r") as c2, db.open_db("r") as c3:
+        assert len({id(c1), id(c2), id(c3)}) == 3
+    # max_idle=2 — the third handle is closed on release
+    assert pool.stats()["idle"] == {"r": 2}
+
+
+def test_handles_are_read_only(data_dir, pool):
+    write_repo(data_dir, "r")
+    with db.open_db("r") as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM nodes")
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+
+
+@pytest.mark.parametrize("dirname", ["has#hash", "has%20pct", "sp ace?q"])
+def test_readonly_path_with_uri_characters(tmp_path, dirname):
+    (tmp_path / dirname).mkdir()
+    path = write_repo(tmp_path / dirname, "r")
+    conn = db._open_readonly(path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 3
+    finally:
+        conn.close()
+
+
+def test_custom_functions_registered(data_dir, pool):
+    write_repo(data_dir, "r")
+    with db.open_db("r") as conn:
+        row = conn.execute(
+            "SELECT dirname(file_path), dirdir(file_path), stddev_pop(complexity) FROM nodes"
+        ).fetchone()
+    assert row[0] == "pkg/sub"
+    assert row[1] == "pkg/sub"
+    assert row[2] == pytest.approx(0.8165, abs=1e-4)
+
+
+def test_replaced_db_drops_stale_handles(data_dir, pool):
+    path = write_repo(data_dir, "r", n_nodes=3)
+    with db.open_db("r") as old:
+        assert old.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 3
+
+    tmp = write_repo(data_dir, "r.tmp", n_nodes=5)
+    os.replace(tmp, path)
+
+    with db.open_db("r") as new:
+        assert new is not old
+        assert new.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 5
@@ -6,6 +6,7 @@ Tests cover:
   - compute_diff_status_map: added / removed / modified / unchanged node detection
   - compute_diff: summary statistics
   - compute_diff_graph: structural subgraph output shape
+  - match_moves: exact-content and similarity move / rename pairing
 """
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -16,6 +17,7 @@ from backend.analytics.diff import (
     compute_diff_status_map,
     compute_diff,
     compute_diff_graph,
+    match_moves,
 )
 
 
@@ -32,6 +34,13 @@ def make_node(name, module, content="abc123", module_hash="mod99"):
     }
 
 
+def shaped(name, module, content, lines=(10, 30), complexity=4, file_path=None):
+    n = make_node(name, module, content=content, module_hash=module)
+    n.update(line_start=lines[0], line_end=lines[1], complexity=complexity,
+             file_path=file_path or f"src/{module}/{name}.py")
+    return n
+
+
 def make_edge(caller_hash, callee_hash, call_count=1):
     return {"caller_hash": caller_hash, "callee_hash": callee_hash,
             "call_count": call_count}
@@ -249,3 +258,65 @@ class TestComputeDiffGraph:
             assert key in result
         for key in ("added", "removed", "modified", "context"):
             assert key in result["stats"]
+
+
+# ── match_moves ────────────────────────────────────────────────────────────────
+
+class TestMatchMoves:
+    def test_exact_content_move_and_rename(self):
+        a = [make_node("fn", "mod_a", content="c1"), make_node("old", "mod_a", content="c2")]
+        b = [make_node("fn", "mod_b", content="c1"), make_node("new", "mod_a", content="c2")]
+        moves = sorted(match_moves(a, b), key=lambda m: m["from"])
+        assert moves == [
+            {"from": "mod_a::fn",  "to": "mod_b::fn",  "kind": "moved",   "exact": True, "similarity": 1.0},
+            {"from": "mod_a::old", "to": "mod_a::new", "kind": "renamed", "exact": True, "similarity": 1.0},
+        ]
+
+    def test_shared_content_hash_not_paired(self):
+        # "abc123" also belongs to an unchanged node, so the hash is ambiguous
+        a = [make_node("fn_a", "m"), make_node("fn_b", "m")]
+        b = [make_node("fn_b", "m"), make_node("fn_c", "m")]
+        assert match_moves(a, b) == []
+
+    def test_similarity_move_when_content_hash_changes(self):
+        a = [shaped("parse", "old_mod", "h1", file_path="src/parse.py")]
+        b = [shaped("parse", "new_mod", "h2", lines=(40, 61), file_path="lib/parse.py")]
+        (move,) = match_moves(a, b)
+        assert move["kind"] == "moved" and not move["exact"]
+        assert move["similarity"] >= 0.7
+
+    def test_similarity_rename_within_module(self):
+        a = [shaped("load_user_config", "cfg", "h1", file_path="cfg.py")]
+        b = [shaped("load_config", "cfg", "h2", lines=(10, 31), file_path="cfg.py")]
+        (move,) = match_moves(a, b)
+        assert (move["from"], move["to"], move["kind"]) == ("cfg::load_user_config", "cfg::load_config", "renamed")
+
+    def test_dissimilar_nodes_stay_added_and_removed(self):
+        a = [shaped("parse", "old_mod", "h1", lines=(1, 5), complexity=1)]
+        b = [shaped("parse", "new_mod", "h2", lines=(1, 200), complexity=40)]
+        assert match_moves(a, b) == []
+        # without line ranges there is nothing to compare
+        assert match_moves([make_node("parse", "x", "h1")], [make_node("parse", "y", "h2")]) == []
+
+    def test_compute_diff_reports_moves(self):
+        a = [make_node("fn", "mod_a", content="c1"), make_node("gone", "mod_a", content="c2")]
+        b = [make_node("fn", "mod_b", content="c1")]
+        result = compute_diff(a, b, [], [])
+        assert (result["nodes_added"], result["nodes_removed"]) == (0, 1)
+        assert (result["nodes_moved"], result["nodes_renamed"]) == (1, 0)
+        assert [m["to"] for m in result["moves"]] == ["mod_b::fn"]
+
+    def test_compute_diff_graph_collapses_moves(self):
+        caller = make_node("main", "app", content="m0")
+        old    = make_node("fn", "mod_a", content="c1")
+        new    = make_node("fn", "mod_b", content="c1", module_hash="other")
+        result = compute_diff_graph(
+            [caller, old], [caller, new],
+            [make_edge(caller["hash"], old["hash"])], [make_edge(caller["hash"], new["hash"])],
+        )
+        by_id = {n["id"]: n for n in result["nodes"]}
+        assert "fn::mod_a" not in by_id
+        assert by_id["fn::mod_b"]["status"] == "moved"
+        assert by_id["fn::mod_b"]["from"] == "fn::mod_a"
+        assert result["edges"] == [{"source": "main::app", "target": "fn::mod_b", "status": "unchanged"}]
+        assert (result["stats"]["moved"], result["stats"]["added"], result["stats"]["removed"]) == (1, 0, 0)
@@ -0,0 +1,88 @@
+"""
+Tests for diff_store.py — cached diff snapshots and persisted pair results.
+"""
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from analytics.diff import compute_diff, compute_diff_status_map, match_moves
+from db import DATA_DIR, resolve_db_path
+from diff_store import DiffStore
+from queries.graph import fetch_diff_snapshot
+
+BASE = "taskboard-main@HEAD"
+HEAD = "taskboard-antipattern-god-object@HEAD"
+
+
+@pytest.fixture
+def store(tmp_path):
+    for repo_id in (BASE, HEAD):
+        if not (DATA_DIR / f"{repo_id}.db").exists():
+            pytest.skip(f"Fixture DB not found: {repo_id}")
+    return DiffStore(diffs_dir=tmp_path)
+
+
+def direct_snapshot(repo_id):
+    conn = sqlite3.connect(resolve_db_path(repo_id))
+    conn.row_factory = sqlite3.Row
+    snap = fetch_diff_snapshot(conn)
+    conn.close()
+    return snap
+
+
+def test_snapshot_loaded_once(store):
+    first = store.snapshot(BASE)
+    assert store.snapshot(BASE) is first
+    assert store.stats()["misses"] == 1
+
+
+def test_status_map_matches_and_persists(store, tmp_path):
+    a, b = direct_snapshot(BASE), direct_snapshot(HEAD)
+    expected = compute_diff_status_map(list(a["nodes_by_key"].values()), list(b["nodes_by_key"].values()))
+    assert store.status_map(BASE, HEAD) == expected
+    assert store.status_map(BASE, HEAD) is store.status_map(BASE, HEAD)
+
+    # A fresh process answers from the sidecar without loading either DB
+    restarted = DiffStore(diffs_dir=tmp_path)
+    assert restarted.status_map(BASE, HEAD) == expected
+    assert restarted.stats()["disk_hits"] == 1 and restarted.stats()["misses"] == 0
+
+
+def test_summary_round_trips(store, tmp_path):
+    a, b = direct_snapshot(BASE), direct_snapshot(HEAD)
+    expected = compute_diff(
+        list(a["nodes_by_key"].values()), list(b["nodes_by_key"].values()),
+        a["module_edges"], b["module_edges"],
+    )
+    assert store.summary(BASE, HEAD) == expected
+    assert DiffStore(diffs_dir=tmp_path).summary(BASE, HEAD) == json.loads(json.dumps(expected))
+
+
+def test_stale_sidecar_is_recomputed(store, tmp_path):
+    expected = store.status_map(BASE, HEAD)
+    (path,) = tmp_path.glob("*.status.json")
+    path.write_text(json.dumps({"fingerprints": [["x"], ["y"]], "result": {"bogus": "added"}}))
+
+    restarted = DiffStore(diffs_dir=tmp_path)
+    assert restarted.status_map(BASE, HEAD) == expected
+    assert restarted.stats()["disk_hits"] == 0
+    assert json.loads(path.read_text())["result"] == expected
+
+
+def test_moves_persist_and_old_sidecars_are_ignored(store, tmp_path):
+    a, b = direct_snapshot(BASE), direct_snapshot(HEAD)
+    expected = match_moves(list(a["nodes_by_key"].values()), list(b["nodes_by_key"].values()))
+    assert store.moves(BASE, HEAD) == expected
+
+    # A sidecar from before RESULT_VERSION (same fingerprints) is recomputed
+    (path,) = tmp_path.glob("*.moves.json")
+    doc = json.loads(path.read_text())
+    path.write_text(json.dumps({"fingerprints": doc["fingerprints"], "result": []}))
+    restarted = DiffStore(diffs_dir=tmp_path)
+    assert restarted.moves(BASE, HEAD) == expected
+    assert restarted.stats()["disk_hits"] == 0
@@ -0,0 +1,124 @@
+"""
+Tests for the enrichment step DAG in enrich.py — dependency ordering and
+parity between the in-process and process-pool runs.
+"""
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from enrich import _Step, _run_steps, enrich
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def _const(v):
+    return lambda *deps: (v, *deps)
+
+
+STEPS = (
+    _Step("c", _const("c"), ("a", "b")),
+    _Step("a", _const("a")),
+    _Step("b", _const("b"), ("a",)),
+)
+
+
+def test_dependencies_passed_in_order():
+    results = _run_steps(STEPS, 1, verbose=False)
+    assert results["a"] == ("a",)
+    assert results["b"] == ("b", ("a",))
+    assert results["c"] == ("c", ("a",), ("b", ("a",)))
+
+
+def test_unsatisfiable_dependency_raises():
+    with pytest.raises(ValueError, match="Unsatisfiable"):
+        _run_steps((_Step("x", _const("x"), ("missing",)),), 1, verbose=False)
+
+
+def _features(path: Path) -> list[tuple]:
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT * FROM node_features ORDER BY hash").fetchall()
+    conn.close()
+    return rows
+
+
+def test_parallel_matches_sequential(tmp_path):
+    raw = DATA_DIR / "taskboard-main@HEAD.db"
+    if not raw.exists():
+        pytest.skip(f"Fixture DB not found: {raw}")
+    seq_dir, par_dir = tmp_path / "seq", tmp_path / "par"
+    seq_dir.mkdir()
+    par_dir.mkdir()
+    seq = enrich(Path(shutil.copy2(raw, seq_dir)), verbose=False, workers=1)
+    par = enrich(Path(shutil.copy2(raw, par_dir)), verbose=False, workers=3)
+    assert _features(seq) == _features(par)
+
+
+# ── Incremental (--base) ──────────────────────────────────────────────────────
+
+def _by_hash(path: Path) -> dict[str, dict]:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    rows = {r["hash"]: dict(r) for r in conn.execute("SELECT * FROM node_features")}
+    conn.close()
+    return rows
+
+
+def _mismatched_columns(a: dict[str, dict], b: dict[str, dict]) -> set[str]:
+    assert a.keys() == b.keys()
+    out = set()
+    for h, row in a.items():
+        for col, v in row.items():
+            w = b[h][col]
+            if isinstance(v, float) and isinstance(w, float):
+                if abs(v - w) > 1e-4:         # warm-started power iterations
+                    out.add(col)
+            elif v != w:
+                out.add(col)
+    return out
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    """(base enriched DB, full enrichment of the next snapshot, its raw copy)."""
+    old = DATA_DIR / "taskboard-main@HEAD.db"
+    new = DATA_DIR / "taskboard-antipattern-circular-deps@HEAD.db"
+    if not (old.exists() and new.exists()):
+        pytest.skip("taskboard fixture DBs not found")
+    (tmp_path / "full").mkdir()
+    (tmp_path / "inc").mkdir()
+    base = enrich(Path(shutil.copy2(old, tmp_path)), verbose=False)
+    full = enrich(Path(shutil.copy2(new, tmp_path / "full")), verbose=False)
+    return base, full, Path(shutil.copy2(new, tmp_path / "inc"))
+
+
+def test_incremental_matches_full_above_drift(snapshots):
+    base, full, raw = snapshots
+    inc = enrich(raw, verbose=False, base=base, drift_threshold=0.0)
+    assert _mismatched_columns(_by_hash(full), _by_hash(inc)) == set()
+
+
+def test_incremental_carries_global_signals_below_drift(snapshots):
+    base, full, raw = snapshots
+    inc = enrich(raw, verbose=False, base=base, drift_threshold=1.0)
+    # Local signals are exact; betweenness/communities are carried from base
+    assert _mismatched_columns(_by_hash(full), _by_hash(inc)) <= {
+        "betweenness_centrality", "community_id",
+        "community_dominant_mod", "community_alignment",
+    }
+    prev, rows = _by_hash(base), _by_hash(inc)
+    for h, row in rows.items():
+        if h in prev:
+            assert row["betweenness_centrality"] == prev[h]["betweenness_centrality"]
+
+
+def test_incremental_against_itself_is_a_no_op(snapshots):
+    base, _, _ = snapshots
+    before = _by_hash(base)
+    raw = base.parent / base.name.replace(".enriched", "")
+    enrich(raw, verbose=False, base=base)       # base is also the output path
+    assert _mismatched_columns(before, _by_hash(base)) == set()
@@ -0,0 +1,50 @@
+"""
+Tests for queries/explore.fetch_nodes — the raw node table behind /explore/nodes.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from queries.explore import fetch_nodes
+
+
+def make_conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE nodes (hash TEXT PRIMARY KEY, name TEXT, module TEXT, kind TEXT,
+                            risk TEXT, complexity INTEGER, caller_count INTEGER,
+                            callee_count INTEGER, file_path TEXT, line_start INTEGER);
+        CREATE TABLE edges (caller_hash TEXT, callee_hash TEXT, call_count INTEGER);
+    """)
+    # hub calls t0..t9 with call_count = index; leaf calls nothing
+    nodes = [("hub", 0, 11), ("leaf", 1, 0)] + [(f"t{i}", 1, 0) for i in range(10)]
+    conn.executemany(
+        "INSERT INTO nodes VALUES (?, ?, 'm', 'function', 'low', 1, ?, ?, 'a.py', 1)",
+        [(h, h, callers, callees) for h, callers, callees in nodes],
+    )
+    conn.execute("INSERT INTO nodes VALUES ('ext:os', 'os', 'ext', 'function', 'low', 1, 1, 0, NULL, NULL)")
+    conn.executemany(
+        "INSERT INTO edges VALUES ('hub', ?, ?)",
+        [(f"t{i}", i) for i in range(10)] + [("ext:os", 99)],
+    )
+    return conn
+
+
+def test_outbound_edges_top_8_by_call_count():
+    result = fetch_nodes(make_conn(), sort_by="callee_count", limit=50)
+    by_hash = {n["hash"]: n for n in result["nodes"]}
+    hub_out = by_hash["hub"]["outbound_edges"]
+    assert [e["hash"] for e in hub_out] == [f"t{i}" for i in range(9, 1, -1)]
+    assert set(hub_out[0]) == {"hash", "name", "module", "call_count"}
+    assert by_hash["leaf"]["outbound_edges"] == []
+
+
+def test_external_nodes_excluded():
+    result = fetch_nodes(make_conn(), limit=50)
+    assert all(not n["hash"].startswith("ext:") for n in result["nodes"])
+    for n in result["nodes"]:
+        assert all(not e["hash"].startswith("ext:") for e in n["outbound_edges"])
+    assert result["total"] == 12
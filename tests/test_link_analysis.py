@@ -0,0 +1,88 @@
+"""
+Tests for analytics/link_analysis.py — sparse PageRank / HITS must agree with
+NetworkX on synthetic graphs and on the taskboard fixture call graphs.
+"""
+import sys
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from analytics.csr_graph import CSRGraph
+from analytics.link_analysis import hits, pagerank
+from db import _open_readonly
+from queries.core import fetch_call_graph
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+FIXTURES = sorted(p for p in DATA_DIR.glob("taskboard-*@HEAD.db") if ".enriched" not in p.name)
+
+
+def make_graph(edges, n=None):
+    n = n or (max(max(e) for e in edges) + 1)
+    nodes = [{"hash": f"n{i}", "module": "m"} for i in range(n)]
+    src, dst = zip(*edges)
+    return CSRGraph(nodes, np.array(src), np.array(dst), np.ones(len(edges), dtype=np.int64))
+
+
+def max_err(expected: dict, got: np.ndarray, graph: CSRGraph) -> float:
+    return max(abs(expected[h] - got[i]) for i, h in enumerate(graph.hashes))
+
+
+class TestPageRank:
+    def test_dangling_and_parallel_edges(self):
+        # n3 is dangling; the duplicated 0→1 row must count once
+        graph = make_graph([(0, 1), (0, 1), (1, 2), (2, 0), (2, 3)])
+        pr = pagerank(graph)
+        assert pr.sum() == pytest.approx(1.0)
+        assert max_err(nx.pagerank(graph.to_networkx()), pr, graph) < 1e-6
+
+    def test_warm_start_converges_to_same_solution(self):
+        graph = make_graph([(0, 1), (1, 2), (2, 0), (2, 3), (3, 1)])
+        cold = pagerank(graph)
+        warm = pagerank(graph, start=cold * 7)       # unnormalised on purpose
+        assert np.allclose(cold, warm, atol=1e-6)
+
+    def test_non_convergence_raises(self):
+        graph = make_graph([(0, 1), (1, 0)])
+        with pytest.raises(nx.PowerIterationFailedConvergence):
+            pagerank(graph, start=np.array([1.0, 0.0]), max_iter=1)
+
+
+class TestHits:
+    def test_no_edges_is_all_zero(self):
+        nodes = [{"hash": "a"}, {"hash": "b"}]
+        graph = CSRGraph(nodes, np.array([]), np.array([]), np.array([]))
+        hubs, auths = hits(graph)
+        assert hubs.tolist() == [0.0, 0.0] and auths.tolist() == [0.0, 0.0]
+
+    def test_star(self):
+        graph = make_graph([(0, 1), (0, 2), (0, 3)])
+        hubs, auths = hits(graph)
+        assert hubs.tolist() == pytest.approx([1.0, 0.0, 0.0, 0.0])
+        assert auths.tolist() == pytest.approx([0.0, 1 / 3, 1 / 3, 1 / 3])
+
+    def test_warm_start_from_authorities_matches_cold(self):
+        graph = make_graph([(0, 1), (0, 2), (1, 2), (2, 3), (3, 1), (4, 1), (4, 3)])
+        cold_hubs, cold_auths = hits(graph)
+        warm_hubs, warm_auths = hits(graph, authority_start=cold_auths * 5)
+        assert np.allclose(cold_hubs, warm_hubs, atol=1e-8)
+        assert np.allclose(cold_auths, warm_auths, atol=1e-8)
+
+
+@pytest.mark.parametrize("db", FIXTURES, ids=lambda p: p.stem)
+def test_matches_networkx_on_fixtures(db):
+    conn = _open_readonly(db)
+    graph = fetch_call_graph(conn)
+    conn.close()
+    G = graph.to_networkx()
+
+    pr = pagerank(graph, alpha=0.85, max_iter=200)
+    assert max_err(nx.pagerank(G, alpha=0.85, max_iter=200), pr, graph) < 1e-6
+
+    hubs, auths = hits(graph, max_iter=200)
+    nx_hubs, nx_auths = nx.hits(G, max_iter=200)
+    assert max_err(nx_hubs, hubs, graph) < 1e-6
+    assert max_err(nx_auths, auths, graph) < 1e-6
@@ -0,0 +1,97 @@
+"""
+Tests for backend/metrics.py — request profiling, SQL instrumentation and
+the Prometheus text rendering.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import metrics
+from metrics import (
+    Histogram, ProfiledConnection, ProfileMiddleware, Registry, RequestProfile, _current,
+    analytics_span,
+)
+
+
+def memory_db():
+    conn = sqlite3.connect(":memory:", factory=ProfiledConnection, check_same_thread=False)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(10)])
+    return conn
+
+
+def test_statements_are_charged_to_the_current_request():
+    conn = memory_db()
+    profile = RequestProfile()
+    token = _current.set(profile)
+    try:
+        for i in range(3):
+            conn.execute("SELECT x FROM t WHERE x = ?", (i,)).fetchone()
+        conn.cursor().execute("SELECT COUNT(*) FROM t").fetchall()
+    finally:
+        _current.reset(token)
+    conn.execute("SELECT 1").fetchall()         # outside a request: not recorded
+
+    assert profile.sql_count == 4
+    assert profile.sql["SELECT x FROM t WHERE x = ?"][0] == 3
+    assert set(profile.sql) == {"SELECT x FROM t WHERE x = ?", "SELECT COUNT(*) FROM t"}
+    assert profile.sql_seconds > 0
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("h_seconds", "help text", ("route",), (0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(("/a",), v)
+    assert h.render() == [
+        "# HELP h_seconds help text",
+        "# TYPE h_seconds histogram",
+        'h_seconds_bucket{route="/a",le="0.1"} 1',
+        'h_seconds_bucket{route="/a",le="1"} 2',
+        'h_seconds_bucket{route="/a",le="+Inf"} 3',
+        'h_seconds_sum{route="/a"} 5.55',
+        'h_seconds_count{route="/a"} 3',
+    ]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    registry = Registry()
+    monkeypatch.setattr(metrics, "REGISTRY", registry)
+    monkeypatch.setattr(metrics, "SLOW_MS", 0.0)
+    conn = memory_db()
+
+    app = FastAPI()
+    app.add_middleware(ProfileMiddleware)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):                     # sync: runs on a worker thread
+        rows = [conn.execute("SELECT x FROM t WHERE x = ?", (i,)).fetchone()[0] for i in range(item_id)]
+        with analytics_span("sum"):
+            total = sum(rows)
+        return {"total": total}
+
+    with TestClient(app) as c:
+        yield c, registry
+
+
+def test_middleware_records_route_sql_and_slow_requests(client):
+    c, registry = client
+    assert c.get("/items/5").json() == {"total": 10}
+    assert c.get("/nowhere").status_code == 404
+
+    text = registry.render()
+    assert 'explora_http_requests_total{method="GET",route="/items/{item_id}",status="200"} 1' in text
+    assert 'explora_http_requests_total{method="GET",route="unmatched",status="404"} 1' in text
+    assert 'explora_sql_statements_per_request_sum{route="/items/{item_id}"} 5' in text
+    assert 'explora_analytics_duration_seconds_count{name="sum"} 1' in text
+
+    slow = registry.slow()[1]
+    assert (slow["path"], slow["sql_count"]) == ("/items/5", 5)
+    assert slow["top_sql"][0]["count"] == 5 and slow["top_sql"][0]["sql"] == "SELECT x FROM t WHERE x = ?"
+    assert "sum" in slow["analytics_ms"]
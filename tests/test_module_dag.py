@@ -0,0 +1,66 @@
+"""
+Tests for analytics/module_dag.py — SCC condensation, layering and
+back-edge accounting over module_edges rows.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from analytics.module_dag import ModuleDAG
+
+
+def _row(a, b, n=1):
+    return {"caller_module": a, "callee_module": b, "edge_count": n}
+
+
+def test_chain_layers_from_foundation():
+    dag = ModuleDAG.from_rows([_row("ui", "svc"), _row("svc", "db"), _row("ui", "db")])
+    assert dag.layer_of("db") == 0
+    assert dag.layer_of("svc") == 1
+    assert dag.layer_of("ui") == 2
+    assert dag.n_layers == 3
+    assert not dag.back_edge.any()
+    assert dag.summary()["back_edge_ratio"] == 0.0
+
+
+def test_cycle_collapses_into_one_layer():
+    rows = [_row("a", "b", 3), _row("b", "a", 1), _row("c", "a", 2), _row("a", "d", 5)]
+    dag = ModuleDAG.from_rows(rows)
+    assert dag.layer_of("a") == dag.layer_of("b") == 1
+    assert dag.layer_of("c") == 2
+    assert dag.layer_of("d") == 0
+
+    in_cycle = dict(zip(dag.modules, dag.in_cycle().tolist()))
+    assert in_cycle == {"a": True, "b": True, "c": False, "d": False}
+    assert dag.back_edges[dag.index["a"]] == 3
+    assert dag.back_edges[dag.index["b"]] == 1
+
+    s = dag.summary()
+    assert s["module_cycles"] == 1
+    assert s["back_edges"] == 2
+    assert s["back_edge_ratio"] == round(4 / 11, 3)
+
+
+def test_one_way_pairs_point_downwards():
+    rows = [_row("a", "b"), _row("b", "c"), _row("c", "a"), _row("c", "d"), _row("e", "a")]
+    dag = ModuleDAG.from_rows(rows)
+    for i in dag.one_way():
+        assert dag.layer[dag.src[i]] > dag.layer[dag.dst[i]]
+
+
+def test_parallel_rows_and_self_loops_collapse():
+    dag = ModuleDAG.from_rows([_row("a", "b", 2), _row("a", "b", 3), _row("a", "a", 9)])
+    assert len(dag.src) == 1
+    assert dag.weights.tolist() == [5]
+
+
+def test_isolated_modules_and_empty_graph():
+    dag = ModuleDAG.from_rows([_row("a", "b")], modules=["z", "a"])
+    assert dag.layer_of("z") == 0
+    assert dag.layer_of("missing") is None
+    assert dag.n_modules == 3
+
+    empty = ModuleDAG.from_rows([])
+    assert empty.n_layers == 0
+    assert empty.summary()["modules"] == 0
@@ -28,7 +28,12 @@ from backend.analytics.pattern_detector import (
     detect_chain_of_responsibility,
     detect_template_method,
     detect_all_patterns,
+    detect_patterns_timed,
+    _arrays_from_graph,
+    _graph_arrays,
+    DETECTORS,
 )
+from backend.analytics.csr_graph import CSRGraph
 
 
 # ── DB helpers ─────────────────────────────────────────────────────────────────
@@ -441,3 +446,76 @@ class TestDetectAllPatterns:
             for inst in r["instances"]:
                 assert isinstance(inst["node_labels"], list)
                 assert all(isinstance(lbl, str) for lbl in inst["node_labels"])
+
+
+# ── Degree arrays / parallel run ───────────────────────────────────────────────
+
+def mixed_graph_db() -> sqlite3.Connection:
+    """A hub-and-spoke / chain / cycle mix that triggers several detectors."""
+    conn = make_db()
+    for i in range(30):
+        add_node(conn, f"n{i}", f"fn_{i}", f"mod_{i % 4}")
+    for i in range(1, 12):
+        add_edge(conn, "n0", f"n{i}")
+        add_edge(conn, f"n{i}", "n20")
+    for i in range(20, 28):
+        add_edge(conn, f"n{i}", f"n{i + 1}")
+    add_edge(conn, "n28", "n21")
+    add_edge(conn, "n5", "n5")
+    return conn
+
+
+class TestGraphArrays:
+    def test_degrees_match_adjacency_lengths(self):
+        nodes, out_adj, in_adj = _load_graph(mixed_graph_db())
+        a = _graph_arrays(nodes, out_adj, in_adj)
+        assert a.hashes == list(nodes)
+        assert a.in_deg.tolist() == [len(in_adj.get(h, [])) for h in nodes]
+        assert a.out_deg.tolist() == [len(out_adj.get(h, [])) for h in nodes]
+        assert [a.modules[m] for m in a.module_id] == [n["module"] for n in nodes.values()]
+
+    def test_csr_arrays_match(self):
+        conn = mixed_graph_db()
+        nodes, out_adj, in_adj = _load_graph(conn)
+        rows = [dict(r) for r in conn.execute("SELECT * FROM nodes")]
+        graph = CSRGraph.from_rows(rows, conn.execute("SELECT * FROM edges").fetchall())
+        a, b = _graph_arrays(nodes, out_adj, in_adj), _arrays_from_graph(graph)
+        assert a.in_deg.tolist() == b.in_deg.tolist()
+        assert a.out_deg.tolist() == b.out_deg.tolist()
+        assert detect_all_patterns(conn, 0.0) == detect_all_patterns(min_confidence=0.0, graph=graph)
+
+    def test_parallel_matches_serial_and_reports_timings(self):
+        conn = mixed_graph_db()
+        serial, timings = detect_patterns_timed(conn, 0.0, workers=1)
+        parallel, _ = detect_patterns_timed(conn, 0.0, workers=3)
+        assert parallel == serial
+        assert {"map_reduce", "mutual_recursion"} <= {r["pattern"] for r in serial}
+        assert set(timings) == {"load"} | {key for key, _, _ in DETECTORS}
+
+    def test_in_process_run_ignores_shared_state(self, monkeypatch):
+        # A concurrent pooled caller clearing _SHARED must not blank this run
+        import backend.analytics.pattern_detector as pd
+
+        conn = mixed_graph_db()
+        expected, _ = detect_patterns_timed(conn, 0.0, workers=1)
+
+        first = DETECTORS[0][0]
+        original = pd._BY_KEY[first]
+
+        def clear_shared_then_run(*args):
+            pd._SHARED.clear()
+            return original(*args)
+
+        monkeypatch.setitem(pd._BY_KEY, first, clear_shared_then_run)
+        assert detect_patterns_timed(conn, 0.0, workers=1)[0] == expected
+
+    def test_patterns_route_does_not_fork(self, monkeypatch):
+        # /patterns already runs in a cpu-lane worker (or a server thread)
+        monkeypatch.syspath_prepend(os.path.join(os.path.dirname(__file__), "..", "backend"))
+        import routers.patterns as route
+
+        calls = []
+        monkeypatch.setattr(route, "get_graph", lambda repo_id: None)
+        monkeypatch.setattr(route, "detect_patterns_timed", lambda **kw: calls.append(kw) or ([], {}))
+        route._patterns("repo", 0.6)
+        assert calls[0]["workers"] == 1
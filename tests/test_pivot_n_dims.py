@@ -33,8 +33,8 @@ from queries.explore import (
     measure_sql,
     measure_col,
     parse_measure,
-    _register_aggregates,
 )
+from db import _register_aggregates
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 
@@ -254,6 +254,41 @@ class TestBuildPivotTree:
         assert max(depths) >= 2
 
 
+class TestRollupMatchesPerLevel:
+    """The single-scan rollup must reproduce one-GROUP-BY-per-level exactly."""
+
+    MEASURES = (
+        "symbol_count", "dead_ratio", "high_risk_ratio",
+        "complexity:avg", "complexity:stddev", "caller_count:min",
+        "caller_count:max", "callee_count:sum", "complexity:count",
+    )
+
+    def _both(self, conn, dims, monkeypatch):
+        import queries.explore as explore
+        parsed = [parse_measure(s) for s in self.MEASURES]
+        dim_triples = _resolve_dims(conn, list(dims), False, None)
+        frags = [measure_sql(m, False) for m in parsed]
+        cols  = [measure_col(m) for m in parsed]
+        rollup = _build_pivot_tree(conn, dim_triples, frags, cols, False, None)
+        monkeypatch.setattr(explore, "_rollup_sql", lambda *a, **k: None)
+        per_level = _build_pivot_tree(conn, dim_triples, frags, cols, False, None)
+        return rollup, per_level
+
+    @pytest.mark.parametrize("dims", [
+        ["module"], ["module", "kind"], ["module", "kind", "risk"],
+        ["kind", "risk", "module", "dead"],
+    ])
+    def test_same_tree(self, conn, dims, monkeypatch):
+        rollup, per_level = self._both(conn, dims, monkeypatch)
+        assert rollup == per_level
+
+    def test_stddev_merges_across_children(self, conn, monkeypatch):
+        rollup, _ = self._both(conn, ["module", "kind"], monkeypatch)
+        core = next(r for r in rollup if r["key"]["module"] == "core")
+        # complexity 3, 8, 1 → population stddev 2.9439
+        assert core["values"]["complexity_stddev"] == pytest.approx(2.9439, abs=1e-4)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Layer 2 — fetch_pivot API surface (backward compat + N-dim)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -261,6 +296,12 @@ class TestBuildPivotTree:
 class TestFetchPivotBackwardCompat:
     """Ensure 1-dim and 2-dim fetch_pivot behaviour matches the old hardcoded paths."""
 
+    def test_plain_connection_registers_aggregates(self):
+        plain = make_conn(FIXTURE_ROWS())    # no _register_aggregates
+        result = fetch_pivot(plain, ["module", "kind"], ["complexity:stddev"])
+        core = next(r for r in result["rows"] if r["key"]["module"] == "core")
+        assert core["values"]["complexity_stddev"] == pytest.approx(2.9439, abs=1e-4)
+
     def test_1dim_rows_have_no_children(self, conn):
         result = fetch_pivot(conn, ["module"], ["symbol_count"])
         for r in result["rows"]:
@@ -0,0 +1,79 @@
+"""
+Tests for repo_catalog.py — the cached /api/repos listing.
+"""
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from repo_catalog import CATALOG_NAME, RepoCatalog
+
+
+def make_db(path: Path, n_nodes: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE nodes (hash TEXT PRIMARY KEY, name TEXT, module TEXT);
+        CREATE TABLE edges (caller_hash TEXT, callee_hash TEXT);
+    """)
+    conn.executemany(
+        "INSERT INTO nodes VALUES (?, ?, ?)",
+        [(f"h{i}", f"f{i}", f"m{i % 2}") for i in range(n_nodes)] + [("ext:os", "os", "ext")],
+    )
+    conn.execute("INSERT INTO edges VALUES ('h0', 'h1')")
+    conn.commit()
+    conn.close()
+
+
+def bump(path: Path) -> None:
+    """Force a new mtime even on coarse-grained filesystems."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_lists_raw_dbs_with_stats(tmp_path):
+    make_db(tmp_path / "a.db", 3)
+    make_db(tmp_path / "b@123.db", 4)
+    make_db(tmp_path / "b@123.enriched.db", 4)
+    (tmp_path / "junk.db").write_text("not sqlite")
+
+    repos = RepoCatalog(tmp_path).list()
+    assert [(r["id"], r["node_count"], r["edge_count"], r["module_count"], r["enriched"])
+            for r in repos] == [("a", 4, 1, 2, False), ("b@123", 5, 1, 2, True)]
+    assert repos[0]["db_path"] == str(tmp_path / "a.db")
+
+
+def test_unchanged_dbs_are_not_reopened(tmp_path):
+    make_db(tmp_path / "a.db", 3)
+    catalog = RepoCatalog(tmp_path)
+    catalog.list()
+    catalog.list()
+    assert catalog.opened == 1
+
+    # A fresh process starts from the persisted catalog
+    assert json.loads((tmp_path / CATALOG_NAME).read_text())["repos"]["a"]["node_count"] == 4
+    restarted = RepoCatalog(tmp_path)
+    assert restarted.list()[0]["node_count"] == 4
+    assert restarted.opened == 0
+
+
+def test_new_removed_and_rewritten_dbs(tmp_path):
+    make_db(tmp_path / "a.db", 3)
+    catalog = RepoCatalog(tmp_path)
+    catalog.list()
+
+    make_db(tmp_path / "b.db", 1)
+    assert [r["id"] for r in catalog.list()] == ["a", "b"]
+    (tmp_path / "a.db").unlink()
+    assert [r["id"] for r in catalog.list()] == ["b"]
+
+    # In-place rewrite: invisible to the directory check until refresh()
+    conn = sqlite3.connect(tmp_path / "b.db")
+    conn.execute("INSERT INTO nodes VALUES ('h9', 'f9', 'm9')")
+    conn.commit()
+    conn.close()
+    bump(tmp_path / "b.db")
+    catalog.refresh("b")
+    assert catalog.list()[0]["node_count"] == 3
@@ -0,0 +1,84 @@
+"""
+Tests for analytics/repo_stats.py and the precomputed repo_stats table.
+"""
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from analytics.csr_graph import CSRGraph
+from analytics.repo_stats import degree_histogram, graph_stats
+from queries.core import fetch_call_graph
+from queries.repos import fetch_repo_overview, fetch_repo_stats, write_repo_stats
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def make_graph(edges):
+    names = sorted({h for e in edges for h in e})
+    return CSRGraph.from_rows([{"hash": h} for h in names], [(a, b, 1) for a, b in edges])
+
+
+def test_degree_histogram_buckets():
+    hist = degree_histogram(np.array([0, 0, 1, 2, 3, 4, 9]))
+    assert hist == [
+        {"min": 0, "max": 0,  "count": 2},
+        {"min": 1, "max": 1,  "count": 1},
+        {"min": 2, "max": 3,  "count": 2},
+        {"min": 4, "max": 7,  "count": 1},
+        {"min": 8, "max": 15, "count": 1},
+    ]
+
+
+def test_cycles_are_sccs():
+    # a ⇄ b, c → d → e → c, f → f; b → c and e → g are acyclic
+    graph = make_graph([("a", "b"), ("b", "a"), ("c", "d"), ("d", "e"), ("e", "c"),
+                        ("b", "c"), ("f", "f"), ("e", "g")])
+    assert graph_stats(graph)["cycles"] == {"count": 2, "nodes": 5, "largest": 3, "self_loops": 1}
+    assert graph_stats(make_graph([]))["cycles"]["count"] == 0
+
+
+def test_stored_stats_round_trip(tmp_path):
+    raw = DATA_DIR / "taskboard-antipattern-circular-deps@HEAD.db"
+    if not raw.exists():
+        pytest.skip(f"Fixture DB not found: {raw}")
+    conn = sqlite3.connect(shutil.copy2(raw, tmp_path))
+    conn.row_factory = sqlite3.Row
+    assert fetch_repo_stats(conn) is None
+
+    graph = fetch_call_graph(conn)
+    write_repo_stats(conn, graph)
+    stats = fetch_repo_stats(conn)
+    assert {k: stats[k] for k in fetch_repo_overview(conn)} == fetch_repo_overview(conn)
+
+    G = graph.to_networkx()
+    expected = [c for c in nx.strongly_connected_components(G) if len(c) > 1]
+    assert stats["cycles"]["count"] == len(expected)
+    assert stats["cycles"]["nodes"] == sum(map(len, expected))
+    assert sum(b["count"] for b in stats["degree_histograms"]["in"]) == graph.n_nodes
+
+
+def test_overview_without_repo_stats_skips_graph(tmp_path, monkeypatch):
+    import db
+    import graph_store
+    from routers.repos import repo_overview
+
+    raw = DATA_DIR / "taskboard-antipattern-circular-deps@HEAD.db"
+    if not raw.exists():
+        pytest.skip(f"Fixture DB not found: {raw}")
+    shutil.copy2(raw, tmp_path / "plain.db")
+    monkeypatch.setattr(db, "DATA_DIR", tmp_path)
+
+    def no_graph(repo_id):
+        raise AssertionError("overview must not load the graph")
+
+    monkeypatch.setattr(graph_store, "get_graph", no_graph)
+    result = repo_overview("plain")
+    assert result["cycles"] is None and result["degree_histograms"] is None
+    assert result["node_count"] > 0
@@ -0,0 +1,190 @@
+"""
+Unit tests for backend/result_cache.py — the fingerprint-validated result memo.
+
+db_fingerprint is replaced with an in-memory table so no DB files are needed.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import result_cache as rc
+from result_cache import ResultCache, cached
+
+
+@pytest.fixture
+def fingerprints(monkeypatch):
+    fps = {"a": ("a.db", 1, 10, 1), "b": ("b.db", 1, 10, 2)}
+    monkeypatch.setattr(rc, "db_fingerprint", lambda repo_id: fps[repo_id])
+    return fps
+
+
+class Counter:
+    def __init__(self, value=None):
+        self.calls = 0
+        self.value = value
+
+    def __call__(self):
+        self.calls += 1
+        return self.value if self.value is not None else {"n": self.calls}
+
+
+def test_hit_after_miss(fingerprints):
+    cache, fn = ResultCache(1 << 20), Counter()
+    first  = cache.get_or_compute("ep", ["a"], {"k": 1}, fn)
+    second = cache.get_or_compute("ep", ["a"], {"k": 1}, fn)
+    assert first == second == {"n": 1}
+    assert fn.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_params_are_normalised(fingerprints):
+    cache, fn = ResultCache(1 << 20), Counter()
+    cache.get_or_compute("ep", ["a"], {"x": 1.0, "y": "s"}, fn)
+    cache.get_or_compute("ep", ["a"], {"y": "s", "x": 1}, fn)
+    cache.get_or_compute("ep", ["a"], {"x": 2, "y": "s"}, fn)
+    assert fn.calls == 2
+
+
+def test_fingerprint_change_invalidates(fingerprints):
+    cache, fn = ResultCache(1 << 20), Counter()
+    cache.get_or_compute("ep", ["a"], {}, fn)
+    fingerprints["a"] = ("a.enriched.db", 2, 20, 3)
+    assert cache.get_or_compute("ep", ["a"], {}, fn) == {"n": 2}
+    assert cache.stats()["stale_drops"] == 1
+
+
+def test_multi_repo_entry_tracks_every_fingerprint(fingerprints):
+    cache, fn = ResultCache(1 << 20), Counter()
+    cache.get_or_compute("diff", ["a", "b"], {}, fn)
+    fingerprints["b"] = ("b.db", 9, 10, 2)
+    cache.get_or_compute("diff", ["a", "b"], {}, fn)
+    assert fn.calls == 2
+
+
+def test_lru_eviction_respects_byte_budget(fingerprints):
+    payload = "x" * 400
+    cache = ResultCache(1000)
+    for k in range(3):
+        cache.get_or_compute("ep", ["a"], {"k": k}, Counter(payload))
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["bytes"] <= 1000
+    fn = Counter(payload)
+    cache.get_or_compute("ep", ["a"], {"k": 0}, fn)    # evicted → recompute
+    assert fn.calls == 1
+
+
+def test_spill_round_trip(fingerprints, tmp_path):
+    payload = {"rows": list(range(100))}
+    cache = ResultCache(300, spill_dir=tmp_path)
+    cache.get_or_compute("ep", ["a"], {"k": 0}, Counter(payload))
+    cache.get_or_compute("ep", ["a"], {"k": 1}, Counter(payload))
+    assert cache.stats()["disk_entries"] == 1
+    fn = Counter()
+    assert cache.get_or_compute("ep", ["a"], {"k": 0}, fn) == payload
+    assert fn.calls == 0
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_invalidate_by_repo(fingerprints):
+    cache = ResultCache(1 << 20)
+    cache.get_or_compute("ep", ["a"], {}, Counter())
+    cache.get_or_compute("ep", ["b"], {}, Counter())
+    cache.invalidate("a")
+    assert cache.stats()["entries"] == 1
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+
+def test_cached_decorator_keys_on_arguments(fingerprints, monkeypatch):
+    monkeypatch.setattr(rc, "result_cache", ResultCache(1 << 20))
+    calls = []
+
+    @cached("ep")
+    def handler(repo_id: str, top_n: int = 30):
+        calls.append((repo_id, top_n))
+        return {"repo": repo_id, "top_n": top_n}
+
+    assert handler("a") == handler(repo_id="a", top_n=30) == {"repo": "a", "top_n": 30}
+    handler("a", top_n=5)
+    handler("b")
+    assert calls == [("a", 30), ("a", 5), ("b", 30)]
+
+
+def test_cached_decorator_awaits_async_handlers(fingerprints, monkeypatch):
+    import asyncio
+    import inspect
+
+    monkeypatch.setattr(rc, "result_cache", ResultCache(1 << 20))
+    calls = []
+
+    @cached("ep")
+    async def handler(repo_id: str, top_n: int = 30):
+        calls.append((repo_id, top_n))
+        return {"repo": repo_id, "top_n": top_n}
+
+    assert inspect.iscoroutinefunction(handler)
+    assert asyncio.run(handler("a")) == asyncio.run(handler(repo_id="a")) == {"repo": "a", "top_n": 30}
+    assert calls == [("a", 30)]
+
+
+# ── Single-flight ─────────────────────────────────────────────────────────────
+
+def test_concurrent_sync_misses_share_one_computation(fingerprints):
+    import threading
+
+    cache, release, calls = ResultCache(1 << 20), threading.Event(), []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"n": len(calls)}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("ep", ["a"], {}, compute)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    while cache.stats()["coalesced"] < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert calls == [1] and results == [{"n": 1}] * 4
+    assert (cache.stats()["coalesced"], cache.stats()["in_flight"]) == (3, 0)
+
+
+def test_async_flight_survives_a_cancelled_caller_and_shares_errors(fingerprints):
+    import asyncio
+
+    cache, calls = ResultCache(0), []       # coalescing works with caching disabled
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"n": len(calls)}
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        first  = asyncio.ensure_future(cache.aget_or_compute("ep", ["a"], {}, compute))
+        others = [asyncio.ensure_future(cache.aget_or_compute("ep", ["a"], {}, compute)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        shared = await asyncio.gather(*others)
+        errors = await asyncio.gather(
+            *(cache.aget_or_compute("ep", ["b"], {}, failing) for _ in range(2)), return_exceptions=True,
+        )
+        return shared, errors
+
+    shared, errors = asyncio.run(scenario())
+    assert calls == [1] and shared == [{"n": 1}] * 3
+    assert [type(e) for e in errors] == [ValueError, ValueError]
+    assert cache.stats()["coalesced"] == 4
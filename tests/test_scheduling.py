@@ -0,0 +1,67 @@
+"""
+Tests for backend/scheduling.py — bounded executor lanes with admission control.
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from scheduling import Lane
+
+
+def thread_lane(workers=1, max_queue=1):
+    return Lane("test", lambda: ThreadPoolExecutor(max_workers=workers), workers, max_queue)
+
+
+def not_found(repo_id):
+    raise HTTPException(status_code=404, detail=f"Repo {repo_id!r} not found")
+
+
+def test_runs_jobs_and_counts_them():
+    lane = thread_lane()
+    assert asyncio.run(lane.run(pow, 2, 10)) == 1024
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(lane.run(divmod, 1, 0))
+    stats = lane.stats()
+    assert (stats["completed"], stats["failed"], stats["running"], stats["queued"]) == (1, 1, 0, 0)
+
+
+def test_full_lane_rejects_with_503():
+    lane, release = thread_lane(workers=1, max_queue=1), threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(lane.run(release.wait))
+        queued  = asyncio.ensure_future(lane.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert (lane.stats()["running"], lane.stats()["queued"]) == (1, 1)
+        with pytest.raises(HTTPException) as exc:
+            await lane.run(release.wait)
+        release.set()
+        await asyncio.gather(running, queued)
+        return exc.value
+
+    exc = asyncio.run(scenario())
+    assert exc.status_code == 503 and exc.headers == {"Retry-After": "1"}
+    stats = lane.stats()
+    assert (stats["rejected"], stats["completed"], stats["peak_queued"]) == (1, 2, 1)
+
+
+def test_process_lane_escapes_the_parent_and_keeps_http_errors():
+    ctx  = multiprocessing.get_context("spawn")
+    lane = Lane("cpu", lambda: ProcessPoolExecutor(max_workers=1, mp_context=ctx), 1, 4)
+    try:
+        assert asyncio.run(lane.run(os.getpid)) != os.getpid()
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(lane.run(not_found, "nope"))
+        assert exc.value.status_code == 404
+        assert lane.stats()["completed"] == 2
+    finally:
+        lane.shutdown()
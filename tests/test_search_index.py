@@ -0,0 +1,89 @@
+"""
+Tests for queries/search_index.py and analytics/symbol_search.py — the
+trigram symbol-search index behind /search.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from analytics.symbol_search import identifier_words
+from queries.search_index import has_search_index, search_symbols, write_search_index
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE nodes (hash TEXT PRIMARY KEY, name TEXT, kind TEXT, module TEXT,
+                            file_path TEXT, line_start INTEGER, caller_count INTEGER,
+                            callee_count INTEGER, risk TEXT)
+    """)
+    nodes = [
+        ("a", "parseHTTPRequest", "net.http",     "net/http.py",        5),
+        ("b", "http_request",     "net.http",     "net/http.py",        1),
+        ("c", "request",          "net.client",   "net/client.py",      9),
+        ("d", "sendRequest",      "net.client",   "net/client.py",      7),
+        ("e", "updateSession",    "auth.session", "auth/session.py",    3),
+        ("f", "render",           "ui.requests",  "ui/requests.py",     2),
+        ("g", 'say"hi',           "misc",         "misc.py",            0),
+    ]
+    conn.executemany(
+        "INSERT INTO nodes VALUES (?, ?, 'function', ?, ?, 1, ?, 0, 'low')", nodes,
+    )
+    conn.execute("INSERT INTO nodes VALUES ('ext:req', 'request', 'function', 'ext', NULL, NULL, 99, 0, 'low')")
+    assert write_search_index(conn) == len(nodes)
+    return conn
+
+
+def names(results):
+    return [(r["name"], r["match"]) for r in results]
+
+
+def test_identifier_words():
+    assert identifier_words("parseHTTPRequest_v2") == ["parse", "http", "request", "v", "2"]
+    assert identifier_words("__init__") == ["init"]
+    assert identifier_words("XMLParser") == ["xml", "parser"]
+
+
+def test_tiers_in_order(conn):
+    assert has_search_index(conn)
+    # exact, then word matches by caller_count, then module/path-only; no ext: nodes
+    assert names(search_symbols(conn, "request")) == [
+        ("request",          "exact"),
+        ("sendRequest",      "word"),
+        ("parseHTTPRequest", "word"),
+        ("http_request",     "word"),
+        ("render",           "path"),
+    ]
+
+
+def test_word_match_across_separators(conn):
+    for q in ("http request", "http_request", "HttpRequest"):
+        found = names(search_symbols(conn, q))
+        assert ("parseHTTPRequest", "word") in found, q
+
+
+def test_short_prefix_and_fuzzy(conn):
+    assert names(search_symbols(conn, "up")) == [("updateSession", "prefix")]
+    assert ("updateSession", "fuzzy") in names(search_symbols(conn, "updteSesion"))
+    assert search_symbols(conn, "zzqqxx") == []
+
+
+def test_short_query_matches_substrings_and_paths(conn):
+    # "nd": inside sendRequest / render names, not a prefix of anything
+    assert names(search_symbols(conn, "nd")) == [("sendRequest", "substring"), ("render", "substring")]
+    # "ui" only occurs in render's module and path
+    assert names(search_symbols(conn, "ui")) == [("render", "path")]
+    # LIKE wildcards are literal
+    assert names(search_symbols(conn, "_")) == [("http_request", "substring")]
+    assert search_symbols(conn, "%") == []
+
+
+def test_query_syntax_is_escaped(conn):
+    assert names(search_symbols(conn, 'say"hi')) == [('say"hi', "exact")]
+    assert search_symbols(conn, "OR AND (") == []
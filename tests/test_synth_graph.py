@@ -0,0 +1,62 @@
+"""
+Tests for benchmarks/synth_graph.py — generated DBs must be self-consistent
+semfora DBs that the query layer and diff pipeline accept.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from analytics.cycles import find_cycles
+from analytics.diff import compute_diff, compute_diff_status_map
+from db import _open_readonly
+from queries.core import fetch_call_graph
+from queries.graph import fetch_diff_snapshot
+from synth_graph import GraphSpec, generate, mutate
+
+
+def test_counts_are_consistent(tmp_path):
+    path = tmp_path / "s.db"
+    info = generate(path, GraphSpec(nodes=2000, cycles=0.05, inheritance=True, seed=3))
+    conn = sqlite3.connect(path)
+    q = lambda sql: conn.execute(sql).fetchone()[0]
+
+    assert q("SELECT COUNT(*) FROM nodes WHERE kind != 'external'") == info["nodes"] == 2000
+    assert q("SELECT COUNT(*) FROM edges") == info["edges"]
+    assert q("SELECT SUM(edge_count) FROM module_edges") == info["edges"]
+    assert q("SELECT COUNT(*) FROM edges WHERE caller_hash = callee_hash") == 0
+    assert q("SELECT SUM(callee_count) FROM nodes") == info["edges"]
+    assert q("""SELECT COUNT(*) FROM nodes n WHERE caller_count != (
+                  SELECT COUNT(*) FROM edges e WHERE e.callee_hash = n.hash)""") == 0
+    assert q("SELECT COUNT(*) FROM inheritance") == info["inheritance"] > 0
+    conn.close()
+
+    graph = fetch_call_graph(_open_readonly(path))
+    assert graph.n_nodes == 2000
+    assert find_cycles(graph)
+
+
+def test_deterministic_and_acyclic_without_cycles(tmp_path):
+    a, b = tmp_path / "a.db", tmp_path / "b.db"
+    generate(a, GraphSpec(nodes=500, cycles=0.0, seed=1))
+    generate(b, GraphSpec(nodes=500, cycles=0.0, seed=1))
+    rows = lambda p: sqlite3.connect(p).execute("SELECT * FROM edges ORDER BY 1, 2").fetchall()
+    assert rows(a) == rows(b)
+    assert find_cycles(fetch_call_graph(_open_readonly(a))) == []
+
+
+def test_mutate_produces_diffable_snapshot(tmp_path):
+    base, head = tmp_path / "base.db", tmp_path / "head.db"
+    generate(base, GraphSpec(nodes=3000, seed=2))
+    changes = mutate(base, head, fraction=0.02, seed=5)
+
+    snap_a = fetch_diff_snapshot(_open_readonly(base))
+    snap_b = fetch_diff_snapshot(_open_readonly(head))
+    nodes_a, nodes_b = list(snap_a["nodes_by_key"].values()), list(snap_b["nodes_by_key"].values())
+    diff = compute_diff(nodes_a, nodes_b, snap_a["module_edges"], snap_b["module_edges"])
+    statuses = list(compute_diff_status_map(nodes_a, nodes_b).values())
+    assert statuses.count("modified") == changes["modified"]
+    assert diff["nodes_moved"] + diff["nodes_renamed"] > 0
+    assert diff["nodes_added"] >= changes["added"]
@@ -0,0 +1,135 @@
+"""
+Tests for analytics/timeline.py and timeline_store.py — the symbol × snapshot
+matrix must agree with pairwise diffs and grow incrementally.
+
+Snapshots are throwaway DBs under tmp_path; no fixture DBs required.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import db
+import timeline_store
+from analytics.diff import compute_diff_status_map
+from analytics.timeline import Timeline
+from db import ConnectionPool
+from timeline_store import TimelineStore
+
+# name → content hash per snapshot (absent = not in that snapshot)
+SNAPSHOTS = {
+    "r@1": {"a": "a1", "b": "b1", "c": "c1"},
+    "r@2": {"a": "a1", "b": "b2", "d": "d1"},
+    "r@3": {"a": "a2", "b": "b2", "c": "c9", "d": "d1"},
+}
+
+
+def rows(content: dict, module: str = "m") -> list[dict]:
+    return [
+        {"hash": f"mod:{h}", "name": name, "module": module if name != "d" else "other",
+         "caller_count": len(h), "complexity": 1, "pagerank": None}
+        for name, h in content.items()
+    ]
+
+
+def build() -> Timeline:
+    t = Timeline()
+    for sid, content in SNAPSHOTS.items():
+        t.append(sid, rows(content))
+    return t
+
+
+def test_transitions_match_pairwise_diffs():
+    t = build()
+    steps = t.transitions()
+    ids = list(SNAPSHOTS)
+    for i, (a, b) in enumerate(zip(ids, ids[1:])):
+        expected = compute_diff_status_map(rows(SNAPSHOTS[a]), rows(SNAPSHOTS[b]))
+        got = {
+            t.keys[j]: kind
+            for kind, mask in steps.items() for j in mask[:, i].nonzero()[0]
+        }
+        assert got == expected
+
+
+def test_symbol_history_and_metrics():
+    t = build()
+    assert t.symbol_history("m::c") == {
+        "key":        "m::c",
+        "module":     "m",
+        "first_seen": "r@1",
+        "last_seen":  "r@3",
+        "events":     [{"snapshot": "r@2", "event": "removed"}, {"snapshot": "r@3", "event": "added"}],
+        "metrics": {
+            "caller_count": [2.0, None, 2.0],
+            "complexity":   [1.0, None, 1.0],
+            "pagerank":     [None, None, None],
+        },
+    }
+    assert t.symbol_history("m::zzz") is None
+    assert t.most_changed() == [
+        {"key": "m::a", "module": "m", "changes": 1},
+        {"key": "m::b", "module": "m", "changes": 1},
+    ]
+
+
+def test_module_churn_and_trend():
+    t = build()
+    assert t.module_churn() == [
+        {"module": "m", "added": 1, "removed": 1, "modified": 2, "churn": 4, "by_step": [2, 2]},
+        {"module": "other", "added": 1, "removed": 0, "modified": 0, "churn": 1, "by_step": [1, 0]},
+    ]
+    trend = t.metric_trend("caller_count", module="m")
+    assert [(p["symbols"], p["sum"], p["max"]) for p in trend] == [(3, 6.0, 2.0), (2, 4.0, 2.0), (3, 6.0, 2.0)]
+    assert t.metric_trend("pagerank")[0]["mean"] is None
+
+
+# ── Store ─────────────────────────────────────────────────────────────────────
+
+def write_snapshot(data_dir: Path, repo_id: str, created_at: str) -> None:
+    conn = sqlite3.connect(data_dir / f"{repo_id}.db")
+    conn.executescript("""
+        CREATE TABLE schema_info (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE nodes (hash TEXT PRIMARY KEY, name TEXT, module TEXT,
+                            caller_count INTEGER, complexity INTEGER);
+    """)
+    conn.execute("INSERT INTO schema_info VALUES ('created_at', ?)", (created_at,))
+    conn.executemany(
+        "INSERT INTO nodes VALUES (:hash, :name, :module, :caller_count, :complexity)",
+        rows(SNAPSHOTS[repo_id]),
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(timeline_store, "DATA_DIR", tmp_path)
+    pool = ConnectionPool()
+    monkeypatch.setattr(db, "pool", pool)
+    yield tmp_path
+    pool.close_all()
+
+
+def test_store_appends_then_rebuilds(data_dir):
+    store = TimelineStore()
+    assert store.get("r") is None
+
+    write_snapshot(data_dir, "r@2", "2026-01-02")
+    write_snapshot(data_dir, "r@1", "2026-01-01")
+    first = store.get("r")
+    assert first.snapshots == ["r@1", "r@2"]
+    assert store.get("r") is first
+
+    write_snapshot(data_dir, "r@3", "2026-01-03")
+    assert store.get("r").snapshots == ["r@1", "r@2", "r@3"]
+    assert first.snapshots == ["r@1", "r@2"]
+    assert store.stats()["appends"] == 1
+
+    (data_dir / "r@1.db").unlink()
+    assert store.get("r").snapshots == ["r@2", "r@3"]
+    assert store.stats()["rebuilds"] == 2